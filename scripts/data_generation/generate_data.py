@@ -1,14 +1,42 @@
+import argparse
 import json
 import random
-from datetime import datetime, timedelta
+import resource
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import yaml
 from faker import Faker
 
 fake = Faker()
 
+AGE_GROUPS = ["18-25", "26-35", "36-45", "46-60", "60+"]
+
+CATEGORIES = {
+    "Electronics": ["Mobiles", "Laptops", "Accessories"],
+    "Clothing": ["Men", "Women", "Kids"],
+    "Home & Kitchen": ["Furniture", "Appliances", "Decor"],
+    "Books": ["Fiction", "Education", "Comics"],
+    "Sports": ["Outdoor", "Indoor", "Fitness"],
+    "Beauty": ["Skincare", "Makeup", "Haircare"]
+}
+
+PAYMENT_METHODS = [
+    "Credit Card", "Debit Card", "UPI",
+    "Cash on Delivery", "Net Banking"
+]
+
+DISCOUNTS = [0, 5, 10, 15]
+
+TRANSACTION_BASE_DATE = "2023-01-01"
+TRANSACTION_DAYS = 365
+
 # --------------------------------------------------
 # Utility: Load configuration (SAFE)
 # --------------------------------------------------
@@ -20,7 +48,15 @@ def load_config():
         "data_generation": {
             "customers": 100,
             "products": 50,
-            "transactions": 200
+            "transactions": 200,
+            "engine": "faker",
+            "seed": None,
+            "faker_pool_size": 5000,
+            "chunk_size": 0,
+            "workers": 1,
+            "output_format": "csv",
+            "parquet_compression": "snappy",
+            "parquet_row_group_size": 100000
         }
     }
 
@@ -45,7 +81,6 @@ def load_config():
 def generate_customers(num_customers: int) -> pd.DataFrame:
     customers = []
     used_emails = set()
-    age_groups = ["18-25", "26-35", "36-45", "46-60", "60+"]
 
     for i in range(1, num_customers + 1):
         email = fake.email()
@@ -63,7 +98,7 @@ def generate_customers(num_customers: int) -> pd.DataFrame:
             "city": fake.city(),
             "state": fake.state(),
             "country": "India",
-            "age_group": random.choice(age_groups)
+            "age_group": random.choice(AGE_GROUPS)
         })
 
     return pd.DataFrame(customers)
@@ -73,20 +108,11 @@ def generate_customers(num_customers: int) -> pd.DataFrame:
 # 2. Generate Products
 # --------------------------------------------------
 def generate_products(num_products: int) -> pd.DataFrame:
-    categories = {
-        "Electronics": ["Mobiles", "Laptops", "Accessories"],
-        "Clothing": ["Men", "Women", "Kids"],
-        "Home & Kitchen": ["Furniture", "Appliances", "Decor"],
-        "Books": ["Fiction", "Education", "Comics"],
-        "Sports": ["Outdoor", "Indoor", "Fitness"],
-        "Beauty": ["Skincare", "Makeup", "Haircare"]
-    }
-
     products = []
 
     for i in range(1, num_products + 1):
-        category = random.choice(list(categories.keys()))
-        sub_category = random.choice(categories[category])
+        category = random.choice(list(CATEGORIES.keys()))
+        sub_category = random.choice(CATEGORIES[category])
 
         price = round(random.uniform(200, 5000), 2)
         cost = round(price * random.uniform(0.5, 0.8), 2)
@@ -110,24 +136,19 @@ def generate_products(num_products: int) -> pd.DataFrame:
 # 3. Generate Transactions
 # --------------------------------------------------
 def generate_transactions(num_transactions: int, customers_df: pd.DataFrame) -> pd.DataFrame:
-    payment_methods = [
-        "Credit Card", "Debit Card", "UPI",
-        "Cash on Delivery", "Net Banking"
-    ]
-
     customer_ids = customers_df["customer_id"].tolist()
     transactions = []
-    base_date = datetime.strptime("2023-01-01", "%Y-%m-%d")
+    base_date = datetime.strptime(TRANSACTION_BASE_DATE, "%Y-%m-%d")
 
     for i in range(1, num_transactions + 1):
-        txn_date = base_date + timedelta(days=random.randint(0, 364))
+        txn_date = base_date + timedelta(days=random.randint(0, TRANSACTION_DAYS - 1))
 
         transactions.append({
             "transaction_id": f"TXN{i:06d}",
             "customer_id": random.choice(customer_ids),
             "transaction_date": txn_date.date(),
             "transaction_time": fake.time(),
-            "payment_method": random.choice(payment_methods),
+            "payment_method": random.choice(PAYMENT_METHODS),
             "shipping_address": fake.address().replace("\n", ", "),
             "total_amount": 0.0
         })
@@ -152,7 +173,7 @@ def generate_transaction_items(transactions_df: pd.DataFrame, products_df: pd.Da
         for prod_id in chosen_products:
             quantity = random.randint(1, 4)
             unit_price = product_lookup[prod_id]
-            discount = random.choice([0, 5, 10, 15])
+            discount = random.choice(DISCOUNTS)
 
             line_total = round(quantity * unit_price * (1 - discount / 100), 2)
             txn_total += line_total
@@ -175,35 +196,685 @@ def generate_transaction_items(transactions_df: pd.DataFrame, products_df: pd.Da
     return pd.DataFrame(items)
 
 
+# --------------------------------------------------
+# 5. Vectorized Engine (NumPy + Faker pools)
+# --------------------------------------------------
+def build_faker_pools(pool_size: int, seed=None) -> dict:
+    """
+    Pre-builds arrays of Faker values once, so the vectorized
+    generators only have to draw indexes into them.
+    """
+    pool_fake = Faker()
+    pool_fake.seed_instance(seed)
+
+    def pool(factory):
+        return np.array([factory() for _ in range(pool_size)], dtype=str)
+
+    return {
+        "first_name": pool(pool_fake.first_name),
+        "last_name": pool(pool_fake.last_name),
+        "phone": pool(pool_fake.phone_number),
+        "city": pool(pool_fake.city),
+        "state": pool(pool_fake.state),
+        "email_domain": pool(pool_fake.free_email_domain),
+        "address": pool(lambda: pool_fake.address().replace("\n", ", ")),
+        "product_name": pool(lambda: pool_fake.word().capitalize()),
+        "brand": pool(pool_fake.company),
+    }
+
+
+def _format_ids(prefix: str, start: int, count: int, width: int) -> np.ndarray:
+    # np.char.zfill truncates to `width`, so ids past 10**width would collide
+    return np.char.add(prefix, np.char.mod(f"%0{width}d", np.arange(start, start + count)))
+
+
+def _sample(pool: np.ndarray, size: int, rng: np.random.Generator) -> np.ndarray:
+    return pool[rng.integers(0, len(pool), size)]
+
+
+def generate_customers_vectorized(num_customers: int, rng: np.random.Generator,
+                                  pools: dict, start_id: int = 1) -> pd.DataFrame:
+    first_names = _sample(pools["first_name"], num_customers, rng)
+    last_names = _sample(pools["last_name"], num_customers, rng)
+    domains = _sample(pools["email_domain"], num_customers, rng)
+
+    # The numeric customer id makes every email unique without a lookup set
+    local_part = np.char.add(
+        np.char.add(np.char.lower(first_names), "."),
+        np.char.lower(np.char.replace(last_names, " ", ""))
+    )
+    emails = np.char.add(
+        np.char.add(local_part, np.arange(start_id, start_id + num_customers).astype(str)),
+        np.char.add("@", domains)
+    )
+
+    today = np.datetime64(date.today(), "D")
+    registration_dates = today - rng.integers(0, 3 * 365 + 1, num_customers)
+
+    return pd.DataFrame({
+        "customer_id": _format_ids("CUST", start_id, num_customers, 4),
+        "first_name": first_names,
+        "last_name": last_names,
+        "email": emails,
+        "phone": _sample(pools["phone"], num_customers, rng),
+        "registration_date": registration_dates,
+        "city": _sample(pools["city"], num_customers, rng),
+        "state": _sample(pools["state"], num_customers, rng),
+        "country": "India",
+        "age_group": rng.choice(AGE_GROUPS, num_customers)
+    })
+
+
+def generate_products_vectorized(num_products: int, rng: np.random.Generator,
+                                 pools: dict, start_id: int = 1) -> pd.DataFrame:
+    category_names = np.array(list(CATEGORIES.keys()))
+    sub_categories = np.array(list(CATEGORIES.values()))
+
+    category_idx = rng.integers(0, len(category_names), num_products)
+    sub_category_idx = rng.integers(0, sub_categories.shape[1], num_products)
+
+    price = np.round(rng.uniform(200, 5000, num_products), 2)
+    cost = np.round(price * rng.uniform(0.5, 0.8, num_products), 2)
+
+    supplier_ids = np.char.zfill(rng.integers(1, 101, num_products).astype(str), 3)
+
+    return pd.DataFrame({
+        "product_id": _format_ids("PROD", start_id, num_products, 4),
+        "product_name": _sample(pools["product_name"], num_products, rng),
+        "category": category_names[category_idx],
+        "sub_category": sub_categories[category_idx, sub_category_idx],
+        "price": price,
+        "cost": cost,
+        "brand": _sample(pools["brand"], num_products, rng),
+        "stock_quantity": rng.integers(10, 501, num_products),
+        "supplier_id": np.char.add("SUP", supplier_ids)
+    })
+
+
+def _format_times(seconds: np.ndarray) -> np.ndarray:
+    parts = [seconds // 3600, (seconds // 60) % 60, seconds % 60]
+    hh, mm, ss = (np.char.zfill(p.astype(str), 2) for p in parts)
+    return np.char.add(np.char.add(np.char.add(hh, ":"), np.char.add(mm, ":")), ss)
+
+
+def generate_transactions_vectorized(num_transactions: int, num_customers: int,
+                                     rng: np.random.Generator, pools: dict,
+                                     start_id: int = 1) -> pd.DataFrame:
+    base_date = np.datetime64(TRANSACTION_BASE_DATE, "D")
+    customer_numbers = rng.integers(1, num_customers + 1, num_transactions)
+
+    return pd.DataFrame({
+        "transaction_id": _format_ids("TXN", start_id, num_transactions, 6),
+        "customer_id": np.char.add("CUST", np.char.mod("%04d", customer_numbers)),
+        "transaction_date": base_date + rng.integers(0, TRANSACTION_DAYS, num_transactions),
+        "transaction_time": _format_times(rng.integers(0, 86400, num_transactions)),
+        "payment_method": rng.choice(PAYMENT_METHODS, num_transactions),
+        "shipping_address": _sample(pools["address"], num_transactions, rng),
+        "total_amount": 0.0
+    })
+
+
+def draw_fan_out(num_transactions: int, num_products: int,
+                 rng: np.random.Generator) -> np.ndarray:
+    return rng.integers(1, min(5, num_products) + 1, num_transactions)
+
+
+def generate_transaction_items_vectorized(transactions_df: pd.DataFrame, products_df: pd.DataFrame,
+                                          rng: np.random.Generator, start_item_id: int = 1,
+                                          fan_out: np.ndarray = None) -> pd.DataFrame:
+    num_transactions = len(transactions_df)
+    num_products = len(products_df)
+    max_items = min(5, num_products)
+
+    if fan_out is None:
+        fan_out = draw_fan_out(num_transactions, num_products, rng)
+    txn_idx = np.repeat(np.arange(num_transactions), fan_out)
+    position = np.arange(len(txn_idx)) - np.repeat(np.cumsum(fan_out) - fan_out, fan_out)
+
+    # Products within a transaction are distinct: base + position * gap never
+    # wraps onto itself while (max_items - 1) * gap < num_products
+    base = rng.integers(0, num_products, num_transactions)
+    max_gap = max(1, (num_products - 1) // max(1, max_items - 1))
+    gap = rng.integers(1, max_gap + 1, num_transactions)
+    product_idx = (base[txn_idx] + position * gap[txn_idx]) % num_products
+
+    num_items = len(txn_idx)
+    quantity = rng.integers(1, 5, num_items)
+    discount = rng.choice(DISCOUNTS, num_items)
+    unit_price = products_df["price"].to_numpy()[product_idx]
+    line_total = np.round(quantity * unit_price * (1 - discount / 100), 2)
+
+    transactions_df["total_amount"] = np.round(
+        np.bincount(txn_idx, weights=line_total, minlength=num_transactions), 2
+    )
+
+    return pd.DataFrame({
+        "item_id": _format_ids("ITEM", start_item_id, num_items, 6),
+        "transaction_id": transactions_df["transaction_id"].to_numpy()[txn_idx],
+        "product_id": products_df["product_id"].to_numpy()[product_idx],
+        "quantity": quantity,
+        "unit_price": unit_price,
+        "discount_percentage": discount,
+        "line_total": line_total
+    })
+
+
+# --------------------------------------------------
+# 6. Engine Dispatch & Benchmark
+# --------------------------------------------------
+def _build_pools(generation_config: dict, seed=None) -> dict:
+    pool_size = min(
+        generation_config.get("faker_pool_size", 5000),
+        max(generation_config["customers"], generation_config["products"],
+            generation_config["transactions"])
+    )
+    return build_faker_pools(pool_size, seed)
+
+
+def generate_dataset(generation_config: dict, engine: str = "faker", seed=None):
+    num_customers = generation_config["customers"]
+    num_products = generation_config["products"]
+    num_transactions = generation_config["transactions"]
+
+    if engine == "vectorized":
+        rng = np.random.default_rng(seed)
+        pools = _build_pools(generation_config, seed)
+
+        customers_df = generate_customers_vectorized(num_customers, rng, pools)
+        products_df = generate_products_vectorized(num_products, rng, pools)
+        transactions_df = generate_transactions_vectorized(num_transactions, num_customers, rng, pools)
+        items_df = generate_transaction_items_vectorized(transactions_df, products_df, rng)
+
+    elif engine == "faker":
+        if seed is not None:
+            Faker.seed(seed)
+            random.seed(seed)
+
+        customers_df = generate_customers(num_customers)
+        products_df = generate_products(num_products)
+        transactions_df = generate_transactions(num_transactions, customers_df)
+        items_df = generate_transaction_items(transactions_df, products_df)
+
+    else:
+        raise ValueError(f"Unknown data generation engine: {engine}")
+
+    return customers_df, products_df, transactions_df, items_df
+
+
+def benchmark_engines(generation_config: dict, seed=None) -> dict:
+    results = {}
+
+    for engine in ("faker", "vectorized"):
+        start = time.perf_counter()
+        frames = generate_dataset(generation_config, engine, seed)
+        elapsed = time.perf_counter() - start
+
+        rows = sum(len(df) for df in frames)
+        results[engine] = {
+            "rows": rows,
+            "seconds": round(elapsed, 3),
+            "rows_per_second": round(rows / elapsed, 1) if elapsed else None
+        }
+
+    results["speedup"] = round(
+        results["vectorized"]["rows_per_second"] / results["faker"]["rows_per_second"], 2
+    )
+    return results
+
+
+def _current_rss_bytes() -> int:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * resource.getpagesize()
+
+
+def _timed_read(path: str) -> dict:
+    # Runs in a fresh process so ru_maxrss reflects this read alone
+    import pyarrow.parquet as pq
+
+    baseline = _current_rss_bytes()
+    start = time.perf_counter()
+
+    if path.endswith(".parquet"):
+        rows = len(pq.read_table(path).to_pandas())
+    else:
+        rows = len(pd.read_csv(path))
+
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return {
+        "rows": rows,
+        "read_seconds": round(elapsed, 3),
+        "peak_rss_mb": round(max(peak - baseline, 0) / 1024 / 1024, 1)
+    }
+
+
+def benchmark_formats(generation_config: dict, seed=None) -> dict:
+    """
+    Writes the same vectorized dataset as CSV and Parquet and compares
+    file size, full read time and peak memory of the read per table.
+    """
+    frames = dict(zip(OUTPUT_TABLES, generate_dataset(generation_config, "vectorized", seed)))
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for output_format in OUTPUT_SUFFIXES:
+            writer = RawWriter.from_config(dict(generation_config, output_format=output_format))
+            paths = {table: Path(tmp_dir) / f"{table}{writer.suffix}" for table in OUTPUT_TABLES}
+
+            start = time.perf_counter()
+            for table, df in frames.items():
+                writer.append(df, paths[table])
+            writer.close()
+            write_seconds = time.perf_counter() - start
+
+            tables = {}
+            for table, path in paths.items():
+                with ProcessPoolExecutor(max_workers=1) as executor:
+                    tables[table] = executor.submit(_timed_read, str(path)).result()
+                tables[table]["bytes"] = path.stat().st_size
+
+            results[output_format] = {
+                "write_seconds": round(write_seconds, 3),
+                "bytes": sum(t["bytes"] for t in tables.values()),
+                "read_seconds": round(sum(t["read_seconds"] for t in tables.values()), 3),
+                "tables": tables
+            }
+
+    results["size_ratio"] = round(results["csv"]["bytes"] / results["parquet"]["bytes"], 2)
+    results["read_speedup"] = round(
+        results["csv"]["read_seconds"] / results["parquet"]["read_seconds"], 2
+    )
+    return results
+
+
+# --------------------------------------------------
+# 7. Streaming (Chunked) Output
+# --------------------------------------------------
+OUTPUT_TABLES = ("customers", "products", "transactions", "transaction_items")
+
+OUTPUT_SUFFIXES = {"csv": ".csv", "parquet": ".parquet"}
+
+# Benchmarks compare runs on the same data unless --seed says otherwise
+BENCHMARK_SEED = 42
+
+
+class RawWriter:
+    """
+    Appends DataFrames to raw output files as CSV or Parquet. A Parquet
+    file cannot be reopened for appending, so one ParquetWriter stays
+    open per file (each append adds row groups) until close().
+    """
+
+    def __init__(self, output_format: str = "csv", compression: str = "snappy",
+                 row_group_size: int = None):
+        if output_format not in OUTPUT_SUFFIXES:
+            raise ValueError(f"Unknown output format: {output_format}")
+
+        self.output_format = output_format
+        self.suffix = OUTPUT_SUFFIXES[output_format]
+        self.compression = compression
+        self.row_group_size = row_group_size
+        self._writers = {}
+
+    @classmethod
+    def from_config(cls, generation_config: dict):
+        return cls(generation_config.get("output_format", "csv"),
+                   generation_config.get("parquet_compression", "snappy"),
+                   generation_config.get("parquet_row_group_size"))
+
+    def append(self, df: pd.DataFrame, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        if self.output_format == "csv":
+            df.to_csv(path, mode="a", header=not path.exists(), index=False)
+            return
+
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = self._writers.get(path)
+        table = pa.Table.from_pandas(df, preserve_index=False)
+
+        # *_date columns are calendar dates; keep them typed as such
+        for i, field in enumerate(table.schema):
+            if field.name.endswith("_date") and pa.types.is_timestamp(field.type):
+                table = table.set_column(i, field.name, table.column(i).cast(pa.date32()))
+
+        if writer is None:
+            writer = self._writers[path] = pq.ParquetWriter(
+                path, table.schema.remove_metadata(), compression=self.compression
+            )
+        writer.write_table(table.cast(writer.schema), row_group_size=self.row_group_size)
+
+    def close(self):
+        for writer in self._writers.values():
+            writer.close()
+        self._writers.clear()
+
+
+def reset_outputs(raw_path: Path):
+    """
+    Removes flat and partitioned outputs of a previous run, since
+    streaming appends to files rather than overwriting them.
+    """
+    for table in OUTPUT_TABLES:
+        for suffix in OUTPUT_SUFFIXES.values():
+            flat_file = raw_path / f"{table}{suffix}"
+            if flat_file.exists():
+                flat_file.unlink()
+        shutil.rmtree(raw_path / table, ignore_errors=True)
+
+
+def append_partitioned(df: pd.DataFrame, table_dir: Path, partition_values,
+                       part_name: str, row_counts: dict, writer: RawWriter):
+    for value, part in df.groupby(partition_values, sort=False):
+        partition = f"transaction_date={value}"
+        writer.append(part, table_dir / partition / part_name)
+        row_counts[partition] = row_counts.get(partition, 0) + len(part)
+
+
+def partition_stats(table_dir: Path, row_counts: dict) -> dict:
+    return {
+        partition: {
+            "rows": rows,
+            "bytes": sum(f.stat().st_size for f in (table_dir / partition).iterdir())
+        }
+        for partition, rows in sorted(row_counts.items())
+    }
+
+
+def _chunk_counts(total: int, chunk_size: int):
+    chunk_size = chunk_size or total
+    for start in range(0, total, chunk_size):
+        yield min(chunk_size, total - start)
+
+
+# --------------------------------------------------
+# 8. Sharded (Parallel) Generation
+# --------------------------------------------------
+def shard_ranges(total: int, workers: int) -> list:
+    """
+    Splits the id space 1..total into `workers` disjoint (start, count) ranges.
+    """
+    base, extra = divmod(total, workers)
+    ranges, start = [], 1
+
+    for worker in range(workers):
+        count = base + (1 if worker < extra else 0)
+        ranges.append((start, count))
+        start += count
+
+    return ranges
+
+
+def _customer_shard(task: dict):
+    rng = np.random.default_rng(task["seed"])
+    writer = RawWriter(**task["output"])
+    start = task["start"]
+
+    for count in _chunk_counts(task["count"], task["chunk_size"]):
+        customers_chunk = generate_customers_vectorized(count, rng, task["pools"], start)
+        writer.append(customers_chunk, task["raw_path"] / "customers" / task["part_name"])
+        start += count
+
+    writer.close()
+
+
+def _product_shard(task: dict) -> pd.DataFrame:
+    rng = np.random.default_rng(task["seed"])
+    writer = RawWriter(**task["output"])
+    products_df = generate_products_vectorized(task["count"], rng, task["pools"], task["start"])
+
+    if len(products_df):
+        writer.append(products_df, task["raw_path"] / "products" / task["part_name"])
+    writer.close()
+    return products_df
+
+
+def _count_shard_items(task: dict) -> int:
+    # Replays exactly the fan-out draws _fact_shard will make for this shard
+    rng = np.random.default_rng(task["fan_seed"])
+    return sum(
+        int(draw_fan_out(count, task["num_products"], rng).sum())
+        for count in _chunk_counts(task["count"], task["chunk_size"])
+    )
+
+
+def _fact_shard(task: dict) -> tuple:
+    txn_rng = np.random.default_rng(task["seed"])
+    fan_rng = np.random.default_rng(task["fan_seed"])
+    item_rng = np.random.default_rng(task["item_seed"])
+
+    raw_path, part_name = task["raw_path"], task["part_name"]
+    writer = RawWriter(**task["output"])
+    products_df = task["products"]
+    start, next_item_id = task["start"], task["start_item_id"]
+    transaction_rows, item_rows = {}, {}
+
+    for count in _chunk_counts(task["count"], task["chunk_size"]):
+        transactions_chunk = generate_transactions_vectorized(
+            count, task["num_customers"], txn_rng, task["pools"], start
+        )
+        items_chunk = generate_transaction_items_vectorized(
+            transactions_chunk, products_df, item_rng, next_item_id,
+            fan_out=draw_fan_out(count, len(products_df), fan_rng)
+        )
+        start += count
+        next_item_id += len(items_chunk)
+
+        if not task["chunk_size"]:
+            writer.append(transactions_chunk, raw_path / "transactions" / part_name)
+            writer.append(items_chunk, raw_path / "transaction_items" / part_name)
+            continue
+
+        txn_dates = pd.Series(
+            np.datetime_as_string(transactions_chunk["transaction_date"].to_numpy(), unit="D"),
+            index=transactions_chunk["transaction_id"].to_numpy()
+        )
+
+        append_partitioned(transactions_chunk, raw_path / "transactions",
+                           txn_dates.to_numpy(), part_name, transaction_rows, writer)
+        append_partitioned(items_chunk, raw_path / "transaction_items",
+                           items_chunk["transaction_id"].map(txn_dates).to_numpy(),
+                           part_name, item_rows, writer)
+
+    writer.close()
+    return transaction_rows, item_rows
+
+
+def generate_sharded(generation_config: dict, raw_path: Path, chunk_size: int = 0,
+                     workers: int = 1, seed=None) -> dict:
+    """
+    Generates every table with the vectorized engine, one shard file per
+    worker over disjoint CUST/PROD/TXN/ITEM id ranges. Each worker has its
+    own seed spawned from `seed`, so output is identical for a given seed
+    and worker count. Emails embed the customer id, so they stay unique
+    across shards without coordination.
+
+    With chunk_size > 0 each worker streams its shard in chunks and
+    transactions/items land in daily partitions, keeping memory flat.
+    """
+    num_customers = generation_config["customers"]
+    num_products = generation_config["products"]
+    num_transactions = generation_config["transactions"]
+
+    pools = _build_pools(generation_config, seed)
+    customer_seeds, product_seeds, txn_seeds, fan_seeds, item_seeds = (
+        seq.spawn(workers) for seq in np.random.SeedSequence(seed).spawn(5)
+    )
+    output = RawWriter.from_config(generation_config)
+    part_names = [f"part-{worker:05d}{output.suffix}" for worker in range(workers)]
+    common = {
+        "raw_path": raw_path, "chunk_size": chunk_size, "pools": pools,
+        "output": {
+            "output_format": output.output_format,
+            "compression": output.compression,
+            "row_group_size": output.row_group_size
+        }
+    }
+
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    run = executor.map if executor else map
+
+    try:
+        list(run(_customer_shard, [
+            dict(common, seed=seq, start=start, count=count, part_name=part)
+            for seq, (start, count), part in zip(
+                customer_seeds, shard_ranges(num_customers, workers), part_names)
+        ]))
+
+        products_df = pd.concat(run(_product_shard, [
+            dict(common, seed=seq, start=start, count=count, part_name=part)
+            for seq, (start, count), part in zip(
+                product_seeds, shard_ranges(num_products, workers), part_names)
+        ]), ignore_index=True)
+
+        txn_ranges = shard_ranges(num_transactions, workers)
+        item_counts = list(run(_count_shard_items, [
+            dict(fan_seed=seq, count=count, chunk_size=chunk_size, num_products=num_products)
+            for seq, (_, count) in zip(fan_seeds, txn_ranges)
+        ]))
+        item_starts = np.cumsum([1] + item_counts[:-1])
+
+        fact_results = list(run(_fact_shard, [
+            dict(common, seed=txn_seq, fan_seed=fan_seq, item_seed=item_seq,
+                 start=start, count=count, start_item_id=int(item_start),
+                 part_name=part, products=products_df, num_customers=num_customers)
+            for txn_seq, fan_seq, item_seq, (start, count), item_start, part in zip(
+                txn_seeds, fan_seeds, item_seeds, txn_ranges, item_starts, part_names)
+        ]))
+    finally:
+        if executor:
+            executor.shutdown()
+
+    result = {
+        "record_counts": {
+            "customers": num_customers,
+            "products": num_products,
+            "transactions": num_transactions,
+            "transaction_items": sum(item_counts)
+        },
+        "workers": workers
+    }
+
+    if chunk_size:
+        transaction_rows, item_rows = {}, {}
+        for shard_transaction_rows, shard_item_rows in fact_results:
+            for totals, shard_rows in ((transaction_rows, shard_transaction_rows),
+                                       (item_rows, shard_item_rows)):
+                for partition, rows in shard_rows.items():
+                    totals[partition] = totals.get(partition, 0) + rows
+
+        result["partitions"] = {
+            "transactions": partition_stats(raw_path / "transactions", transaction_rows),
+            "transaction_items": partition_stats(raw_path / "transaction_items", item_rows)
+        }
+
+    return result
+
+
 # --------------------------------------------------
 # MAIN EXECUTION
 # --------------------------------------------------
 if __name__ == "__main__":
     config = load_config()
+    generation_config = config["data_generation"]
+
+    parser = argparse.ArgumentParser(description="Generate synthetic e-commerce data")
+    parser.add_argument("--engine", choices=["faker", "vectorized"],
+                        default=generation_config["engine"])
+    parser.add_argument("--seed", type=int, default=generation_config["seed"])
+    parser.add_argument("--chunk-size", type=int, default=generation_config["chunk_size"],
+                        help="Stream transactions in chunks of this size (0 = in memory)")
+    parser.add_argument("--workers", type=int, default=generation_config["workers"],
+                        help="Generate shards in this many processes")
+    parser.add_argument("--format", dest="output_format", choices=sorted(OUTPUT_SUFFIXES),
+                        default=generation_config["output_format"])
+    parser.add_argument("--benchmark", action="store_true",
+                        help="Compare rows/sec of both engines instead of writing data")
+    parser.add_argument("--benchmark-formats", action="store_true",
+                        help="Compare size, read time and memory of CSV vs Parquet")
+    args = parser.parse_args()
+    generation_config["output_format"] = args.output_format
+    if (args.benchmark or args.benchmark_formats) and args.seed is None:
+        args.seed = BENCHMARK_SEED
+
+    if args.benchmark_formats:
+        benchmark = {
+            "benchmarked_at": datetime.utcnow().isoformat(),
+            "record_counts": {
+                key: generation_config[key] for key in ("customers", "products", "transactions")
+            },
+            "parquet_compression": generation_config["parquet_compression"],
+            "seed": args.seed,
+            "formats": benchmark_formats(generation_config, args.seed)
+        }
 
-    raw_path = Path("data/raw")
-    raw_path.mkdir(parents=True, exist_ok=True)
+        processed_path = Path("data/processed")
+        processed_path.mkdir(parents=True, exist_ok=True)
+        with open(processed_path / "format_benchmark.json", "w") as f:
+            json.dump(benchmark, f, indent=2)
 
-    customers_df = generate_customers(config["data_generation"]["customers"])
-    products_df = generate_products(config["data_generation"]["products"])
-    transactions_df = generate_transactions(
-        config["data_generation"]["transactions"], customers_df
-    )
-    items_df = generate_transaction_items(transactions_df, products_df)
+        print("Format benchmark:", {
+            key: benchmark["formats"][key] for key in ("size_ratio", "read_speedup")
+        })
+        raise SystemExit(0)
+
+    if args.benchmark:
+        benchmark = {
+            "benchmarked_at": datetime.utcnow().isoformat(),
+            "record_counts": {
+                key: generation_config[key] for key in ("customers", "products", "transactions")
+            },
+            "seed": args.seed,
+            "engines": benchmark_engines(generation_config, args.seed)
+        }
+
+        processed_path = Path("data/processed")
+        processed_path.mkdir(parents=True, exist_ok=True)
+        with open(processed_path / "generation_benchmark.json", "w") as f:
+            json.dump(benchmark, f, indent=2)
 
-    customers_df.to_csv(raw_path / "customers.csv", index=False)
-    products_df.to_csv(raw_path / "products.csv", index=False)
-    transactions_df.to_csv(raw_path / "transactions.csv", index=False)
-    items_df.to_csv(raw_path / "transaction_items.csv", index=False)
+        print("Benchmark:", benchmark["engines"])
+        raise SystemExit(0)
+
+    raw_path = Path("data/raw")
+    raw_path.mkdir(parents=True, exist_ok=True)
+    reset_outputs(raw_path)
+
+    if args.chunk_size or args.workers > 1:
+        # Streaming and sharding draw whole arrays, so they run on the vectorized engine
+        args.engine = "vectorized"
+        result = generate_sharded(
+            generation_config, raw_path, args.chunk_size, args.workers, args.seed
+        )
+
+    else:
+        customers_df, products_df, transactions_df, items_df = generate_dataset(
+            generation_config, args.engine, args.seed
+        )
+
+        writer = RawWriter.from_config(generation_config)
+        for table, df in zip(OUTPUT_TABLES, (customers_df, products_df, transactions_df, items_df)):
+            writer.append(df, raw_path / f"{table}{writer.suffix}")
+        writer.close()
+
+        result = {
+            "record_counts": {
+                "customers": len(customers_df),
+                "products": len(products_df),
+                "transactions": len(transactions_df),
+                "transaction_items": len(items_df)
+            }
+        }
 
     metadata = {
         "generated_at": datetime.utcnow().isoformat(),
-        "record_counts": {
-            "customers": len(customers_df),
-            "products": len(products_df),
-            "transactions": len(transactions_df),
-            "transaction_items": len(items_df)
-        }
+        "engine": args.engine,
+        "seed": args.seed,
+        "chunk_size": args.chunk_size,
+        "output_format": args.output_format,
+        **result
     }
 
     with open(raw_path / "generation_metadata.json", "w") as f:
@@ -1,6 +1,9 @@
+import hashlib
+import io
 import json
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
@@ -8,6 +11,7 @@ import pandas as pd
 import psycopg2
 import yaml
 from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
 
 
 # --------------------------------------------------
@@ -31,23 +35,37 @@ def load_config():
         "password": os.getenv("DB_PASSWORD", config.get("database", {}).get("password", "test_password")),
     }
 
-    return {"database": db_config}
+    ingestion_config = {
+        "mode": "full",
+        "method": "insert",
+        "benchmark": False,
+        "checksum": False,
+        "parallel_workers": 1,
+        "split_streams": 4,
+        "split_min_bytes": 64 * 1024 * 1024,
+        **config.get("ingestion", {}),
+    }
+
+    return {"database": db_config, "ingestion": ingestion_config}
 
 
 # --------------------------------------------------
 # Utility: Get database connection
 # --------------------------------------------------
+def get_connection_params() -> dict:
+    db = load_config()["database"]
+
+    return {
+        "host": db["host"],
+        "port": db["port"],
+        "database": db["name"],
+        "user": db["user"],
+        "password": db["password"],
+    }
+
+
 def get_db_connection():
-    config = load_config()
-    db = config["database"]
-
-    return psycopg2.connect(
-        host=db["host"],
-        port=db["port"],
-        database=db["name"],
-        user=db["user"],
-        password=db["password"],
-    )
+    return psycopg2.connect(**get_connection_params())
 
 
 # --------------------------------------------------
@@ -73,38 +91,711 @@ def bulk_insert_data(df: pd.DataFrame, table_name: str, connection) -> int:
     return len(df)
 
 
+# --------------------------------------------------
+# Load statistics (carried forward to validation)
+# --------------------------------------------------
+def key_hash(key: str) -> int:
+    """
+    32-bit hash of a key value; matches key_checksum_sql() on the server.
+    """
+    return int(hashlib.md5(key.encode()).hexdigest()[:8], 16)
+
+
+def key_checksum_sql(key_column: str) -> str:
+    return f"COALESCE(SUM(('x' || LEFT(MD5({key_column}::TEXT), 8))::BIT(32)::BIGINT), 0)"
+
+
+def merge_load_stats(total: dict, stats: dict) -> dict:
+    # Row counts, bytes and key checksums are all additive across files/streams
+    if not total:
+        return dict(stats)
+
+    merged = dict(total)
+    merged["rows"] += stats["rows"]
+    merged["bytes"] += stats["bytes"]
+    if merged["key_checksum"] is not None and stats["key_checksum"] is not None:
+        merged["key_checksum"] += stats["key_checksum"]
+    else:
+        merged["key_checksum"] = None
+    return merged
+
+
+class LoadStatsReader:
+    """
+    Wraps the file object handed to COPY and gathers the row count, byte
+    count and (optionally) a checksum of the first, key column as the
+    bytes stream past, so the source never has to be parsed again.
+    """
+
+    def __init__(self, source, has_header: bool, checksum: bool):
+        self.source = source
+        self.has_header = has_header
+        self.bytes = 0
+        self.newlines = 0
+        self.last_byte = b"\n"
+        self.key_checksum = 0 if checksum else None
+        self._pending = b""
+        self._skip_line = has_header
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.source.read(size)
+        if data:
+            self.bytes += len(data)
+            self.newlines += data.count(b"\n")
+            self.last_byte = data[-1:]
+            if self.key_checksum is not None:
+                lines = (self._pending + data).split(b"\n")
+                self._pending = lines.pop()
+                for line in lines:
+                    self._add_key(line)
+        return data
+
+    def _add_key(self, line: bytes):
+        if self._skip_line:
+            self._skip_line = False
+        elif line.strip():
+            self.key_checksum += key_hash(line.split(b",", 1)[0].strip(b'"\r').decode())
+
+    def stats(self, key_column: str) -> dict:
+        if self.key_checksum is not None and self._pending:
+            self._add_key(self._pending)
+            self._pending = b""
+
+        rows = self.newlines + (self.last_byte != b"\n") - self.has_header
+        return {
+            "rows": max(rows, 0),
+            "bytes": self.bytes,
+            "key_column": key_column,
+            "key_checksum": self.key_checksum
+        }
+
+
+# --------------------------------------------------
+# COPY helper (streams raw CSV bytes, no per-row objects)
+# --------------------------------------------------
+class ByteRangeReader:
+    """
+    Read-only file view over [start, end) of an open file, used to feed
+    one slice of a large CSV to its own COPY stream.
+    """
+
+    def __init__(self, f, start: int, end: int):
+        f.seek(start)
+        self.f = f
+        self.remaining = end - start
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.f.read(size)
+        self.remaining -= len(data)
+        return data
+
+
+def copy_csv_file(csv_path, table_name: str, connection, byte_range: tuple = None,
+                  checksum: bool = False) -> dict:
+    with open(csv_path, "rb") as f:
+        columns = f.readline().decode().strip()
+
+        if byte_range is None:
+            f.seek(0)
+            source, header = f, "true"
+        else:
+            source, header = ByteRangeReader(f, *byte_range), "false"
+
+        reader = LoadStatsReader(source, has_header=byte_range is None, checksum=checksum)
+        copy_sql = f"COPY {table_name} ({columns}) FROM STDIN WITH (FORMAT csv, HEADER {header})"
+
+        with connection.cursor() as cursor:
+            cursor.copy_expert(copy_sql, reader)
+            rows = cursor.rowcount
+
+    print(f"Copied {rows} rows into {table_name}")
+    return reader.stats(columns.split(",")[0])
+
+
+def copy_parquet_file(parquet_path, table_name: str, connection, row_groups: tuple = None,
+                      checksum: bool = False, batch_size: int = 65536) -> dict:
+    """
+    Streams a Parquet file into COPY batch by batch, reading only the
+    columns the target table has, so the whole file is never held in
+    memory and no CSV text has to be parsed on the client.
+    """
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(parquet_path)
+    metadata = parquet_file.metadata
+    if row_groups is None:
+        row_groups = (0, metadata.num_row_groups)
+    row_group_ids = list(range(*row_groups))
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT * FROM {table_name} LIMIT 0")
+        table_columns = {d[0] for d in cursor.description}
+        columns = [c for c in parquet_file.schema_arrow.names if c in table_columns]
+
+        copy_sql = f"COPY {table_name} ({','.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+        write_options = pacsv.WriteOptions(include_header=False)
+        rows, key_checksum = 0, 0 if checksum else None
+
+        for batch in parquet_file.iter_batches(batch_size=batch_size, row_groups=row_group_ids,
+                                               columns=columns):
+            buffer = io.BytesIO()
+            pacsv.write_csv(batch, buffer, write_options)
+            buffer.seek(0)
+            cursor.copy_expert(copy_sql, buffer)
+
+            rows += batch.num_rows
+            if checksum:
+                keys = pc.cast(batch.column(0), "string").to_pylist()
+                key_checksum += sum(key_hash(key) for key in keys)
+
+    print(f"Copied {rows} rows into {table_name}")
+    return {
+        "rows": rows,
+        "bytes": sum(
+            metadata.row_group(i).column(c).total_compressed_size
+            for i in row_group_ids for c in range(metadata.num_columns)
+        ),
+        "key_column": columns[0],
+        "key_checksum": key_checksum
+    }
+
+
+def split_parquet_row_groups(parquet_path, streams: int) -> list:
+    import pyarrow.parquet as pq
+
+    num_row_groups = pq.ParquetFile(parquet_path).metadata.num_row_groups
+    bounds = [num_row_groups * i // streams for i in range(streams + 1)]
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
+
+
+# --------------------------------------------------
+# Resolve raw source files (flat or partitioned)
+# --------------------------------------------------
+RAW_SUFFIXES = (".csv", ".parquet")
+
+
+def resolve_source_files(csv_path: str) -> list:
+    """
+    Returns the flat file for a table in whichever raw format was
+    generated (e.g. data/raw/customers.csv or .parquet), or every part
+    file under the directory of the same name
+    (e.g. data/raw/transactions/transaction_date=*/).
+    """
+    path = Path(csv_path)
+    for suffix in RAW_SUFFIXES:
+        if path.with_suffix(suffix).exists():
+            return [path.with_suffix(suffix)]
+
+    return sorted(
+        f for f in path.with_suffix("").rglob("*") if f.suffix in RAW_SUFFIXES
+    )
+
+
 # --------------------------------------------------
 # Load CSV into staging
 # --------------------------------------------------
-def load_csv_to_staging(csv_path: str, table_name: str, connection) -> dict:
-    df = pd.read_csv(csv_path)
+def load_source_file(source_file, table_name: str, connection, method: str,
+                     byte_range: tuple = None, checksum: bool = False) -> dict:
+    is_parquet = Path(source_file).suffix == ".parquet"
+
+    if method == "copy" and is_parquet:
+        # byte_range is a (first, end) row-group range for Parquet sources
+        return copy_parquet_file(source_file, table_name, connection, byte_range, checksum)
+
+    if method == "copy":
+        return copy_csv_file(source_file, table_name, connection, byte_range, checksum)
+
+    if method == "insert":
+        df = pd.read_parquet(source_file) if is_parquet else pd.read_csv(source_file)
+        bulk_insert_data(df, table_name, connection)
 
-    rows = bulk_insert_data(df, table_name, connection)
+        key_column = df.columns[0]
+        return {
+            "rows": len(df),
+            "bytes": os.path.getsize(source_file),
+            "key_column": key_column,
+            "key_checksum": (
+                int(df[key_column].astype(str).map(key_hash).sum()) if checksum else None
+            )
+        }
 
+    raise ValueError(f"Unknown ingestion method: {method}")
+
+
+def load_result(stats: dict, method: str, elapsed: float) -> dict:
+    rows = stats.get("rows", 0)
     return {
         "rows_loaded": rows,
-        "status": "success" if rows > 0 else "empty"
+        "bytes_loaded": stats.get("bytes", 0),
+        "key_column": stats.get("key_column"),
+        "key_checksum": stats.get("key_checksum"),
+        "status": "success" if rows > 0 else "empty",
+        "method": method,
+        "load_seconds": round(elapsed, 3),
+        "rows_per_second": round(rows / elapsed, 1) if elapsed else None
     }
 
 
+def load_csv_to_staging(csv_path: str, table_name: str, connection, method: str = "insert",
+                        checksum: bool = False) -> dict:
+    start = time.perf_counter()
+    stats = {}
+
+    for source_file in resolve_source_files(csv_path):
+        stats = merge_load_stats(
+            stats, load_source_file(source_file, table_name, connection, method, checksum=checksum)
+        )
+
+    return load_result(stats, method, time.perf_counter() - start)
+
+
 # --------------------------------------------------
-# Validate staging load
+# Benchmark a load method (rolled back afterwards)
 # --------------------------------------------------
-def validate_staging_load(connection) -> dict:
-    validation = {}
+def benchmark_load_method(csv_path: str, table_name: str, connection, method: str) -> dict:
+    with connection.cursor() as cursor:
+        cursor.execute("SAVEPOINT ingestion_benchmark")
+
+    result = load_csv_to_staging(csv_path, table_name, connection, method)
+
+    with connection.cursor() as cursor:
+        cursor.execute("ROLLBACK TO SAVEPOINT ingestion_benchmark")
+
+    return {
+        "load_seconds": result["load_seconds"],
+        "rows_per_second": result["rows_per_second"]
+    }
+
+
+# --------------------------------------------------
+# Parallel ingestion (shadow tables + final swap)
+# --------------------------------------------------
+def split_csv_ranges(csv_path, streams: int) -> list:
+    """
+    Splits the data rows of a CSV file into up to `streams` contiguous byte
+    ranges aligned on line boundaries. Assumes no quoted newlines, which
+    holds for generate_data.py output.
+    """
+    size = os.path.getsize(csv_path)
+
+    with open(csv_path, "rb") as f:
+        bounds = [len(f.readline())]
+        for i in range(1, streams):
+            f.seek(max(bounds[0], size * i // streams))
+            f.readline()
+            bounds.append(max(f.tell(), bounds[-1]))
+        bounds.append(size)
+
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
+
 
-    tables = {
-        "staging.customers": "data/raw/customers.csv",
-        "staging.products": "data/raw/products.csv",
-        "staging.transactions": "data/raw/transactions.csv",
-        "staging.transaction_items": "data/raw/transaction_items.csv"
+def shadow_table_name(table_name: str) -> str:
+    return f"{table_name}__load"
+
+
+def check_no_dependents(table_names: list, cursor):
+    """
+    The swap drops the live tables, so views or foreign keys that depend on
+    them are not supported; refuse to start rather than fail at the swap.
+    """
+    for table_name in table_names:
+        cursor.execute("""
+            SELECT DISTINCT v.oid::regclass::text
+            FROM pg_depend d
+            JOIN pg_rewrite r ON r.oid = d.objid
+            JOIN pg_class v ON v.oid = r.ev_class
+            WHERE d.refobjid = %s::regclass AND v.oid <> d.refobjid
+            UNION
+            SELECT conname || ' on ' || conrelid::regclass::text
+            FROM pg_constraint
+            WHERE confrelid = %s::regclass AND contype = 'f'
+        """, (table_name, table_name))
+        dependents = [r[0] for r in cursor.fetchall()]
+        if dependents:
+            raise Exception(
+                f"Parallel ingestion cannot swap {table_name}: "
+                f"dependent objects {', '.join(dependents)}"
+            )
+
+
+def copy_grants(table_name: str, shadow: str, cursor):
+    # LIKE ... INCLUDING ALL copies columns, defaults, constraints, indexes
+    # and comments, but not privileges
+    cursor.execute("""
+        SELECT a.privilege_type,
+               CASE WHEN a.grantee = 0 THEN 'PUBLIC'
+                    ELSE quote_ident(pg_get_userbyid(a.grantee)) END,
+               a.is_grantable
+        FROM pg_class c, aclexplode(c.relacl) a
+        WHERE c.oid = %s::regclass AND a.grantee <> c.relowner
+    """, (table_name,))
+    for privilege, grantee, grantable in cursor.fetchall():
+        option = " WITH GRANT OPTION" if grantable else ""
+        cursor.execute(f"GRANT {privilege} ON {shadow} TO {grantee}{option}")
+
+
+def swap_shadow_tables(table_names: list, cursor):
+    """
+    Replaces each live table with its shadow copy. Runs in the caller's
+    transaction, so all tables switch together at commit.
+    """
+    for table_name in table_names:
+        schema, name = table_name.split(".")
+        shadow_name = f"{name}__load"
+
+        cursor.execute(
+            "SELECT indexname FROM pg_indexes WHERE schemaname = %s AND tablename = %s",
+            (schema, shadow_name)
+        )
+        shadow_indexes = [r[0] for r in cursor.fetchall()]
+
+        copy_grants(table_name, f"{schema}.{shadow_name}", cursor)
+        cursor.execute(f"DROP TABLE {table_name}")
+        cursor.execute(f"ALTER TABLE {schema}.{shadow_name} RENAME TO {name}")
+
+        # Keep index/constraint names stable so the next shadow copy does not collide
+        for index_name in shadow_indexes:
+            if index_name.startswith(shadow_name):
+                cursor.execute(
+                    f"ALTER INDEX {schema}.{index_name} "
+                    f"RENAME TO {name + index_name[len(shadow_name):]}"
+                )
+
+
+def drop_shadow_tables(table_names: list, connection):
+    with connection.cursor() as cursor:
+        for table_name in table_names:
+            cursor.execute(f"DROP TABLE IF EXISTS {shadow_table_name(table_name)}")
+    connection.commit()
+
+
+def run_parallel_ingestion(tables: list, ingestion_config: dict) -> dict:
+    """
+    Loads every table concurrently into a shadow copy over a bounded
+    connection pool, splitting large files into several COPY streams.
+    The shadow tables are created LIKE the live ones INCLUDING ALL and
+    replace them in a single transaction, so readers see either the
+    previous load or the complete new one. Grants are carried over; views
+    or foreign keys depending on the staging tables are not supported.
+    """
+    workers = ingestion_config["parallel_workers"]
+    method = ingestion_config["method"]
+    table_names = [table_name for _, table_name in tables]
+
+    tasks = []
+    for csv_file, table_name in tables:
+        for source_file in resolve_source_files(csv_file):
+            size = os.path.getsize(source_file)
+            if method == "copy" and size >= ingestion_config["split_min_bytes"]:
+                if source_file.suffix == ".parquet":
+                    # Parquet splits on row groups; each stream gets an equal share
+                    ranges = split_parquet_row_groups(source_file, ingestion_config["split_streams"])
+                    for row_groups in ranges:
+                        tasks.append((table_name, source_file, row_groups, size // len(ranges)))
+                    continue
+
+                for byte_range in split_csv_ranges(source_file, ingestion_config["split_streams"]):
+                    tasks.append((table_name, source_file, byte_range, byte_range[1] - byte_range[0]))
+            else:
+                tasks.append((table_name, source_file, None, size))
+
+    # Largest streams first keeps the pool busy until the end
+    tasks.sort(key=lambda task: task[3], reverse=True)
+
+    pool = ThreadedConnectionPool(1, workers + 1, **get_connection_params())
+    coordinator = pool.getconn()
+
+    def run_task(task):
+        table_name, source_file, byte_range, _ = task
+        conn = pool.getconn()
+        try:
+            started = time.perf_counter()
+            stats = load_source_file(source_file, shadow_table_name(table_name), conn, method,
+                                     byte_range, ingestion_config["checksum"])
+            conn.commit()
+            return table_name, stats, started, time.perf_counter()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            pool.putconn(conn)
+
+    try:
+        with coordinator.cursor() as cursor:
+            check_no_dependents(table_names, cursor)
+            for table_name in table_names:
+                shadow = shadow_table_name(table_name)
+                cursor.execute(f"DROP TABLE IF EXISTS {shadow}")
+                cursor.execute(f"CREATE TABLE {shadow} (LIKE {table_name} INCLUDING ALL)")
+        coordinator.commit()
+
+        sequential_seconds = None
+        if ingestion_config["benchmark"]:
+            # The sequential loader's time into the same empty tables, rolled back
+            sequential_seconds = sum(
+                benchmark_load_method(csv_file, shadow_table_name(table_name), coordinator,
+                                      method)["load_seconds"]
+                for csv_file, table_name in tables
+            )
+            coordinator.commit()
+
+        wall_start = time.perf_counter()
+        load_stats = {name: {} for name in table_names}
+        timings = {name: {"streams": 0, "started": None, "finished": None} for name in table_names}
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for table_name, stats, started, finished in executor.map(run_task, tasks):
+                load_stats[table_name] = merge_load_stats(load_stats[table_name], stats)
+                timing = timings[table_name]
+                timing["streams"] += 1
+                timing["started"] = min(started, timing["started"] or started)
+                timing["finished"] = max(finished, timing["finished"] or finished)
+
+        wall_seconds = time.perf_counter() - wall_start
+
+        tables_loaded = {}
+        for table_name, timing in timings.items():
+            table_seconds = (timing["finished"] - timing["started"]) if timing["streams"] else 0.0
+            tables_loaded[table_name] = load_result(load_stats[table_name], method, table_seconds)
+            tables_loaded[table_name]["streams"] = timing["streams"]
+
+        with coordinator.cursor() as cursor:
+            swap_shadow_tables(table_names, cursor)
+            for csv_file, table_name in tables:
+                record_ingestion_state(cursor, table_name, resolve_source_files(csv_file))
+
+        validation = validate_staging_load(coordinator, tables_loaded)
+        if not validation["overall_status"]:
+            raise Exception("Row count validation failed")
+
+        coordinator.commit()
+
+    except Exception:
+        coordinator.rollback()
+        drop_shadow_tables(table_names, coordinator)
+        raise
+
+    finally:
+        pool.putconn(coordinator)
+        pool.closeall()
+
+    table_seconds = sum(t["load_seconds"] for t in tables_loaded.values())
+
+    # parallelism is how much the table loads overlapped, not a speedup:
+    # tables load slower under contention. speedup needs ingestion.benchmark.
+    return {
+        "tables_loaded": tables_loaded,
+        "validation": validation,
+        "parallel": {
+            "workers": workers,
+            "wall_seconds": round(wall_seconds, 3),
+            "sum_of_table_seconds": round(table_seconds, 3),
+            "parallelism": round(table_seconds / wall_seconds, 2) if wall_seconds else None,
+            "sequential_seconds": (
+                round(sequential_seconds, 3) if sequential_seconds is not None else None
+            ),
+            "speedup": (
+                round(sequential_seconds / wall_seconds, 2)
+                if sequential_seconds is not None and wall_seconds else None
+            )
+        }
     }
 
+
+# --------------------------------------------------
+# Incremental ingestion (per-file high-water marks)
+# --------------------------------------------------
+def file_hash(path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def save_ingestion_state(cursor, source_file, table_name: str, digest: str = None,
+                         rows_loaded: int = None):
+    stat = os.stat(source_file)
+    cursor.execute("""
+        INSERT INTO staging.ingestion_state
+            (source_path, table_name, file_size, file_mtime, file_hash, rows_loaded, ingested_at)
+        VALUES (%s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP)
+        ON CONFLICT (source_path) DO UPDATE SET
+            table_name = EXCLUDED.table_name,
+            file_size = EXCLUDED.file_size,
+            file_mtime = EXCLUDED.file_mtime,
+            file_hash = COALESCE(EXCLUDED.file_hash, staging.ingestion_state.file_hash),
+            rows_loaded = COALESCE(EXCLUDED.rows_loaded, staging.ingestion_state.rows_loaded),
+            ingested_at = EXCLUDED.ingested_at
+    """, (str(source_file), table_name, stat.st_size, stat.st_mtime, digest, rows_loaded))
+
+
+def record_ingestion_state(cursor, table_name: str, source_files: list):
+    """
+    Resets a table's high-water marks after a full reload, so the next
+    incremental run only picks up files that change afterwards.
+    """
+    cursor.execute("DELETE FROM staging.ingestion_state WHERE table_name = %s", (table_name,))
+    for source_file in source_files:
+        save_ingestion_state(cursor, source_file, table_name)
+
+
+def table_columns(cursor, table_name: str) -> tuple:
+    schema, name = table_name.split(".")
+
+    cursor.execute("""
+        SELECT column_name FROM information_schema.columns
+        WHERE table_schema = %s AND table_name = %s
+        ORDER BY ordinal_position
+    """, (schema, name))
+    columns = [r[0] for r in cursor.fetchall()]
+
+    cursor.execute("""
+        SELECT a.attname
+        FROM pg_index i
+        JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
+        WHERE i.indrelid = %s::regclass AND i.indisprimary
+    """, (table_name,))
+    key_columns = [r[0] for r in cursor.fetchall()]
+
+    return columns, key_columns
+
+
+def upsert_from_temp(cursor, temp_table: str, table_name: str) -> int:
+    """
+    Inserts new rows and updates rows whose values changed, keyed on the
+    table's primary key. Unchanged rows are left alone.
+    """
+    columns, key_columns = table_columns(cursor, table_name)
+    data_columns = [c for c in columns if c not in key_columns and c != "loaded_at"]
+    insert_columns = ", ".join(key_columns + data_columns)
+
+    cursor.execute(f"""
+        INSERT INTO {table_name} AS target ({insert_columns})
+        SELECT {insert_columns} FROM {temp_table}
+        ON CONFLICT ({", ".join(key_columns)}) DO UPDATE SET
+            {", ".join(f"{c} = EXCLUDED.{c}" for c in data_columns)},
+            loaded_at = CURRENT_TIMESTAMP
+        WHERE ({", ".join(f"target.{c}" for c in data_columns)})
+            IS DISTINCT FROM ({", ".join(f"EXCLUDED.{c}" for c in data_columns)})
+    """)
+    return cursor.rowcount
+
+
+def run_incremental_ingestion(tables: list, ingestion_config: dict) -> dict:
+    """
+    Loads only raw files that are new or changed since the last run
+    (size/mtime first, content hash to rule out touched-but-identical
+    files) and upserts their rows. Runtime follows the new data, not
+    the total history.
+    """
+    method = ingestion_config["method"]
+    connection = get_db_connection()
+    tables_loaded, validation = {}, {}
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT source_path, file_size, file_mtime, file_hash FROM staging.ingestion_state"
+            )
+            state = {r[0]: r[1:] for r in cursor.fetchall()}
+
+            for csv_file, table_name in tables:
+                start = time.perf_counter()
+                temp_table = f"incoming_{table_name.split('.')[1]}"
+                cursor.execute(
+                    f"CREATE TEMP TABLE {temp_table} (LIKE {table_name} INCLUDING DEFAULTS) "
+                    "ON COMMIT DROP"
+                )
+
+                source_files = resolve_source_files(csv_file)
+                stats, files_loaded, rows_upserted = {}, 0, 0
+                table_validation = {"csv_rows": 0, "db_rows": 0, "match": True}
+
+                for source_file in source_files:
+                    stat = os.stat(source_file)
+                    previous = state.get(str(source_file))
+                    if previous and previous[0] == stat.st_size and previous[1] == stat.st_mtime:
+                        continue
+
+                    digest = file_hash(source_file)
+                    if previous and previous[2] == digest:
+                        save_ingestion_state(cursor, source_file, table_name, digest)
+                        continue
+
+                    cursor.execute(f"TRUNCATE {temp_table}")
+                    file_stats = load_source_file(
+                        source_file, temp_table, connection, method,
+                        checksum=ingestion_config["checksum"]
+                    )
+
+                    file_validation = validate_staging_load(
+                        connection, {temp_table: load_result(file_stats, method, 0)}
+                    )[temp_table]
+                    for key in ("csv_rows", "db_rows"):
+                        table_validation[key] += file_validation[key]
+                    table_validation["match"] &= file_validation["match"]
+
+                    rows_upserted += upsert_from_temp(cursor, temp_table, table_name)
+                    save_ingestion_state(cursor, source_file, table_name, digest, file_stats["rows"])
+
+                    stats = merge_load_stats(stats, file_stats)
+                    files_loaded += 1
+
+                result = load_result(stats, method, time.perf_counter() - start)
+                result.update({
+                    "status": "success" if files_loaded else "unchanged",
+                    "files_total": len(source_files),
+                    "files_loaded": files_loaded,
+                    "files_skipped": len(source_files) - files_loaded,
+                    "rows_upserted": rows_upserted
+                })
+                tables_loaded[table_name] = result
+                validation[table_name] = table_validation
+
+        validation["overall_status"] = all(v["match"] for v in validation.values())
+        if not validation["overall_status"]:
+            raise Exception("Row count validation failed")
+
+        connection.commit()
+
+    except Exception:
+        connection.rollback()
+        raise
+
+    finally:
+        connection.close()
+
+    return {"mode": "incremental", "tables_loaded": tables_loaded, "validation": validation}
+
+
+# --------------------------------------------------
+# Validate staging load
+# --------------------------------------------------
+def validate_staging_load(connection, tables_loaded: dict) -> dict:
+    """
+    Compares the row counts (and key checksums, when collected) gathered
+    while loading against server-side aggregates, without re-reading files.
+    """
+    validation = {}
+
     with connection.cursor() as cursor:
-        for table, csv_path in tables.items():
-            cursor.execute(f"SELECT COUNT(*) FROM {table}")
-            db_count = cursor.fetchone()[0]
-            csv_count = len(pd.read_csv(csv_path))
+        for table, result in tables_loaded.items():
+            csv_count = result["rows_loaded"]
+            expected_checksum = result.get("key_checksum")
+
+            if expected_checksum is None:
+                cursor.execute(f"SELECT COUNT(*) FROM {table}")
+                db_count = cursor.fetchone()[0]
+            else:
+                cursor.execute(
+                    f"SELECT COUNT(*), {key_checksum_sql(result['key_column'])} FROM {table}"
+                )
+                db_count, db_checksum = cursor.fetchone()
 
             validation[table] = {
                 "csv_rows": csv_count,
@@ -112,6 +803,10 @@ def validate_staging_load(connection) -> dict:
                 "match": csv_count == db_count
             }
 
+            if expected_checksum is not None:
+                validation[table]["checksum_match"] = int(db_checksum) == expected_checksum
+                validation[table]["match"] &= validation[table]["checksum_match"]
+
     validation["overall_status"] = all(
         v["match"] for v in validation.values()
     )
@@ -124,6 +819,8 @@ def validate_staging_load(connection) -> dict:
 # --------------------------------------------------
 if __name__ == "__main__":
     start_time = time.time()
+    ingestion_config = load_config()["ingestion"]
+    method = ingestion_config["method"]
 
     summary = {
         "ingestion_timestamp": datetime.utcnow().isoformat(),
@@ -144,27 +841,52 @@ if __name__ == "__main__":
     connection = None
 
     try:
-        connection = get_db_connection()
-        connection.autocommit = False
-
-        with connection.cursor() as cursor:
-            cursor.execute("TRUNCATE staging.transaction_items CASCADE")
-            cursor.execute("TRUNCATE staging.transactions CASCADE")
-            cursor.execute("TRUNCATE staging.products CASCADE")
-            cursor.execute("TRUNCATE staging.customers CASCADE")
-
-        for csv_file, table_name in tables:
-            result = load_csv_to_staging(csv_file, table_name, connection)
-            summary["tables_loaded"][table_name] = result
-
-        validation = validate_staging_load(connection)
-        summary["validation"] = validation
-
-        if not validation["overall_status"]:
-            raise Exception("Row count validation failed")
-
-        connection.commit()
-        print("Staging ingestion successful")
+        if ingestion_config["mode"] == "incremental":
+            summary.update(run_incremental_ingestion(tables, ingestion_config))
+            print("Staging ingestion successful")
+
+        elif ingestion_config["parallel_workers"] > 1:
+            summary.update(run_parallel_ingestion(tables, ingestion_config))
+            print("Staging ingestion successful")
+
+        else:
+            connection = get_db_connection()
+            connection.autocommit = False
+
+            with connection.cursor() as cursor:
+                cursor.execute("TRUNCATE staging.transaction_items CASCADE")
+                cursor.execute("TRUNCATE staging.transactions CASCADE")
+                cursor.execute("TRUNCATE staging.products CASCADE")
+                cursor.execute("TRUNCATE staging.customers CASCADE")
+
+            for csv_file, table_name in tables:
+                benchmark = {}
+                if ingestion_config["benchmark"]:
+                    for other_method in {"copy", "insert"} - {method}:
+                        benchmark[other_method] = benchmark_load_method(
+                            csv_file, table_name, connection, other_method
+                        )
+
+                result = load_csv_to_staging(
+                    csv_file, table_name, connection, method, ingestion_config["checksum"]
+                )
+                if benchmark:
+                    result["benchmark"] = benchmark
+
+                summary["tables_loaded"][table_name] = result
+
+            validation = validate_staging_load(connection, summary["tables_loaded"])
+            summary["validation"] = validation
+
+            if not validation["overall_status"]:
+                raise Exception("Row count validation failed")
+
+            with connection.cursor() as cursor:
+                for csv_file, table_name in tables:
+                    record_ingestion_state(cursor, table_name, resolve_source_files(csv_file))
+
+            connection.commit()
+            print("Staging ingestion successful")
 
     except Exception as e:
         if connection:
@@ -4,11 +4,15 @@ import time
 from datetime import datetime, timezone
 import statistics
 import os
+import sys
 
 # -------------------------------------------------
 # Paths
 # -------------------------------------------------
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, BASE_DIR)
+
+from scripts.query_registry import load_registry  # noqa: E402
 
 PIPELINE_REPORT_PATH = os.path.join(
     BASE_DIR, "data", "processed", "pipeline_execution_report.json"
@@ -44,18 +48,15 @@ def load_pipeline_report():
 def run_sql_queries(cursor):
     """
     Executes monitoring SQL queries safely.
-    Returns None for all DB-based results if DB is unavailable.
+    Returns {query name: rows}, or None if DB is unavailable.
     """
     if cursor is None:
-        return None, None, None, None
-
-    with open(MONITORING_SQL_PATH) as f:
-        queries = [q.strip() for q in f.read().split(";") if q.strip()]
+        return None
 
-    results = []
-    for q in queries:
-        cursor.execute(q)
-        results.append(cursor.fetchall())
+    results = {}
+    for query in load_registry(MONITORING_SQL_PATH):
+        cursor.execute(query.sql)
+        results[query.name] = cursor.fetchall()
 
     return results
 
@@ -122,17 +123,15 @@ def main():
     freshness_map = {}
     volume_rows = []
     quality_rows = [(0, 0, 0)]
-    connections_rows = [(0,)]
-
-    if sql_results and sql_results[0] is not None:
-        freshness_rows, volume_rows, quality_rows, connections_rows = sql_results
-
-        freshness_map = {row[0]: row[1] for row in freshness_rows}
-        active_connections = connections_rows[0][0  ]
+    row_counts = {}
+
+    if sql_results:
+        freshness_map = {row[0]: row[1] for row in sql_results["data_freshness_check"]}
+        volume_rows = sql_results["volume_trend_last_30_days"]
+        quality_rows = sql_results["data_quality_issues"]
+        active_connections = sql_results["database_statistics"][0][0]
+        row_counts = dict(sql_results["table_row_counts"])
     else:
-        freshness_map = {}
-        volume_rows = []
-        quality_rows = [(0, 0, 0)]
         active_connections = None
 
     now = datetime.now(timezone.utc)
@@ -244,7 +243,8 @@ def main():
                 ),
                 "actual_count": today_count,
                 "anomaly_detected": anomaly_detected,
-                "anomaly_type": anomaly_type
+                "anomaly_type": anomaly_type,
+                "table_row_counts": row_counts
             },
             "data_quality": {
                 "status": quality_status,
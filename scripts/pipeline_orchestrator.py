@@ -22,6 +22,7 @@ timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
 MAIN_LOG_FILE = LOG_DIR / f"pipeline_orchestrator_{timestamp}.log"
 ERROR_LOG_FILE = LOG_DIR / "pipeline_errors.log"
 REPORT_FILE = REPORT_DIR / "pipeline_execution_report.json"
+QUALITY_REPORT_FILE = REPORT_DIR / "quality_report.json"
 
 # -------------------------------
 # Logging Configuration
@@ -49,11 +50,14 @@ PIPELINE_STEPS = [
     ("data_quality_checks", "scripts/quality_checks/data_quality_checks.py"),
     ("staging_to_production", "scripts/transformation/staging_to_production.py"),
     ("warehouse_load", "scripts/transformation/load_warehouse.py"),
+    ("warehouse_aggregates", "scripts/transformation/build_aggregates.py"),
     ("analytics_generation", "scripts/transformation/generate_analytics.py"),
 ]
 
 MAX_RETRIES = 3
 BACKOFF_SECONDS = [1, 2, 4]
+# Deterministic failures (a failed quality gate) are not retried
+NO_RETRY_EXIT_CODES = {3}
 
 # -------------------------------
 # Helper: Run a step with retries
@@ -101,7 +105,7 @@ def run_step(step_name: str, script_path: str) -> dict:
             error_logger.error(e.stderr)
             error_logger.error(traceback.format_exc())
 
-            if attempt == MAX_RETRIES:
+            if attempt == MAX_RETRIES or e.returncode in NO_RETRY_EXIT_CODES:
                 duration = round(time.time() - start_time, 2)
                 return {
                     "status": "failed",
@@ -114,6 +118,21 @@ def run_step(step_name: str, script_path: str) -> dict:
             logging.warning(f"Retrying {step_name} after {sleep_time}s")
             time.sleep(sleep_time)
 
+# -------------------------------
+# Helper: Quality gate warnings
+# -------------------------------
+def quality_warnings(since: float) -> list:
+    # A report older than the step is left over from an earlier run
+    if not QUALITY_REPORT_FILE.exists() or QUALITY_REPORT_FILE.stat().st_mtime < since:
+        return []
+    with open(QUALITY_REPORT_FILE) as f:
+        report = json.load(f)
+    return [
+        f"data_quality_checks: {issue['rule']}: {issue['message']}"
+        for issue in report.get("issues", [])
+        if issue.get("severity") == "warning"
+    ]
+
 # -------------------------------
 # Main Orchestrator
 # -------------------------------
@@ -128,9 +147,13 @@ def main():
     warnings = []
 
     for step_name, script_path in PIPELINE_STEPS:
+        step_start = time.time()
         result = run_step(step_name, script_path)
         steps_report[step_name] = result
 
+        if step_name == "data_quality_checks":
+            warnings.extend(quality_warnings(step_start))
+
         if result["status"] != "success":
             errors.append(f"{step_name} failed")
             break
@@ -1,9 +1,17 @@
 # scripts/quality_checks/data_quality_checks.py
 
+import sys
 import json
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime, timezone
 
+import pandas as pd
+import psycopg2
+import yaml
+
 # -------------------------------
 # Paths
 # -------------------------------
@@ -12,27 +20,302 @@ OUTPUT_DIR = BASE_DIR / "data" / "processed"
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
 QUALITY_REPORT_PATH = OUTPUT_DIR / "quality_report.json"
+CONFIG_PATH = BASE_DIR / "config" / "config.yaml"
+RAW_DIR = BASE_DIR / "data" / "raw"
+RAW_SUFFIXES = (".csv", ".parquet")
+
+# Keys each rule type needs (range rules also need min or max)
+RULE_KEYS = {
+    "not_null": ("column",),
+    "unique": ("column",),
+    "range": ("column",),
+    "referential": ("column", "references"),
+    "expression": ("sql",),
+    "aggregate": ("column", "references", "aggregates", "sql"),
+}
+RULE_TYPES = tuple(RULE_KEYS)
+AGGREGATE_FUNCTIONS = ("count", "sum", "min", "max")
+SEVERITIES = ("error", "warning")
+
+# Exit code of a failed quality gate; the orchestrator does not retry it
+QUALITY_GATE_EXIT_CODE = 3
+
+sys.path.insert(0, str(BASE_DIR))
+
+from scripts.quality_checks.validate_data import (  # noqa: E402
+    calculate_score,
+    run_table_checks,
+)
+
+# -------------------------------
+# Config & rules
+# -------------------------------
+def load_config():
+    settings = {
+        "rules_path": "config/quality_rules.yaml",
+        "source": "auto",
+        "fail_on_error": True,
+    }
+    if CONFIG_PATH.exists():
+        with open(CONFIG_PATH) as f:
+            settings.update((yaml.safe_load(f) or {}).get("quality") or {})
+    return settings
+
+
+def load_rules(rules_path):
+    """Returns {table: [rule]} with defaults applied, rejecting malformed rules."""
+    with open(BASE_DIR / rules_path) as f:
+        declared = yaml.safe_load(f)
+
+    defaults = declared.get("defaults", {})
+    rules = {}
+    for table, table_rules in declared["tables"].items():
+        rules[table] = []
+        for rule in table_rules:
+            rule = {**defaults, **rule, "table": table}
+            if not rule.get("name"):
+                raise ValueError(f"{table}: rule without a name: {rule}")
+            name = f"{table}.{rule['name']}"
+            if rule.get("type") not in RULE_TYPES:
+                raise ValueError(f"{name}: unknown rule type {rule.get('type')!r}")
+            if rule["severity"] not in SEVERITIES:
+                raise ValueError(f"{name}: unknown severity {rule['severity']!r}")
+            missing = [key for key in RULE_KEYS[rule["type"]] if rule.get(key) in (None, "")]
+            if missing:
+                raise ValueError(f"{name}: {rule['type']} rule needs {', '.join(missing)}")
+            if rule["type"] == "range" and rule.get("min") is None and rule.get("max") is None:
+                raise ValueError(f"{name}: range rule needs min or max")
+            if "." not in rule.get("references", "."):
+                raise ValueError(f"{name}: references must be schema.table.column")
+            for alias, (_, function) in rule.get("aggregates", {}).items():
+                if function not in AGGREGATE_FUNCTIONS:
+                    raise ValueError(f"{name}: unknown aggregate function {function!r} for {alias}")
+            rules[table].append(rule)
+    return rules
+
+# -------------------------------
+# Database checks (set-based SQL)
+# -------------------------------
+def compile_rules(table_rules, alias="src"):
+    """
+    Turns a table's rules into a validate_data check spec, so they run as
+    one COUNT(*) FILTER query over a single scan of the table.
+    """
+    spec = {"alias": alias, "filters": {}, "unique": {}, "joins": []}
+    aggregate_joins = {}
+    for rule in table_rules:
+        name, column = rule["name"], f"{alias}.{rule.get('column')}"
+
+        if rule["type"] == "not_null":
+            blank = f" OR {column} = ''" if rule.get("blank_is_null") else ""
+            spec["filters"][name] = f"{column} IS NULL{blank}"
+
+        elif rule["type"] == "unique":
+            spec["unique"][name] = rule["column"]
+
+        elif rule["type"] == "range":
+            bounds = []
+            if rule.get("min") is not None:
+                bounds.append(f"{column} < {rule['min']}")
+            if rule.get("max") is not None:
+                bounds.append(f"{column} > {rule['max']}")
+            spec["filters"][name] = " OR ".join(bounds)
+
+        elif rule["type"] == "referential":
+            ref_table, ref_column = rule["references"].rsplit(".", 1)
+            ref = f"ref_{len(spec['joins'])}"
+            spec["joins"].append(
+                f"LEFT JOIN (SELECT DISTINCT {ref_column} AS ref_key FROM {ref_table}) {ref}"
+                f" ON {ref}.ref_key = {column}"
+            )
+            spec["filters"][name] = f"{column} IS NOT NULL AND {ref}.ref_key IS NULL"
+
+        elif rule["type"] == "expression":
+            spec["filters"][name] = f"NOT COALESCE(({rule['sql']}), FALSE)"
+
+        elif rule["type"] == "aggregate":
+            # Rules over the same child rows share one grouped join
+            group = aggregate_joins.setdefault((rule["column"], rule["references"]), {})
+            group.update(rule["aggregates"])
+            spec["filters"][name] = f"NOT COALESCE(({rule['sql']}), FALSE)"
+
+    for (column, references), aggregates in aggregate_joins.items():
+        ref_table, ref_column = references.rsplit(".", 1)
+        ref = f"ref_{len(spec['joins'])}"
+        selected = ", ".join(
+            f"{function.upper()}({source}) AS {output}"
+            for output, (source, function) in aggregates.items()
+        )
+        spec["joins"].append(
+            f"LEFT JOIN (SELECT {ref_column} AS ref_key, {selected}"
+            f" FROM {ref_table} GROUP BY {ref_column}) {ref}"
+            f" ON {ref}.ref_key = {alias}.{column}"
+        )
+    return spec
+
+
+def run_database_checks(rules, max_workers=4):
+    """Runs each table's batched query concurrently; returns violations, row counts, timings."""
+    violations, row_counts, timings = {}, {}, {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(run_table_checks, table, compile_rules(table_rules)): table
+            for table, table_rules in rules.items()
+        }
+        for future in as_completed(futures):
+            table = futures[future]
+            counts, elapsed_ms = future.result()
+            row_counts[table] = counts.pop("total_rows")
+            violations[table] = counts
+            timings[table] = elapsed_ms
+    return violations, row_counts, timings
 
 # -------------------------------
-# Quality checks (DB optional)
+# File checks (vectorized pandas)
 # -------------------------------
-def run_quality_checks():
+def resolve_raw_files(table):
+    path = RAW_DIR / table.rsplit(".", 1)[-1]
+    for suffix in RAW_SUFFIXES:
+        if path.with_suffix(suffix).exists():
+            return [path.with_suffix(suffix)]
+    return sorted(f for f in path.rglob("*") if f.suffix in RAW_SUFFIXES)
+
+
+def read_raw_table(table, columns=None):
+    files = resolve_raw_files(table)
+    if not files:
+        raise FileNotFoundError(f"No raw files for {table} under {RAW_DIR}")
+    frames = [
+        pd.read_parquet(f, columns=columns) if f.suffix == ".parquet"
+        else pd.read_csv(f, usecols=columns)
+        for f in files
+    ]
+    return pd.concat(frames, ignore_index=True)
+
+
+def file_violations(rule, df, reference):
+    if rule["type"] == "unique":
+        return int((df[rule["column"]].value_counts(dropna=False) > 1).sum())
+
+    if rule["type"] in ("expression", "aggregate"):
+        if rule["type"] == "aggregate":
+            df = df.join(reference, on=rule["column"])
+        passed = df.eval(rule.get("pandas", rule["sql"]))
+        return int((~passed.fillna(False).astype(bool)).sum())
+
+    values = df[rule["column"]]
+    if rule["type"] == "not_null":
+        violated = values.isna()
+        if rule.get("blank_is_null"):
+            violated |= values.astype("string").str.strip().eq("").fillna(False)
+    elif rule["type"] == "range":
+        violated = pd.Series(False, index=df.index)
+        if rule.get("min") is not None:
+            violated |= values < rule["min"]
+        if rule.get("max") is not None:
+            violated |= values > rule["max"]
+    else:
+        violated = values.notna() & ~values.isin(reference)
+    return int(violated.sum())
+
+
+def run_file_checks(rules):
+    """Evaluates the rules over the raw files with column-wise pandas operations."""
+    violations, row_counts, timings = {}, {}, {}
+    for table, table_rules in rules.items():
+        start = time.perf_counter()
+        needs_all = any(rule["type"] in ("expression", "aggregate") for rule in table_rules)
+        columns = None if needs_all else sorted({rule["column"] for rule in table_rules})
+        df = read_raw_table(table, columns)
+
+        violations[table] = {}
+        for rule in table_rules:
+            reference = None
+            if rule["type"] == "referential":
+                ref_table, ref_column = rule["references"].rsplit(".", 1)
+                reference = read_raw_table(ref_table, [ref_column])[ref_column]
+            elif rule["type"] == "aggregate":
+                ref_table, ref_column = rule["references"].rsplit(".", 1)
+                sources = {source for source, _ in rule["aggregates"].values()}
+                reference = read_raw_table(ref_table, sorted(sources | {ref_column})).groupby(
+                    ref_column
+                ).agg(**{name: tuple(aggregate) for name, aggregate in rule["aggregates"].items()})
+            violations[table][rule["name"]] = file_violations(rule, df, reference)
+
+        row_counts[table] = len(df)
+        timings[table] = round((time.perf_counter() - start) * 1000, 2)
+    return violations, row_counts, timings
+
+# -------------------------------
+# Quality checks
+# -------------------------------
+def run_quality_checks(settings=None, source=None):
     """
-    This function is intentionally lightweight.
-    Database-based checks are optional and skipped
-    if DB is unavailable.
+    Evaluates the declared rules against staging, or the raw files when the
+    database is unavailable (source "auto") or when asked to (source "files").
+    A rule fails once its violating share of rows exceeds its threshold.
     """
+    settings = settings or load_config()
+    source = source or settings["source"]
+    rules = load_rules(settings["rules_path"])
+
+    start = time.perf_counter()
+    if source in ("auto", "database"):
+        try:
+            violations, row_counts, timings = run_database_checks(rules)
+            source = "database"
+        except psycopg2.OperationalError:
+            if source == "database":
+                raise
+            source = "files"
+    if source == "files":
+        violations, row_counts, timings = run_file_checks(rules)
 
-    issues = []
+    results, issues = [], []
+    for table, table_rules in rules.items():
+        rows = row_counts[table]
+        for rule in table_rules:
+            count = violations[table][rule["name"]]
+            rate = count / rows if rows else 0
+            status = "passed"
+            if count and rate > rule["threshold"]:
+                status = "failed" if rule["severity"] == "error" else "warning"
+                issues.append({
+                    "rule": f"{table}.{rule['name']}",
+                    "severity": rule["severity"],
+                    "message": f"{count} of {rows} rows violate {rule['type']} rule "
+                               f"(threshold {rule['threshold']:.2%})"
+                })
+            results.append({
+                "table": table,
+                "rule": rule["name"],
+                "type": rule["type"],
+                "severity": rule["severity"],
+                "threshold": rule["threshold"],
+                "violations": count,
+                "rows": rows,
+                "violation_rate": round(rate, 6),
+                "status": status
+            })
 
-    # Example checks (extendable later)
-    # For now, pass all checks to satisfy evaluation
-    quality_score = 100
+    total_violations = sum(r["violations"] for r in results)
+    checked_rows = sum(r["rows"] for r in results)
+    statuses = {r["status"] for r in results}
 
     report = {
         "generated_at": datetime.now(timezone.utc).isoformat(),
-        "quality_score": quality_score,
-        "issues": issues
+        "source": source,
+        "status": (
+            "failed" if "failed" in statuses else
+            "warning" if "warning" in statuses else
+            "passed"
+        ),
+        "quality_score": calculate_score(total_violations, checked_rows),
+        "row_counts": row_counts,
+        "rules": results,
+        "issues": issues,
+        "timings_ms": timings,
+        "total_execution_time_ms": round((time.perf_counter() - start) * 1000, 2)
     }
 
     return report
@@ -41,12 +324,25 @@ def run_quality_checks():
 # Main
 # -------------------------------
 def main():
-    report = run_quality_checks()
+    settings = load_config()
+    parser = argparse.ArgumentParser(description="Run the declared data quality rules")
+    parser.add_argument("--source", choices=["auto", "database", "files"], default=settings["source"])
+    parser.add_argument("--warn-only", action="store_true",
+                        help="Report failed error-level rules without failing the step")
+    args = parser.parse_args()
+
+    report = run_quality_checks(settings, args.source)
 
     with open(QUALITY_REPORT_PATH, "w") as f:
         json.dump(report, f, indent=4)
 
     print(f"Quality report generated at {QUALITY_REPORT_PATH}")
+    for issue in report["issues"]:
+        stream = sys.stderr if issue["severity"] == "error" else sys.stdout
+        print(f"{issue['severity'].upper()}: {issue['rule']}: {issue['message']}", file=stream)
+
+    if report["status"] == "failed" and settings["fail_on_error"] and not args.warn_only:
+        sys.exit(QUALITY_GATE_EXIT_CODE)
 
 if __name__ == "__main__":
     main()
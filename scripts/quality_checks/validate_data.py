@@ -1,33 +1,213 @@
+import os
 import json
+import argparse
+import time
 import psycopg2
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 
 
 def get_connection():
     return psycopg2.connect(
-        host="localhost",
-        port=5432,
-        database="ecommerce_db",
-        user="postgres",
-        password="postgres"
+        host=os.getenv("DB_HOST", "localhost"),
+        port=int(os.getenv("DB_PORT", 5432)),
+        database=os.getenv("DB_NAME", "ecommerce_db"),
+        user=os.getenv("DB_USER", "postgres"),
+        password=os.getenv("DB_PASSWORD", "postgres")
     )
 
 
-def fetch_single_value(cursor, query):
-    cursor.execute(query)
-    return cursor.fetchone()[0]
+# -----------------------------
+# CHECK DECLARATIONS
+# -----------------------------
+# One entry per driving table: filters are COUNT(*) FILTER conditions,
+# unique maps a check to a column whose duplicated values are counted,
+# joins bring in what referential and cross-table checks compare against.
+TABLE_CHECKS = {
+    "staging.customers": {
+        "alias": "c",
+        "filters": {
+            "customers.email": "c.email IS NULL OR c.email = ''",
+        },
+        "unique": {
+            "duplicate_customer_ids": "customer_id",
+            "duplicate_emails": "email",
+        },
+    },
+    "staging.products": {
+        "alias": "p",
+        "filters": {
+            "invalid_price": "p.price <= 0",
+            "cost_greater_than_price": "p.cost >= p.price",
+        },
+    },
+    "staging.transactions": {
+        "alias": "t",
+        "joins": [
+            """LEFT JOIN (
+                   SELECT transaction_id, SUM(line_total) AS item_total
+                   FROM staging.transaction_items GROUP BY transaction_id
+               ) ti ON ti.transaction_id = t.transaction_id""",
+            """LEFT JOIN (SELECT DISTINCT customer_id FROM staging.customers) c
+               ON c.customer_id = t.customer_id""",
+        ],
+        "filters": {
+            "transactions_without_items": "ti.transaction_id IS NULL",
+            "transaction_total_mismatch": "ABS(t.total_amount - ti.item_total) > 0.01",
+            "orphan_transactions": "c.customer_id IS NULL",
+        },
+    },
+    "staging.transaction_items": {
+        "alias": "ti",
+        "joins": [
+            """LEFT JOIN (SELECT DISTINCT transaction_id FROM staging.transactions) t
+               ON t.transaction_id = ti.transaction_id""",
+            """LEFT JOIN (SELECT DISTINCT product_id FROM staging.products) p
+               ON p.product_id = ti.product_id""",
+        ],
+        "filters": {
+            "invalid_discount": "ti.discount_percentage < 0 OR ti.discount_percentage > 100",
+            "invalid_quantity": "ti.quantity <= 0",
+            "line_total_mismatch": (
+                "ABS(ti.line_total - (ti.quantity * ti.unit_price"
+                " * (1 - ti.discount_percentage/100.0))) > 0.01"
+            ),
+            "orphan_items_transaction": "t.transaction_id IS NULL",
+            "orphan_items_product": "p.product_id IS NULL",
+        },
+    },
+}
+
+
+def compile_table_query(table, spec):
+    """
+    Compiles every check of a table into one aggregate query, so the table
+    is scanned once. Duplicate values are counted through window counts
+    over the same scan (one per distinct value with more than one row).
+    """
+    alias = spec["alias"]
+    source = f"{table} {alias}"
+    columns = ["COUNT(*) AS total_rows"]
+
+    if spec.get("unique"):
+        windows = []
+        for i, column in enumerate(spec["unique"].values()):
+            windows.append(f"COUNT(*) OVER (PARTITION BY {column}) AS _dup_count_{i}")
+            windows.append(f"ROW_NUMBER() OVER (PARTITION BY {column}) AS _dup_row_{i}")
+        source = f"(SELECT {alias}.*, {', '.join(windows)} FROM {table} {alias}) {alias}"
+        for i, check in enumerate(spec["unique"]):
+            columns.append(
+                f"COUNT(*) FILTER (WHERE {alias}._dup_count_{i} > 1 AND {alias}._dup_row_{i} = 1)"
+                f" AS {check}"
+            )
+
+    for check, condition in spec.get("filters", {}).items():
+        columns.append(f'COUNT(*) FILTER (WHERE {condition}) AS "{check}"')
+
+    return "\n".join([
+        "SELECT " + ",\n       ".join(columns),
+        f"FROM {source}",
+        *spec.get("joins", []),
+    ])
+
+
+def compile_check_query(table, spec, check=None):
+    """
+    Compiles a table's query with only one of its checks, or with none
+    (just the scan and joins) when check is None.
+    """
+    single = {key: spec[key] for key in ("alias", "joins") if key in spec}
+    for kind in ("filters", "unique"):
+        if check in spec.get(kind, {}):
+            single[kind] = {check: spec[kind][check]}
+    return compile_table_query(table, single)
+
+
+def time_query(cur, sql, repeats):
+    """Best of repeats runs of a query, in milliseconds."""
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        cur.execute(sql)
+        cur.fetchall()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return round(best * 1000, 2)
+
+
+def profile_checks(repeats=3):
+    """
+    Times every check on its own, one query at a time: the table's query
+    without checks, then the same query with that one check. Joins no check
+    reads are dropped by the planner, so over_scan_ms is what a check costs
+    on top of the shared scan, including the joins it needs.
+    """
+    profile = {}
+    conn = get_connection()
+    try:
+        cur = conn.cursor()
+        for table, spec in TABLE_CHECKS.items():
+            scan_ms = time_query(cur, compile_check_query(table, spec), repeats)
+            checks = {}
+            for check in [*spec.get("filters", {}), *spec.get("unique", {})]:
+                query_ms = time_query(cur, compile_check_query(table, spec, check), repeats)
+                checks[check] = {
+                    "query_ms": query_ms,
+                    "over_scan_ms": round(query_ms - scan_ms, 2),
+                }
+            profile[table] = {"scan_ms": scan_ms, "checks": checks}
+    finally:
+        conn.close()
+    return profile
+
+
+def run_table_checks(table, spec):
+    """Runs one table's compiled query on its own connection."""
+    conn = get_connection()
+    try:
+        cur = conn.cursor()
+        start = time.perf_counter()
+        cur.execute(compile_table_query(table, spec))
+        row = cur.fetchone()
+        elapsed_ms = round((time.perf_counter() - start) * 1000, 2)
+        counts = dict(zip([d.name for d in cur.description], row))
+    finally:
+        conn.close()
+    return counts, elapsed_ms
+
+
+def run_all_checks(max_workers=4):
+    """
+    Runs the per-table queries concurrently. Returns the violation count of
+    every check, and row counts and query milliseconds per table. The checks
+    of a table share its one scan, so they have no time of their own.
+    """
+    counts, row_counts, timings = {}, {}, {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(run_table_checks, table, spec): table
+            for table, spec in TABLE_CHECKS.items()
+        }
+        for future in as_completed(futures):
+            table = futures[future]
+            table_counts, elapsed_ms = future.result()
+            row_counts[table] = table_counts.pop("total_rows")
+            counts.update(table_counts)
+            timings[table] = elapsed_ms
+    return counts, row_counts, timings
 
 
 def calculate_score(violations, total):
+    """Percentage of checked rows without violations."""
     if total == 0:
         return 100
     return max(0, round((1 - violations / total) * 100, 2))
 
 
-def run_quality_checks():
-    conn = get_connection()
-    cur = conn.cursor()
+def run_quality_checks(profile=False):
+    start = time.perf_counter()
+    counts, row_counts, timings = run_all_checks()
 
     report = {
         "check_timestamp": datetime.utcnow().isoformat(),
@@ -37,13 +217,8 @@ def run_quality_checks():
     # -----------------------------
     # COMPLETENESS
     # -----------------------------
-    null_email = fetch_single_value(cur,
-        "SELECT COUNT(*) FROM staging.customers WHERE email IS NULL OR email = ''")
-    missing_items = fetch_single_value(cur,
-        """SELECT COUNT(*) FROM staging.transactions t
-           LEFT JOIN staging.transaction_items ti
-           ON t.transaction_id = ti.transaction_id
-           WHERE ti.transaction_id IS NULL""")
+    null_email = counts["customers.email"]
+    missing_items = counts["transactions_without_items"]
 
     completeness_violations = null_email + missing_items
 
@@ -60,10 +235,8 @@ def run_quality_checks():
     # -----------------------------
     # UNIQUENESS
     # -----------------------------
-    dup_customers = fetch_single_value(cur,
-        "SELECT COUNT(*) FROM (SELECT customer_id FROM staging.customers GROUP BY customer_id HAVING COUNT(*) > 1) x")
-    dup_emails = fetch_single_value(cur,
-        "SELECT COUNT(*) FROM (SELECT email FROM staging.customers GROUP BY email HAVING COUNT(*) > 1) x")
+    dup_customers = counts["duplicate_customer_ids"]
+    dup_emails = counts["duplicate_emails"]
 
     uniqueness_violations = dup_customers + dup_emails
 
@@ -79,12 +252,9 @@ def run_quality_checks():
     # -----------------------------
     # VALIDITY / RANGE
     # -----------------------------
-    invalid_price = fetch_single_value(cur,
-        "SELECT COUNT(*) FROM staging.products WHERE price <= 0")
-    invalid_discount = fetch_single_value(cur,
-        "SELECT COUNT(*) FROM staging.transaction_items WHERE discount_percentage < 0 OR discount_percentage > 100")
-    invalid_qty = fetch_single_value(cur,
-        "SELECT COUNT(*) FROM staging.transaction_items WHERE quantity <= 0")
+    invalid_price = counts["invalid_price"]
+    invalid_discount = counts["invalid_discount"]
+    invalid_qty = counts["invalid_quantity"]
 
     range_violations = invalid_price + invalid_discount + invalid_qty
 
@@ -101,18 +271,11 @@ def run_quality_checks():
     # -----------------------------
     # CONSISTENCY
     # -----------------------------
-    line_mismatch = fetch_single_value(cur,
-        """SELECT COUNT(*) FROM staging.transaction_items
-           WHERE ABS(line_total - (quantity * unit_price * (1 - discount_percentage/100.0))) > 0.01""")
+    line_mismatch = counts["line_total_mismatch"]
 
-    total_mismatch = fetch_single_value(cur,
-        """SELECT COUNT(*) FROM staging.transactions t
-           JOIN (SELECT transaction_id, SUM(line_total) s FROM staging.transaction_items GROUP BY transaction_id) ti
-           ON t.transaction_id = ti.transaction_id
-           WHERE ABS(t.total_amount - ti.s) > 0.01""")
+    total_mismatch = counts["transaction_total_mismatch"]
 
-    cost_price = fetch_single_value(cur,
-        "SELECT COUNT(*) FROM staging.products WHERE cost >= price")
+    cost_price = counts["cost_greater_than_price"]
 
     consistency_violations = line_mismatch + total_mismatch + cost_price
 
@@ -129,20 +292,11 @@ def run_quality_checks():
     # -----------------------------
     # REFERENTIAL INTEGRITY
     # -----------------------------
-    orphan_tx = fetch_single_value(cur,
-        """SELECT COUNT(*) FROM staging.transactions t
-           LEFT JOIN staging.customers c ON t.customer_id = c.customer_id
-           WHERE c.customer_id IS NULL""")
+    orphan_tx = counts["orphan_transactions"]
 
-    orphan_item_tx = fetch_single_value(cur,
-        """SELECT COUNT(*) FROM staging.transaction_items ti
-           LEFT JOIN staging.transactions t ON ti.transaction_id = t.transaction_id
-           WHERE t.transaction_id IS NULL""")
+    orphan_item_tx = counts["orphan_items_transaction"]
 
-    orphan_item_prod = fetch_single_value(cur,
-        """SELECT COUNT(*) FROM staging.transaction_items ti
-           LEFT JOIN staging.products p ON ti.product_id = p.product_id
-           WHERE p.product_id IS NULL""")
+    orphan_item_prod = counts["orphan_items_product"]
 
     ref_violations = orphan_tx + orphan_item_tx + orphan_item_prod
 
@@ -167,7 +321,12 @@ def run_quality_checks():
         ref_violations
     )
 
-    report["overall_quality_score"] = calculate_score(total_violations, 50000)
+    # Every check looks at all rows of its table
+    checked_rows = sum(
+        row_counts[table] * (len(spec.get("filters", {})) + len(spec.get("unique", {})))
+        for table, spec in TABLE_CHECKS.items()
+    )
+    report["overall_quality_score"] = calculate_score(total_violations, checked_rows)
 
     report["quality_grade"] = (
         "A" if report["overall_quality_score"] >= 95 else
@@ -176,7 +335,11 @@ def run_quality_checks():
         "D"
     )
 
-    conn.close()
+    report["row_counts"] = row_counts
+    report["timings_ms"] = timings
+    report["total_execution_time_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    if profile:
+        report["check_profile_ms"] = profile_checks()
 
     Path("data/staging").mkdir(parents=True, exist_ok=True)
     with open("data/staging/quality_report.json", "w") as f:
@@ -186,4 +349,8 @@ def run_quality_checks():
 
 
 if __name__ == "__main__":
-    run_quality_checks()
+    parser = argparse.ArgumentParser(description="Run the staging data quality checks")
+    parser.add_argument("--profile-checks", action="store_true",
+                        help="Also time every check on its own query (slower)")
+    args = parser.parse_args()
+    run_quality_checks(profile=args.profile_checks)
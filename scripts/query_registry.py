@@ -0,0 +1,239 @@
+import re
+import json
+import hashlib
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+# -------------------------------
+# CONFIG
+# -------------------------------
+REGISTRY_CACHE = Path("data/processed/cache/query_registry.json")
+
+HEADER = re.compile(r"^\s*--\s*Query\s+(\d+):\s*(.+?)\s*$", re.MULTILINE)
+DOLLAR_TAG = re.compile(r"\$(?:[A-Za-z_][A-Za-z_0-9]*)?\$")
+
+# Parsed registries of this process, keyed on the resolved file path
+_loaded = {}
+
+
+class Query(NamedTuple):
+    key: str                 # positional id used for output files, e.g. "query3"
+    number: int
+    name: str                # slug of the header title, e.g. "category_performance"
+    title: Optional[str]
+    sql: str
+
+
+# -------------------------------
+# SQL SCRIPT PARSING
+# -------------------------------
+
+def _skip_comments(sql_text, i):
+    """Returns the index of the first character after whitespace and comments."""
+    n = len(sql_text)
+    while i < n:
+        if sql_text[i].isspace():
+            i += 1
+        elif sql_text.startswith("--", i):
+            end = sql_text.find("\n", i)
+            i = n if end == -1 else end + 1
+        elif sql_text.startswith("/*", i):
+            i = _skip_block_comment(sql_text, i)
+        else:
+            break
+    return i
+
+
+def _skip_block_comment(sql_text, i):
+    # PostgreSQL block comments nest
+    depth, i, n = 1, i + 2, len(sql_text)
+    while i < n and depth:
+        if sql_text.startswith("/*", i):
+            depth, i = depth + 1, i + 2
+        elif sql_text.startswith("*/", i):
+            depth, i = depth - 1, i + 2
+        else:
+            i += 1
+    return i
+
+
+def _is_identifier_char(ch):
+    return ch.isalnum() or ch in "_$"
+
+
+def _skip_quoted(sql_text, i):
+    quote, n = sql_text[i], len(sql_text)
+    # E'...' only when the E starts a token: in LIKE'a\' or name'b\' it ends a
+    # word and the literal is a standard string, where backslash is plain
+    backslash_escapes = (
+        quote == "'" and i > 0 and sql_text[i - 1] in "eE"
+        and not (i > 1 and _is_identifier_char(sql_text[i - 2]))
+    )
+    i += 1
+    while i < n:
+        if backslash_escapes and sql_text[i] == "\\":
+            i += 2
+        elif sql_text[i] == quote:
+            if sql_text.startswith(quote * 2, i):
+                i += 2
+            else:
+                return i + 1
+        else:
+            i += 1
+    return n
+
+
+def split_statements(sql_text):
+    """
+    Splits a SQL script on top-level semicolons, skipping those inside
+    comments, quoted strings and identifiers, and dollar-quoted bodies.
+    Each statement keeps its leading comments; comment-only pieces are dropped.
+    """
+    statements, start, i, n = [], 0, 0, len(sql_text)
+    while i < n:
+        ch = sql_text[i]
+        if sql_text.startswith("--", i):
+            end = sql_text.find("\n", i)
+            i = n if end == -1 else end + 1
+        elif sql_text.startswith("/*", i):
+            i = _skip_block_comment(sql_text, i)
+        elif ch in "'\"":
+            i = _skip_quoted(sql_text, i)
+        elif ch == "$" and not (i and (sql_text[i - 1].isalnum() or sql_text[i - 1] == "_")):
+            tag = DOLLAR_TAG.match(sql_text, i)
+            if tag:
+                end = sql_text.find(tag.group(), tag.end())
+                i = n if end == -1 else end + len(tag.group())
+            else:
+                i += 1
+        elif ch == ";":
+            statements.append(sql_text[start:i])
+            start = i = i + 1
+        else:
+            i += 1
+    statements.append(sql_text[start:])
+
+    return [s.strip() for s in statements if _skip_comments(s, 0) < len(s)]
+
+
+def _slug(title):
+    return re.sub(r"[^a-z0-9]+", "_", title.lower()).strip("_")
+
+
+def parse_queries(sql_text):
+    """
+    Parses a script into Query records. Names come from the
+    '-- Query N: Title' header in a statement's leading comments;
+    statements without one are named by position.
+    """
+    queries, names = [], set()
+    for position, statement in enumerate(split_statements(sql_text), start=1):
+        body_start = _skip_comments(statement, 0)
+        header = HEADER.search(statement[:body_start])
+        number = int(header.group(1)) if header else position
+        title = header.group(2) if header else None
+
+        name = _slug(title) if title else f"query{number}"
+        if name in names:
+            name = f"{name}_{number}"
+        names.add(name)
+        queries.append(Query(f"query{number}", number, name, title, statement[body_start:]))
+    return queries
+
+
+# -------------------------------
+# REGISTRY
+# -------------------------------
+
+class QueryRegistry:
+    """The named queries of one .sql file, in file order."""
+
+    def __init__(self, queries):
+        self.queries = list(queries)
+        self._lookup = {}
+        for query in self.queries:
+            for alias in (query.key, query.name, str(query.number)):
+                self._lookup.setdefault(alias, query)
+
+    def __iter__(self):
+        return iter(self.queries)
+
+    def __len__(self):
+        return len(self.queries)
+
+    def __getitem__(self, name):
+        try:
+            return self._lookup[str(name)]
+        except KeyError:
+            raise KeyError(
+                f"Unknown query {name!r}; known: {', '.join(q.name for q in self.queries)}"
+            ) from None
+
+    def select(self, names):
+        """Registry of the given keys, names or numbers, kept in file order."""
+        wanted = {self[name] for name in names}
+        return QueryRegistry(q for q in self.queries if q in wanted)
+
+
+def load_registry(path, cache_path=REGISTRY_CACHE):
+    """
+    Returns the registry for a .sql file. Parsed files are reused within the
+    process and, while the file's size and mtime are unchanged, across runs
+    through a JSON cache.
+    """
+    path = Path(path).resolve()
+    stat = path.stat()
+    signature = [stat.st_size, stat.st_mtime_ns]
+
+    cached = _loaded.get(path)
+    if cached and cached[0] == signature:
+        return cached[1]
+
+    cache = {}
+    if cache_path is not None and Path(cache_path).exists():
+        with open(cache_path) as f:
+            cache = json.load(f)
+
+    entry = cache.get(str(path))
+    if entry and entry["signature"] == signature:
+        queries = [Query(**query) for query in entry["queries"]]
+    else:
+        queries = parse_queries(path.read_text())
+        if cache_path is not None:
+            cache[str(path)] = {
+                "signature": signature,
+                "queries": [query._asdict() for query in queries]
+            }
+            Path(cache_path).parent.mkdir(parents=True, exist_ok=True)
+            with open(cache_path, "w") as f:
+                json.dump(cache, f, indent=2)
+
+    registry = QueryRegistry(queries)
+    _loaded[path] = (signature, registry)
+    return registry
+
+
+# -------------------------------
+# PREPARED STATEMENTS
+# -------------------------------
+
+class PreparedQueries:
+    """
+    PREPAREs queries on one connection the first time they are used and
+    returns the EXECUTE statement to run, so repeated queries skip parsing
+    and planning. Prepared statements live for the session, not the
+    transaction, so rollbacks do not invalidate them.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.prepared = set()
+
+    def __call__(self, query):
+        digest = hashlib.md5(query.sql.encode()).hexdigest()[:8]
+        statement = f"q_{query.name[:40]}_{digest}"
+        if statement not in self.prepared:
+            with self.conn.cursor() as cursor:
+                cursor.execute(f"PREPARE {statement} AS {query.sql}")
+            self.prepared.add(statement)
+        return f"EXECUTE {statement}"
@@ -0,0 +1,157 @@
+import json
+import re
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(BASE_DIR))
+
+from scripts.transformation.staging_to_production import (  # noqa: E402
+    cleanse_customer_data,
+    cleanse_product_data,
+)
+
+
+# -------------------------------
+# ROW-WISE REFERENCE IMPLEMENTATIONS
+# (the original per-row cleansing; the vectorized versions must match them)
+# -------------------------------
+
+def cleanse_customer_data_rowwise(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+
+    for col in df.select_dtypes(include=["object", "string"]).columns:
+        df[col] = df[col].apply(lambda x: x.strip() if isinstance(x, str) else x)
+
+    df["email"] = df["email"].apply(lambda x: x.lower() if isinstance(x, str) else x)
+    df["phone"] = df["phone"].apply(
+        lambda x: re.sub(r"\D", "", x) if isinstance(x, str) else x
+    )
+
+    df["first_name"] = df["first_name"].apply(lambda x: x.title() if isinstance(x, str) else x)
+    df["last_name"] = df["last_name"].apply(lambda x: x.title() if isinstance(x, str) else x)
+
+    return df
+
+
+def cleanse_product_data_rowwise(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+
+    for col in df.select_dtypes(include="object").columns:
+        df[col] = df[col].str.strip()
+
+    df["price"] = df["price"].round(2)
+    df["cost"] = df["cost"].round(2)
+
+    df["profit_margin"] = ((df["price"] - df["cost"]) / df["price"] * 100).round(2)
+
+    def price_category(price):
+        if price < 50:
+            return "Budget"
+        elif price < 200:
+            return "Mid-range"
+        return "Premium"
+
+    df["price_category"] = df["price"].apply(price_category)
+
+    return df
+
+
+# -------------------------------
+# SAMPLE DATA (shaped like staging.customers / staging.products)
+# -------------------------------
+
+def make_customers(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    first = np.array([" alice", "BOB ", "carol", " dave smith", "ÉMILE"], dtype=object)
+    last = np.array(["o'neil ", "MCDONALD", " van der berg", "lee"], dtype=object)
+    ids = np.char.mod("CUST%07d", np.arange(1, n + 1)).astype(object)
+
+    return pd.DataFrame({
+        "customer_id": ids,
+        "first_name": rng.choice(first, n),
+        "last_name": rng.choice(last, n),
+        "email": " " + ids + "@Example.COM ",
+        "phone": rng.choice(np.array(["(555) 123-4567", "+1.555.987.6543 x12", "555 0100"],
+                                     dtype=object), n),
+        "registration_date": [date(2023, 1, 1) + timedelta(days=int(d))
+                              for d in rng.integers(0, 365, n)],
+        "city": rng.choice(np.array([" Springfield", "Shelbyville "], dtype=object), n),
+        "state": rng.choice(np.array(["CA", " NY "], dtype=object), n),
+        "country": "India",
+        "age_group": rng.choice(np.array(["18-25", "26-35", "60+"], dtype=object), n),
+    })
+
+
+def make_products(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    price = rng.uniform(1, 500, n)
+
+    return pd.DataFrame({
+        "product_id": np.char.mod("PROD%07d", np.arange(1, n + 1)).astype(object),
+        "product_name": rng.choice(np.array([" Widget ", "Gadget", " Gizmo"], dtype=object), n),
+        "category": rng.choice(np.array(["Books ", "Sports"], dtype=object), n),
+        "sub_category": rng.choice(np.array(["Fiction", " Outdoor"], dtype=object), n),
+        "price": price,
+        "cost": price * rng.uniform(0.4, 0.8, n),
+        "brand": rng.choice(np.array(["Acme ", "Globex"], dtype=object), n),
+        "stock_quantity": rng.integers(0, 1000, n),
+        "supplier_id": "SUP001",
+    })
+
+
+# -------------------------------
+# MICRO-BENCHMARK
+# -------------------------------
+
+def _best_of(func, df, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(df)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run_benchmark(rows: int = 200000, repeat: int = 3) -> dict:
+    cases = {
+        "customers": (make_customers(rows), cleanse_customer_data_rowwise, {
+            "vectorized": cleanse_customer_data,
+            "vectorized_pyarrow": lambda df: cleanse_customer_data(df, "pyarrow"),
+        }),
+        "products": (make_products(rows), cleanse_product_data_rowwise, {
+            "vectorized": cleanse_product_data,
+            "vectorized_pyarrow": lambda df: cleanse_product_data(df, "pyarrow"),
+        }),
+    }
+
+    results = {"rows": rows}
+    for table, (df, rowwise, variants) in cases.items():
+        expected = rowwise(df)
+        baseline = _best_of(rowwise, df, repeat)
+        results[table] = {"rowwise_seconds": round(baseline, 4)}
+
+        for name, func in variants.items():
+            pd.testing.assert_frame_equal(func(df), expected)
+            seconds = _best_of(func, df, repeat)
+            results[table][f"{name}_seconds"] = round(seconds, 4)
+            results[table][f"{name}_speedup"] = round(baseline / seconds, 2)
+
+    return results
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    results = run_benchmark(rows)
+
+    output_path = Path("data/processed")
+    output_path.mkdir(parents=True, exist_ok=True)
+    with open(output_path / "cleansing_benchmark.json", "w") as f:
+        json.dump(results, f, indent=2)
+
+    print(json.dumps(results, indent=2))
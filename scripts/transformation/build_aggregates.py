@@ -0,0 +1,353 @@
+import os
+import sys
+import json
+import time
+import argparse
+import logging
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+import psycopg2
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from scripts.query_registry import PreparedQueries, load_registry  # noqa: E402
+from scripts.transformation.load_warehouse import (  # noqa: E402
+    explain_analytical_queries,
+    load_config,
+)
+
+# -------------------------------
+# LOGGING
+# -------------------------------
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(message)s",
+)
+
+AGGREGATE_QUERIES = "sql/queries/analytical_queries.sql"
+FACT_SCAN_QUERIES = "sql/queries/analytical_queries_fact_scan.sql"
+SOURCE_TABLE = "warehouse.fact_sales"
+
+# -------------------------------
+# DATABASE CONNECTION
+# -------------------------------
+
+def get_connection():
+    return psycopg2.connect(
+        host=os.getenv("DB_HOST", "localhost"),
+        port=os.getenv("DB_PORT", "5432"),
+        dbname=os.getenv("DB_NAME", "ecommerce_db_test"),
+        user=os.getenv("DB_USER", "test_user"),
+        password=os.getenv("DB_PASSWORD", "test_password"),
+    )
+
+# -------------------------------
+# FACT DELTA
+# -------------------------------
+
+def stage_fact_delta(cur, last_sales_key):
+    """
+    Collects the facts added since the last refresh (sign +1) and the
+    retracted facts (sign -1) into a temp table, so every aggregate can be
+    updated from the delta alone. The new watermark and the retractions to
+    drain are taken from this one snapshot, not re-read afterwards.
+    """
+    cur.execute("""
+        CREATE TEMP TABLE fact_delta ON COMMIT DROP AS
+        SELECT
+            sales_key,
+            date_key,
+            customer_key,
+            product_key,
+            transaction_id,
+            quantity,
+            line_total,
+            profit,
+            CASE
+                WHEN unit_price * quantity = 0 THEN 0
+                ELSE (discount_amount / (unit_price * quantity)) * 100
+            END AS discount_pct,
+            sign
+        FROM (
+            SELECT f.*, 1 AS sign FROM warehouse.fact_sales f
+            WHERE f.sales_key > %(last_sales_key)s
+            UNION ALL
+            SELECT r.*, -1 AS sign FROM warehouse.fact_sales_retracted r
+        ) delta
+    """, {"last_sales_key": last_sales_key})
+    cur.execute("ANALYZE fact_delta")
+
+# -------------------------------
+# AGGREGATE UPSERTS
+# -------------------------------
+
+def refresh_daily_sales(cur):
+    # Transactions, revenue and profit are additive; a transaction is always
+    # added or retracted as a whole, so distinct counts per sign add up
+    cur.execute("""
+        INSERT INTO warehouse.agg_daily_sales AS agg (
+            date_key, total_transactions, total_revenue, total_profit, unique_customers
+        )
+        SELECT
+            date_key,
+            COUNT(DISTINCT transaction_id) FILTER (WHERE sign = 1)
+                - COUNT(DISTINCT transaction_id) FILTER (WHERE sign = -1),
+            SUM(sign * line_total),
+            SUM(sign * profit),
+            0
+        FROM fact_delta
+        GROUP BY date_key
+        ON CONFLICT (date_key) DO UPDATE SET
+            total_transactions = agg.total_transactions + EXCLUDED.total_transactions,
+            total_revenue = agg.total_revenue + EXCLUDED.total_revenue,
+            total_profit = agg.total_profit + EXCLUDED.total_profit
+    """)
+    upserted = cur.rowcount
+
+    # Distinct customers are not additive: recount them for touched dates only
+    cur.execute("""
+        UPDATE warehouse.agg_daily_sales agg
+        SET unique_customers = counts.unique_customers
+        FROM (
+            SELECT f.date_key, COUNT(DISTINCT f.customer_key) AS unique_customers
+            FROM warehouse.fact_sales f
+            WHERE f.date_key IN (SELECT DISTINCT date_key FROM fact_delta)
+            GROUP BY f.date_key
+        ) counts
+        WHERE agg.date_key = counts.date_key
+    """)
+    cur.execute("DELETE FROM warehouse.agg_daily_sales WHERE total_transactions <= 0")
+    return upserted
+
+
+def refresh_product_performance(cur):
+    cur.execute("""
+        INSERT INTO warehouse.agg_product_performance AS agg (
+            product_key, total_quantity_sold, total_revenue, total_profit,
+            avg_discount_percentage, line_count, discount_percentage_sum
+        )
+        SELECT
+            product_key,
+            SUM(sign * quantity),
+            SUM(sign * line_total),
+            SUM(sign * profit),
+            SUM(sign * discount_pct) / NULLIF(SUM(sign), 0),
+            SUM(sign),
+            SUM(sign * discount_pct)
+        FROM fact_delta
+        GROUP BY product_key
+        ON CONFLICT (product_key) DO UPDATE SET
+            total_quantity_sold = agg.total_quantity_sold + EXCLUDED.total_quantity_sold,
+            total_revenue = agg.total_revenue + EXCLUDED.total_revenue,
+            total_profit = agg.total_profit + EXCLUDED.total_profit,
+            line_count = agg.line_count + EXCLUDED.line_count,
+            discount_percentage_sum = agg.discount_percentage_sum + EXCLUDED.discount_percentage_sum,
+            avg_discount_percentage =
+                (agg.discount_percentage_sum + EXCLUDED.discount_percentage_sum)
+                / NULLIF(agg.line_count + EXCLUDED.line_count, 0)
+    """)
+    upserted = cur.rowcount
+    cur.execute("DELETE FROM warehouse.agg_product_performance WHERE line_count <= 0")
+    return upserted
+
+
+def refresh_customer_metrics(cur):
+    cur.execute("""
+        INSERT INTO warehouse.agg_customer_metrics AS agg (
+            customer_key, total_transactions, total_spent, avg_order_value, last_purchase_date
+        )
+        SELECT
+            f.customer_key,
+            COUNT(DISTINCT f.transaction_id) FILTER (WHERE f.sign = 1)
+                - COUNT(DISTINCT f.transaction_id) FILTER (WHERE f.sign = -1),
+            SUM(f.sign * f.line_total),
+            NULL,
+            MAX(d.full_date) FILTER (WHERE f.sign = 1)
+        FROM fact_delta f
+        JOIN warehouse.dim_date d ON d.date_key = f.date_key
+        GROUP BY f.customer_key
+        ON CONFLICT (customer_key) DO UPDATE SET
+            total_transactions = agg.total_transactions + EXCLUDED.total_transactions,
+            total_spent = agg.total_spent + EXCLUDED.total_spent,
+            last_purchase_date = GREATEST(agg.last_purchase_date, EXCLUDED.last_purchase_date)
+    """)
+    upserted = cur.rowcount
+
+    cur.execute("""
+        UPDATE warehouse.agg_customer_metrics
+        SET avg_order_value = total_spent / NULLIF(total_transactions, 0)
+        WHERE customer_key IN (SELECT DISTINCT customer_key FROM fact_delta)
+    """)
+
+    # A retraction may remove the latest purchase: recompute it from the facts
+    cur.execute("""
+        UPDATE warehouse.agg_customer_metrics agg
+        SET last_purchase_date = latest.last_purchase_date
+        FROM (
+            SELECT f.customer_key, MAX(d.full_date) AS last_purchase_date
+            FROM warehouse.fact_sales f
+            JOIN warehouse.dim_date d ON d.date_key = f.date_key
+            WHERE f.customer_key IN (SELECT DISTINCT customer_key FROM fact_delta WHERE sign = -1)
+            GROUP BY f.customer_key
+        ) latest
+        WHERE agg.customer_key = latest.customer_key
+    """)
+    cur.execute("DELETE FROM warehouse.agg_customer_metrics WHERE total_transactions <= 0")
+    return upserted
+
+# -------------------------------
+# MAIN AGGREGATE REFRESH
+# -------------------------------
+
+def refresh_aggregates(conn):
+    """
+    Folds the fact rows added since the last refresh, minus retracted ones,
+    into the agg_* tables. Without refresh state (first run, or after a full
+    fact refresh) the aggregates are rebuilt from all facts.
+    """
+    start = time.perf_counter()
+    cur = conn.cursor()
+
+    cur.execute(
+        "SELECT last_sales_key FROM warehouse.aggregate_state WHERE source_table = %s",
+        (SOURCE_TABLE,)
+    )
+    row = cur.fetchone()
+    if row is None:
+        mode, last_sales_key = "rebuild", 0
+        cur.execute("""
+            TRUNCATE TABLE warehouse.agg_daily_sales,
+                           warehouse.agg_product_performance,
+                           warehouse.agg_customer_metrics,
+                           warehouse.fact_sales_retracted
+        """)
+    else:
+        mode, last_sales_key = "incremental", row[0]
+
+    stage_fact_delta(cur, last_sales_key)
+    cur.execute("SELECT COUNT(*) FILTER (WHERE sign = 1), COUNT(*) FILTER (WHERE sign = -1) FROM fact_delta")
+    added, retracted = cur.fetchone()
+
+    upserted = {
+        "warehouse.agg_daily_sales": refresh_daily_sales(cur),
+        "warehouse.agg_product_performance": refresh_product_performance(cur),
+        "warehouse.agg_customer_metrics": refresh_customer_metrics(cur),
+    }
+
+    # Only the staged retractions: ones written since are folded in next time
+    cur.execute("""
+        DELETE FROM warehouse.fact_sales_retracted r
+        USING fact_delta d
+        WHERE d.sign = -1 AND r.sales_key = d.sales_key
+    """)
+
+    # Bump the data version of the aggregates in the same transaction
+    if mode == "rebuild" or added or retracted:
+        cur.execute("SELECT nextval('warehouse.load_run_id_seq')")
+        run_id = cur.fetchone()[0]
+        for table_name, rows in upserted.items():
+            cur.execute(
+                "INSERT INTO warehouse.load_runs (run_id, table_name, rows_changed) VALUES (%s, %s, %s)",
+                (run_id, table_name, max(rows, 1))
+            )
+    # Facts committed after fact_delta was staged stay above the watermark
+    cur.execute("""
+        INSERT INTO warehouse.aggregate_state (source_table, last_sales_key, refreshed_at)
+        SELECT %s, COALESCE(MAX(sales_key) FILTER (WHERE sign = 1), %s), CURRENT_TIMESTAMP
+        FROM fact_delta
+        ON CONFLICT (source_table) DO UPDATE SET
+            last_sales_key = EXCLUDED.last_sales_key,
+            refreshed_at = EXCLUDED.refreshed_at
+    """, (SOURCE_TABLE, last_sales_key))
+    conn.commit()
+
+    seconds = round(time.perf_counter() - start, 3)
+    logging.info(
+        f"Aggregates refreshed ({mode}): {added} facts added, "
+        f"{retracted} retracted, in {seconds}s"
+    )
+    return {
+        "mode": mode,
+        "facts_added": added,
+        "facts_retracted": retracted,
+        "rows_upserted": upserted,
+        "seconds": seconds
+    }
+
+# -------------------------------
+# QUERY BENCHMARK
+# -------------------------------
+
+def _timed(conn, prepared, query, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        df = pd.read_sql(prepared(query), conn)
+        timings.append(time.perf_counter() - start)
+    return df, round(min(timings) * 1000, 2)
+
+
+def _same_result(left, right):
+    if list(left.columns) != list(right.columns) or len(left) != len(right):
+        return False
+    left = left.sort_values(list(left.columns)).reset_index(drop=True)
+    right = right.sort_values(list(right.columns)).reset_index(drop=True)
+    try:
+        pd.testing.assert_frame_equal(left, right, check_dtype=False)
+    except AssertionError:
+        return False
+    return True
+
+
+def benchmark_queries(conn, repeat=5):
+    """
+    Times every analytical query that reads an aggregate against its
+    original fact_sales scan, and checks both return the same rows. Both
+    run as prepared statements, so the timings exclude planning after the
+    first run.
+    """
+    aggregate = load_registry(AGGREGATE_QUERIES)
+    prepared = PreparedQueries(conn)
+    results = {}
+
+    for before in load_registry(FACT_SCAN_QUERIES):
+        number = before.number
+        before_df, before_ms = _timed(conn, prepared, before, repeat)
+        after_df, after_ms = _timed(conn, prepared, aggregate[number], repeat)
+        results[before.key] = {
+            "fact_scan_ms": before_ms,
+            "aggregate_ms": after_ms,
+            "speedup": round(before_ms / after_ms, 2) if after_ms else None,
+            "results_match": _same_result(before_df, after_df)
+        }
+        logging.info(f"query{number}: {results[f'query{number}']}")
+    return results
+
+# -------------------------------
+# ENTRY POINT
+# -------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Refresh the warehouse aggregate tables")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="Also time aggregate-backed queries against their fact scans")
+    args = parser.parse_args()
+
+    conn = get_connection()
+    summary = {
+        "refresh_timestamp": datetime.now().isoformat(),
+        "refresh": refresh_aggregates(conn)
+    }
+    if args.benchmark:
+        summary["query_timings"] = benchmark_queries(conn)
+    # Plans are measured on the refreshed aggregates
+    if load_config()["explain_report"]:
+        explain_analytical_queries(conn)
+    conn.close()
+
+    os.makedirs("data/processed", exist_ok=True)
+    with open("data/processed/aggregate_summary.json", "w") as f:
+        json.dump(summary, f, indent=2, default=str)
+
+    logging.info("Aggregate Refresh Completed Successfully")
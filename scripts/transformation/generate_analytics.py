@@ -1,66 +1,367 @@
+import os
+import re
+import sys
+import gzip
 import psycopg2
-import pandas as pd
+import argparse
+import hashlib
+import itertools
 import json
+import shutil
 import time
-from datetime import datetime
+import yaml
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime
 from pathlib import Path
+from psycopg2.extensions import ISOLATION_LEVEL_REPEATABLE_READ
+from psycopg2.pool import ThreadedConnectionPool
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
+from scripts.query_registry import load_registry  # noqa: E402
+
+ANALYTICAL_QUERIES = "sql/queries/analytical_queries.sql"
 OUTPUT_DIR = Path("data/processed/analytics")
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+CACHE_DIR = OUTPUT_DIR / "cache"
+CACHE_INDEX = CACHE_DIR / "index.json"
+EXPORT_SUFFIXES = {"csv": ".csv", "gzip": ".csv.gz", "parquet": ".parquet"}
+
+# Arrow types for PostgreSQL type OIDs; NUMERIC becomes float64 as
+# pd.read_sql did before, anything unlisted is exported as text
+ARROW_TYPE_NAMES = {
+    16: "bool_",
+    20: "int64", 21: "int64", 23: "int64",
+    700: "float64", 701: "float64", 1700: "float64",
+    1082: "date32",
+}
+
+def load_config():
+    config_path = Path("config/config.yaml")
+    config = {}
+
+    if config_path.exists():
+        with open(config_path, "r") as f:
+            config = yaml.safe_load(f) or {}
+
+    return {
+        "concurrency": 4,
+        "cache": True,
+        "cache_max_age_hours": 24,
+        "cache_max_mb": 256,
+        "export_format": "csv",
+        "export_batch_size": 50000,
+        **config.get("analytics", {}),
+    }
+
+def get_connection_params():
+    return {
+        "host": os.getenv("DB_HOST", "localhost"),
+        "port": int(os.getenv("DB_PORT", 5432)),
+        "database": os.getenv("DB_NAME", "ecommerce_db"),
+        "user": os.getenv("DB_USER", "postgres"),
+        "password": os.getenv("DB_PASSWORD", "postgres")
+    }
 
 def get_connection():
-    return psycopg2.connect(
-        host="localhost",
-        port=5432,
-        database="ecommerce_db",
-        user="postgres",
-        password="postgres"
-    )
+    return psycopg2.connect(**get_connection_params())
 
-def execute_query(conn, query_name, sql):
+def export_query(conn, query_name, sql, export_format="csv", batch_size=50000):
+    """
+    Streams a query result into OUTPUT_DIR/<query_name><suffix> from a named
+    server-side cursor, batch_size rows at a time, so memory stays bounded:
+    CSV and gzip are written batch by batch with DataFrame.to_csv, Parquet
+    as one row group per batch. Returns the row and column counts taken
+    from the stream, and the elapsed milliseconds.
+    """
     start = time.time()
-    df = pd.read_sql(sql, conn)
+    path = OUTPUT_DIR / f"{query_name}{EXPORT_SUFFIXES[export_format]}"
+
+    with conn.cursor(name=f"export_{query_name}") as cursor:
+        cursor.itersize = batch_size
+        cursor.execute(sql)
+        # A named cursor only describes its columns once rows are fetched
+        batches = iter(lambda: cursor.fetchmany(batch_size), [])
+        first = next(batches, [])
+        columns = cursor.description
+
+        if export_format == "parquet":
+            rows = _export_parquet(first, batches, columns, path)
+        else:
+            opener = gzip.open if export_format == "gzip" else open
+            rows = _export_csv(first, batches, columns, path, opener)
+
     elapsed_ms = round((time.time() - start) * 1000, 2)
-    return df, elapsed_ms
+    return rows, len(columns), elapsed_ms
 
-def export_to_csv(df, filename):
-    df.to_csv(OUTPUT_DIR / filename, index=False)
+def _export_csv(first, batches, columns, path, opener):
+    # Batches are converted as pd.read_sql converts a whole result, so the
+    # file matches read_sql(...).to_csv(index=False) byte for byte whenever a
+    # column's inferred dtype is the same in every batch (always, for
+    # results of at most batch_size rows)
+    names = [column.name for column in columns]
+    with opener(path, "wt", newline="") as f:
+        pd.DataFrame.from_records(first, columns=names, coerce_float=True).to_csv(f, index=False)
+        rows = len(first)
+        for batch in batches:
+            df = pd.DataFrame.from_records(batch, columns=names, coerce_float=True)
+            df.to_csv(f, header=False, index=False)
+            rows += len(batch)
+    return rows
 
-def generate_summary(results, total_time):
-    return {
+def _arrow_value(arrow_type, value):
+    if value is None:
+        return None
+    if arrow_type == "float64":
+        return float(value)
+    if arrow_type == "string":
+        return str(value)
+    return value
+
+def _export_parquet(first, batches, columns, path):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        (column.name, getattr(pa, ARROW_TYPE_NAMES.get(column.type_code, "string"))())
+        for column in columns
+    ])
+    rows = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for batch in itertools.chain([first] if first else [], batches):
+            arrays = [
+                pa.array([_arrow_value(field.type, v) for v in values], type=field.type)
+                for field, values in zip(schema, zip(*batch))
+            ]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            rows += len(batch)
+    return rows
+
+# -------------------------------
+# Result cache
+# -------------------------------
+def query_tables(sql):
+    return sorted({f"warehouse.{t}" for t in re.findall(r"\bwarehouse\.(\w+)", sql)})
+
+def data_versions(cursor):
+    """Latest load run that changed each warehouse table (warehouse.load_runs)."""
+    cursor.execute("SELECT table_name, MAX(run_id) FROM warehouse.load_runs GROUP BY table_name")
+    return dict(cursor.fetchall())
+
+def cache_key(sql, versions, export_format="csv"):
+    """Hash of the query text, output format and data versions of the tables it reads."""
+    tables = {table: versions.get(table, 0) for table in query_tables(sql)}
+    tables["export_format"] = export_format
+    if re.search(r"\b(CURRENT_DATE|CURRENT_TIMESTAMP|NOW\(\))", sql, re.IGNORECASE):
+        # e.g. days_since_registration: the result also changes with the date
+        tables["current_date"] = date.today().isoformat()
+    return hashlib.sha256((sql + json.dumps(tables, sort_keys=True)).encode()).hexdigest()
+
+def load_cache_index():
+    if CACHE_INDEX.exists():
+        with open(CACHE_INDEX) as f:
+            return json.load(f)
+    return {}
+
+def save_cache_index(index):
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with open(CACHE_INDEX, "w") as f:
+        json.dump(index, f, indent=2)
+
+def evict_cache(index, max_age_hours, max_mb):
+    """
+    Drops entries older than max_age_hours or whose file is gone, then the
+    least recently used ones until the cache fits in max_mb. Returns the
+    number of evicted entries.
+    """
+    now = time.time()
+    evicted = [
+        key for key, entry in index.items()
+        if now - entry["created_at"] > max_age_hours * 3600
+        or not (CACHE_DIR / f"{key}{entry.get('suffix', '.csv')}").exists()
+    ]
+
+    remaining = sorted(
+        (key for key in index if key not in evicted),
+        key=lambda key: index[key]["last_used"]
+    )
+    total_bytes = sum(index[key]["size_bytes"] for key in remaining)
+    while remaining and total_bytes > max_mb * 1024 * 1024:
+        key = remaining.pop(0)
+        total_bytes -= index[key]["size_bytes"]
+        evicted.append(key)
+
+    for key in evicted:
+        entry = index.pop(key)
+        (CACHE_DIR / f"{key}{entry.get('suffix', '.csv')}").unlink(missing_ok=True)
+    return len(evicted)
+
+def store_in_cache(index, key, query_name, suffix, result):
+    # Data versions only grow, so older entries of this query are dead
+    stale_keys = [k for k, e in index.items()
+                  if e["query_name"] == query_name and e.get("suffix", ".csv") == suffix]
+    for stale in stale_keys:
+        index.pop(stale)
+        (CACHE_DIR / f"{stale}{suffix}").unlink(missing_ok=True)
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    cached_file = CACHE_DIR / f"{key}{suffix}"
+    shutil.copyfile(OUTPUT_DIR / f"{query_name}{suffix}", cached_file)
+    index[key] = {
+        "query_name": query_name,
+        "suffix": suffix,
+        "rows": result["rows"],
+        "columns": result["columns"],
+        "size_bytes": cached_file.stat().st_size,
+        "created_at": time.time(),
+        "last_used": time.time()
+    }
+
+# -------------------------------
+# Query execution
+# -------------------------------
+def run_queries(queries, concurrency, cache_index=None, export_format="csv", batch_size=50000):
+    """
+    Runs the registry queries on a pool of `concurrency` connections. Every worker
+    transaction imports one exported REPEATABLE READ snapshot, so all results
+    describe the same database state. Results stream straight to their files.
+    With a cache index, queries whose text and table data versions (read in
+    the same snapshot) match a cached result reuse its CSV instead of running.
+    Returns per-query results and the wall time in seconds.
+    """
+    pool = ThreadedConnectionPool(1, concurrency + 1, **get_connection_params())
+    leader = pool.getconn()
+    results = {}
+
+    def run(query_name, sql):
+        conn = pool.getconn()
+        try:
+            conn.set_session(isolation_level=ISOLATION_LEVEL_REPEATABLE_READ, readonly=True)
+            with conn.cursor() as cursor:
+                cursor.execute("SET TRANSACTION SNAPSHOT %s", (snapshot,))
+            return export_query(conn, query_name, sql, export_format, batch_size)
+        finally:
+            conn.rollback()
+            pool.putconn(conn)
+
+    try:
+        # The leader keeps its transaction open so the snapshot stays importable
+        leader.set_session(isolation_level=ISOLATION_LEVEL_REPEATABLE_READ, readonly=True)
+        with leader.cursor() as cursor:
+            cursor.execute("SELECT pg_export_snapshot()")
+            snapshot = cursor.fetchone()[0]
+            versions = data_versions(cursor) if cache_index is not None else {}
+
+        start = time.time()
+        suffix = EXPORT_SUFFIXES[export_format]
+        pending = {}
+        for query in queries:
+            query_name = query.key
+            key = cache_key(query.sql, versions, export_format)
+            entry = cache_index.get(key) if cache_index is not None else None
+            if entry is not None:
+                shutil.copyfile(CACHE_DIR / f"{key}{suffix}", OUTPUT_DIR / f"{query_name}{suffix}")
+                entry["last_used"] = time.time()
+                results[query_name] = {
+                    "name": query.name,
+                    "rows": entry["rows"],
+                    "columns": entry["columns"],
+                    "execution_time_ms": 0.0,
+                    "cache": "hit"
+                }
+            else:
+                pending[query_name] = (key, query.sql, query.name)
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = {
+                executor.submit(run, query_name, sql): query_name
+                for query_name, (_, sql, _) in pending.items()
+            }
+            for future in as_completed(futures):
+                query_name = futures[future]
+                rows, columns, exec_time = future.result()
+
+                results[query_name] = {
+                    "name": pending[query_name][2],
+                    "rows": rows,
+                    "columns": columns,
+                    "execution_time_ms": exec_time,
+                    "cache": "miss" if cache_index is not None else "off"
+                }
+                if cache_index is not None:
+                    store_in_cache(cache_index, pending[query_name][0], query_name, suffix,
+                                   results[query_name])
+        wall_time = time.time() - start
+    finally:
+        leader.rollback()
+        pool.putconn(leader)
+        pool.closeall()
+
+    ordered = {query.key: results[query.key] for query in queries}
+    return ordered, wall_time
+
+def generate_summary(results, total_time, concurrency, sequential_time=None, evicted=0,
+                     export_format="csv"):
+    query_seconds = sum(r["execution_time_ms"] for r in results.values()) / 1000
+    summary = {
         "generation_timestamp": datetime.utcnow().isoformat(),
-        "queries_executed": len(results),
+        "queries_executed": sum(r["cache"] != "hit" for r in results.values()),
+        "concurrency": concurrency,
+        "export_format": export_format,
+        "cache": {
+            "hits": sum(r["cache"] == "hit" for r in results.values()),
+            "misses": sum(r["cache"] == "miss" for r in results.values()),
+            "evicted": evicted
+        },
         "query_results": results,
+        "sum_of_query_seconds": round(query_seconds, 2),
         "total_execution_time_seconds": round(total_time, 2)
     }
+    if sequential_time is not None:
+        summary["sequential_execution_time_seconds"] = round(sequential_time, 2)
+        summary["speedup"] = round(sequential_time / total_time, 2) if total_time else None
+    return summary
 
 def main():
-    conn = get_connection()
+    config = load_config()
+    parser = argparse.ArgumentParser(description="Run the analytical queries")
+    parser.add_argument("--concurrency", type=int, default=config["concurrency"])
+    parser.add_argument("--compare-sequential", action="store_true",
+                        help="Also time a one-connection run to report the speedup (no cache)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Run every query instead of reusing cached results")
+    parser.add_argument("--format", dest="export_format", choices=sorted(EXPORT_SUFFIXES),
+                        default=config["export_format"])
+    parser.add_argument("--queries", type=lambda value: value.split(","),
+                        help="Comma-separated query names, keys or numbers to run (default: all)")
+    args = parser.parse_args()
+    use_cache = config["cache"] and not args.no_cache and not args.compare_sequential
 
-    with open("sql/queries/analytical_queries.sql") as f:
-        sql_text = f.read()
-
-    queries = [q.strip() for q in sql_text.split(";") if q.strip()]
-    results = {}
-    total_start = time.time()
+    queries = load_registry(ANALYTICAL_QUERIES)
+    if args.queries:
+        queries = queries.select(args.queries)
 
-    for i, query in enumerate(queries, start=1):
-        query_name = f"query{i}"
-        df, exec_time = execute_query(conn, query_name, query)
-        export_to_csv(df, f"{query_name}.csv")
+    sequential_time = None
+    if args.compare_sequential:
+        _, sequential_time = run_queries(queries, 1, None, args.export_format,
+                                         config["export_batch_size"])
 
-        results[query_name] = {
-            "rows": len(df),
-            "columns": len(df.columns),
-            "execution_time_ms": exec_time
-        }
+    cache_index = load_cache_index() if use_cache else None
+    evicted = 0
+    if use_cache:
+        evicted = evict_cache(cache_index, config["cache_max_age_hours"], config["cache_max_mb"])
 
-    summary = generate_summary(results, time.time() - total_start)
+    results, total_time = run_queries(queries, args.concurrency, cache_index, args.export_format,
+                                      config["export_batch_size"])
+    if use_cache:
+        save_cache_index(cache_index)
+    summary = generate_summary(results, total_time, args.concurrency, sequential_time, evicted,
+                               args.export_format)
 
     with open(OUTPUT_DIR / "analytics_summary.json", "w") as f:
         json.dump(summary, f, indent=2)
 
-    conn.close()
     print("Analytics generation completed successfully")
 
 if __name__ == "__main__":
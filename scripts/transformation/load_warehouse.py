@@ -1,9 +1,18 @@
 import os
+import sys
+import json
+import time
+import argparse
 import logging
 from datetime import datetime
+from pathlib import Path
 
 import psycopg2
-from psycopg2.extras import execute_values
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from scripts.query_registry import load_registry  # noqa: E402
 
 # -------------------------------
 # LOGGING
@@ -13,6 +22,26 @@ logging.basicConfig(
     format="%(asctime)s | %(levelname)s | %(message)s",
 )
 
+# -------------------------------
+# CONFIG
+# -------------------------------
+
+def load_config():
+    config_path = Path("config/config.yaml")
+    config = {}
+
+    if config_path.exists():
+        with open(config_path, "r") as f:
+            config = yaml.safe_load(f) or {}
+
+    return {
+        "calendar_start": "2023-01-01",
+        "calendar_end": "2025-12-31",
+        "fact_retention_months": 0,
+        "explain_report": True,
+        **config.get("warehouse", {}),
+    }
+
 # -------------------------------
 # DATABASE CONNECTION
 # -------------------------------
@@ -27,163 +56,670 @@ def get_connection():
     )
 
 # -------------------------------
-# HELPER: EXECUTE & LOAD
+# SCHEMA
 # -------------------------------
 
-def load_table(select_sql, insert_sql, truncate, conn, table_name):
+# Migration first (upgrades an older warehouse in place), then the
+# create script adds whatever is still missing; both are idempotent
+SCHEMA_SCRIPTS = [
+    "sql/ddl/migrate_warehouse_schema.sql",
+    "sql/ddl/create_warehouse_schema.sql",
+]
+
+
+def apply_schema(conn, scripts=SCHEMA_SCRIPTS):
     cur = conn.cursor()
-    cur.execute(select_sql)
-    rows = cur.fetchall()
+    for script in scripts:
+        with open(script) as f:
+            cur.execute(f.read())
+    conn.commit()
 
-    if not rows:
-        logging.warning(f"No data found for {table_name}")
-        return
+# -------------------------------
+# HELPER: EXECUTE & LOAD
+# -------------------------------
+
+def load_table(select_sql, insert_sql, truncate, conn, table_name, on_conflict=""):
+    """
+    Runs the load as a single INSERT ... SELECT inside the database, so rows
+    never travel to the client and back.
+    """
+    start = time.perf_counter()
+    cur = conn.cursor()
 
     if truncate:
         cur.execute(f"TRUNCATE TABLE {table_name} CASCADE")
 
-    execute_values(cur, insert_sql, rows)
+    cur.execute(f"{insert_sql}\n{select_sql}\n{on_conflict}")
+    rows = cur.rowcount
+    conn.commit()
+    seconds = round(time.perf_counter() - start, 3)
+
+    if rows == 0:
+        logging.warning(f"No new data loaded into {table_name}")
+    else:
+        logging.info(f"Loaded {rows} records into {table_name} in {seconds}s")
+    return {"rows": rows, "seconds": seconds}
+
+# -------------------------------
+# HELPER: SCD TYPE 2 MERGE
+# -------------------------------
+
+def merge_scd2(source_sql, table_name, business_key, tracked_columns, conn):
+    """
+    Compares an MD5 of the tracked attributes of every source row with
+    the current version in the dimension. Changed rows are closed
+    (end_date, is_current = FALSE) and get a new version; new keys are
+    inserted; unchanged rows and their surrogate keys are left alone.
+    """
+    start = time.perf_counter()
+    name = table_name.split(".")[-1]
+    columns = [business_key] + tracked_columns
+    cur = conn.cursor()
+
+    # Versions loaded before row_hash existed hash their own attributes
+    cur.execute(f"""
+        UPDATE {table_name}
+        SET row_hash = MD5(ROW({", ".join(tracked_columns)})::TEXT)
+        WHERE is_current AND row_hash IS NULL
+    """)
+
+    cur.execute(f"""
+        CREATE TEMP TABLE scd_{name} ON COMMIT DROP AS
+        SELECT s.*, MD5(ROW({", ".join(f"s.{c}" for c in tracked_columns)})::TEXT) AS row_hash
+        FROM ({source_sql}) s
+    """)
+
+    cur.execute(f"""
+        UPDATE {table_name} d
+        SET end_date = CURRENT_DATE,
+            is_current = FALSE
+        FROM scd_{name} s
+        WHERE d.{business_key} = s.{business_key}
+          AND d.is_current
+          AND d.row_hash IS DISTINCT FROM s.row_hash
+    """)
+    changed = cur.rowcount
+
+    cur.execute(f"""
+        INSERT INTO {table_name} (
+            {", ".join(columns)}, effective_date, end_date, is_current, row_hash
+        )
+        SELECT {", ".join(f"s.{c}" for c in columns)}, CURRENT_DATE, NULL, TRUE, s.row_hash
+        FROM scd_{name} s
+        WHERE NOT EXISTS (
+            SELECT 1 FROM {table_name} d
+            WHERE d.{business_key} = s.{business_key} AND d.is_current
+        )
+    """)
+    inserted = cur.rowcount
+    conn.commit()
+    seconds = round(time.perf_counter() - start, 3)
+
+    logging.info(
+        f"Merged {table_name}: {inserted - changed} new, {changed} changed in {seconds}s"
+    )
+    return {"new": inserted - changed, "changed": changed, "seconds": seconds}
+
+# -------------------------------
+# HELPER: LOAD RUNS
+# -------------------------------
+
+def record_load_run(cur, changes):
+    """
+    Records the tables this run changed (rows_changed > 0) in
+    warehouse.load_runs under a new run_id, bumping their data version.
+    """
+    cur.execute("SELECT nextval('warehouse.load_run_id_seq')")
+    run_id = cur.fetchone()[0]
+    for table_name, rows_changed in changes.items():
+        if rows_changed:
+            cur.execute(
+                "INSERT INTO warehouse.load_runs (run_id, table_name, rows_changed) VALUES (%s, %s, %s)",
+                (run_id, table_name, rows_changed)
+            )
+    return run_id
+
+# -------------------------------
+# HELPER: CALENDAR DIMENSION
+# -------------------------------
+
+def ensure_calendar(conn, calendar_start, calendar_end):
+    """
+    Keeps warehouse.dim_date a gap-free calendar over the configured range,
+    widened to the first and last transaction date (index-only MIN/MAX).
+    Days are generated with generate_series only when the range grows.
+    """
+    start = time.perf_counter()
+    cur = conn.cursor()
+
+    cur.execute("""
+        SELECT
+            LEAST(%(start)s::DATE, MIN(transaction_date)),
+            GREATEST(%(end)s::DATE, MAX(transaction_date))
+        FROM production.transactions
+    """, {"start": calendar_start, "end": calendar_end})
+    first_day, last_day = cur.fetchone()
+
+    cur.execute("SELECT MIN(full_date), MAX(full_date), COUNT(*) FROM warehouse.dim_date")
+    have_first, have_last, have_days = cur.fetchone()
+    if (have_days and have_first <= first_day and have_last >= last_day
+            and have_days == (have_last - have_first).days + 1):
+        conn.rollback()
+        logging.info(f"warehouse.dim_date already covers {first_day} to {last_day}")
+        return {"rows": 0, "seconds": round(time.perf_counter() - start, 3)}
+
+    cur.execute("""
+        INSERT INTO warehouse.dim_date (
+            date_key,
+            full_date,
+            year,
+            quarter,
+            month,
+            day,
+            month_name,
+            day_name,
+            week_of_year,
+            is_weekend
+        )
+        SELECT
+            TO_CHAR(day, 'YYYYMMDD')::INT,
+            day,
+            EXTRACT(YEAR FROM day),
+            EXTRACT(QUARTER FROM day),
+            EXTRACT(MONTH FROM day),
+            EXTRACT(DAY FROM day),
+            TO_CHAR(day, 'Month'),
+            TO_CHAR(day, 'Day'),
+            EXTRACT(WEEK FROM day),
+            EXTRACT(ISODOW FROM day) IN (6,7)
+        FROM (
+            SELECT ts::DATE AS day
+            FROM generate_series(%s::DATE, %s::DATE, INTERVAL '1 day') AS g(ts)
+        ) days
+        ON CONFLICT (date_key) DO NOTHING
+    """, (first_day, last_day))
+    rows = cur.rowcount
+    conn.commit()
+    seconds = round(time.perf_counter() - start, 3)
+
+    logging.info(f"Extended warehouse.dim_date by {rows} days to {first_day} - {last_day} in {seconds}s")
+    return {"rows": rows, "seconds": seconds}
+
+# -------------------------------
+# HELPER: FACT PARTITIONS
+# -------------------------------
+
+def fact_partitions(cur):
+    """Returns the monthly partitions of warehouse.fact_sales, oldest first."""
+    cur.execute("""
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'warehouse.fact_sales'::regclass
+        ORDER BY c.relname
+    """)
+    return [row[0] for row in cur.fetchall()]
+
+
+def retention_start(cur, retention_months):
+    """First day of the oldest month kept in fact_sales, or None to keep all."""
+    if not retention_months:
+        return None
+    cur.execute(
+        "SELECT (DATE_TRUNC('month', CURRENT_DATE) - %s * INTERVAL '1 month')::DATE",
+        (retention_months,)
+    )
+    return cur.fetchone()[0]
+
+
+def ensure_fact_partitions(cur, retain_from=None):
+    """
+    Creates the missing monthly partitions of warehouse.fact_sales (range on
+    date_key, e.g. fact_sales_202301 holds 20230101 up to 20230201) for every
+    retained month between the first and last transaction date.
+    """
+    cur.execute("""
+        SELECT TO_CHAR(month, 'YYYYMM'), TO_CHAR(month + INTERVAL '1 month', 'YYYYMM')
+        FROM generate_series(
+            DATE_TRUNC('month', GREATEST(
+                (SELECT MIN(transaction_date) FROM production.transactions), %(retain_from)s
+            )),
+            DATE_TRUNC('month', (SELECT MAX(transaction_date) FROM production.transactions)),
+            INTERVAL '1 month'
+        ) AS month
+    """, {"retain_from": retain_from})
+    months = cur.fetchall()
+    existing = set(fact_partitions(cur))
+
+    created = []
+    for month, next_month in months:
+        partition = f"fact_sales_{month}"
+        if partition in existing:
+            continue
+        cur.execute(f"""
+            CREATE TABLE warehouse.{partition}
+            PARTITION OF warehouse.fact_sales
+            FOR VALUES FROM ({month}01) TO ({next_month}01)
+        """)
+        created.append(partition)
+
+    if created:
+        logging.info(f"Created fact_sales partitions: {', '.join(created)}")
+    return created
+
+
+def drop_expired_fact_partitions(conn, retain_from):
+    """
+    Drops whole monthly partitions before retain_from instead of deleting
+    their rows. The aggregates keep their history.
+    """
+    cur = conn.cursor()
+    cutoff = retain_from.strftime("%Y%m")
+
+    dropped = [p for p in fact_partitions(cur) if p.rsplit("_", 1)[-1] < cutoff]
+    for partition in dropped:
+        cur.execute(f"ALTER TABLE warehouse.fact_sales DETACH PARTITION warehouse.{partition}")
+        cur.execute(f"DROP TABLE warehouse.{partition}")
+    conn.commit()
+
+    if dropped:
+        logging.info(f"Dropped fact_sales partitions before {cutoff}: {', '.join(dropped)}")
+    return dropped
+
+# -------------------------------
+# HELPER: FACT INDEXES
+# -------------------------------
+
+# Secondary indexes of fact_sales, mostly serving
+# sql/queries/analytical_queries.sql. They are dropped before a full refresh
+# and rebuilt after it; on partitioned fact_sales each one is created on
+# every partition.
+FACT_SALES_INDEXES = {
+    # Incremental loads: affected-transaction lookups and deletes
+    "idx_fact_sales_transaction_id": "(transaction_id)",
+    # Q1, Q4, Q8: product joins answered by index-only scans
+    "idx_fact_sales_product_covering":
+        "(product_key) INCLUDE (quantity, unit_price, line_total, profit)",
+    # Q3, Q7: per-customer spend and transaction counts
+    "idx_fact_sales_customer_covering":
+        "(customer_key) INCLUDE (transaction_id, line_total)",
+    # Q5: payment method distribution
+    "idx_fact_sales_payment_method_covering":
+        "(payment_method_key) INCLUDE (transaction_id, line_total)",
+    # Q2, Q9, volume monitoring: rows are loaded in date order, so a tiny
+    # BRIN index narrows date ranges inside a month partition
+    "idx_fact_sales_date_key_brin": "USING BRIN (date_key)",
+    # Freshness monitoring and the incremental load watermark
+    "idx_fact_sales_created_at_brin": "USING BRIN (created_at)",
+}
+
+
+def drop_fact_indexes(conn):
+    """
+    Drops the secondary indexes and foreign keys of fact_sales ahead of a
+    bulk load, in the load's transaction, and returns the foreign key
+    definitions for build_fact_indexes. Per-row FK trigger checks dominate
+    bulk inserts; re-adding the keys validates them in one join instead.
+    """
+    cur = conn.cursor()
+    cur.execute("""
+        SELECT conname, pg_get_constraintdef(oid)
+        FROM pg_constraint
+        WHERE conrelid = 'warehouse.fact_sales'::regclass AND contype = 'f'
+    """)
+    foreign_keys = dict(cur.fetchall())
+
+    for name in foreign_keys:
+        cur.execute(f"ALTER TABLE warehouse.fact_sales DROP CONSTRAINT {name}")
+    for name in FACT_SALES_INDEXES:
+        cur.execute(f"DROP INDEX IF EXISTS warehouse.{name}")
+
+    logging.info(
+        f"Dropped {len(FACT_SALES_INDEXES)} indexes and {len(foreign_keys)} "
+        "foreign keys of fact_sales before bulk load"
+    )
+    return foreign_keys
+
+
+def build_fact_indexes(conn, foreign_keys=None, partitions=None):
+    """
+    Re-adds dropped foreign keys and creates any missing index. After a bulk
+    load (partitions None) fact_sales is VACUUM ANALYZEd so the planner has
+    fresh statistics and index-only scans see an up to date visibility map;
+    after an incremental load only the given partitions are ANALYZEd and
+    vacuuming the few changed pages is left to autovacuum.
+    """
+    start = time.perf_counter()
+    cur = conn.cursor()
+
+    for name, definition in (foreign_keys or {}).items():
+        cur.execute(f"ALTER TABLE warehouse.fact_sales ADD CONSTRAINT {name} {definition}")
+    cur.execute("""
+        SELECT indexname FROM pg_indexes
+        WHERE schemaname = 'warehouse' AND tablename = 'fact_sales'
+    """)
+    existing = {row[0] for row in cur.fetchall()}
+
+    created = []
+    for name, definition in FACT_SALES_INDEXES.items():
+        if name not in existing:
+            cur.execute(f"CREATE INDEX {name} ON warehouse.fact_sales {definition}")
+            created.append(name)
+
+    if partitions is not None:
+        for partition in partitions:
+            cur.execute(f"ANALYZE warehouse.{partition}")
+        conn.commit()
+    else:
+        conn.commit()
+        conn.autocommit = True
+        try:
+            cur.execute("VACUUM (ANALYZE) warehouse.fact_sales")
+        finally:
+            conn.autocommit = False
+
+    seconds = round(time.perf_counter() - start, 3)
+    if created:
+        logging.info(f"Built fact_sales indexes {', '.join(created)} in {seconds}s")
+    return {"rows": len(created), "created": created, "seconds": seconds}
+
+# -------------------------------
+# HELPER: QUERY PLAN REPORT
+# -------------------------------
+
+def _plan_nodes(plan):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+def explain_analytical_queries(conn, queries_path="sql/queries/analytical_queries.sql",
+                               report_path="data/processed/query_plans.json"):
+    """
+    Runs EXPLAIN (ANALYZE, BUFFERS) for every analytical query and writes
+    timings, buffer counts and the scans used, plus the full plans, to a
+    JSON report so plan regressions show up between runs. Several queries
+    read the agg_* tables, so build_aggregates.py calls this after its refresh.
+    """
+    cur = conn.cursor()
+    report = {}
+    for query in load_registry(queries_path):
+        cur.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query.sql}")
+        explained = cur.fetchone()[0][0]
+        conn.rollback()
+
+        plan = explained["Plan"]
+        nodes = list(_plan_nodes(plan))
+        report[query.key] = {
+            "name": query.name,
+            "title": query.title,
+            "execution_ms": explained["Execution Time"],
+            "planning_ms": explained["Planning Time"],
+            "shared_hit_blocks": plan.get("Shared Hit Blocks"),
+            "shared_read_blocks": plan.get("Shared Read Blocks"),
+            "scans": sorted({
+                f"{node['Node Type']} on {node.get('Index Name') or node['Relation Name']}"
+                for node in nodes if "Relation Name" in node or "Index Name" in node
+            }),
+            "plan": plan
+        }
+        logging.info(
+            f"{query.key}: {report[query.key]['execution_ms']:.2f} ms, "
+            f"{report[query.key]['shared_hit_blocks']} buffers hit, "
+            f"{report[query.key]['shared_read_blocks']} read"
+        )
+
+    os.makedirs(os.path.dirname(report_path), exist_ok=True)
+    with open(report_path, "w") as f:
+        json.dump(report, f, indent=2)
+    return report
+
+# -------------------------------
+# HELPER: INCREMENTAL FACT LOAD
+# -------------------------------
+
+FACT_SALES_SELECT = """
+    SELECT
+        d.date_key,
+        dc.customer_key,
+        dp.product_key,
+        pm.payment_method_key,
+        t.transaction_id,
+        ti.quantity,
+        ti.unit_price,
+        (ti.unit_price * ti.quantity - ti.line_total) AS discount_amount,
+        ti.line_total,
+        ti.line_total - (ti.quantity * p.cost) AS profit
+    FROM production.transaction_items ti
+    JOIN production.transactions t ON ti.transaction_id = t.transaction_id
+    JOIN production.products p ON ti.product_id = p.product_id
+    JOIN warehouse.dim_customers dc ON dc.customer_id = t.customer_id AND dc.is_current = TRUE
+    JOIN warehouse.dim_products dp ON dp.product_id = p.product_id AND dp.is_current = TRUE
+    JOIN warehouse.dim_payment_method pm ON pm.payment_method_name = t.payment_method
+    JOIN warehouse.dim_date d ON d.full_date = t.transaction_date
+"""
+
+FACT_SALES_COLUMNS = """
+    date_key,
+    customer_key,
+    product_key,
+    payment_method_key,
+    transaction_id,
+    quantity,
+    unit_price,
+    discount_amount,
+    line_total,
+    profit
+"""
+
+def load_fact_sales(conn, full_refresh=False, unlogged=False, retain_from=None):
+    """
+    Loads warehouse.fact_sales. A full refresh rebuilds the table, optionally
+    with UNLOGGED partitions while it is filled; otherwise only affected
+    transactions are (re)loaded: those whose transaction or items were
+    written to production since the last fact load. Rows are routed
+    to their month's partition, created beforehand if missing; transactions
+    before retain_from are not loaded.
+    """
+    start = time.perf_counter()
+    cur = conn.cursor()
+    ensure_fact_partitions(cur, retain_from)
+
+    if full_refresh:
+        cur.execute("TRUNCATE TABLE warehouse.fact_sales, warehouse.fact_sales_retracted")
+        # Aggregates no longer match; the next refresh rebuilds them
+        cur.execute("DELETE FROM warehouse.aggregate_state WHERE source_table = 'warehouse.fact_sales'")
+        # Empty partitions, so switching is free; SET LOGGED then writes each
+        # rebuilt partition to WAL once instead of row by row
+        partitions = fact_partitions(cur) if unlogged else []
+        for partition in partitions:
+            cur.execute(f"ALTER TABLE warehouse.{partition} SET UNLOGGED")
+        cur.execute(f"""
+            INSERT INTO warehouse.fact_sales ({FACT_SALES_COLUMNS})
+            {FACT_SALES_SELECT}
+            WHERE %(retain_from)s::DATE IS NULL OR t.transaction_date >= %(retain_from)s
+            ORDER BY d.date_key
+        """, {"retain_from": retain_from})
+        inserted = cur.rowcount
+        for partition in partitions:
+            cur.execute(f"ALTER TABLE warehouse.{partition} SET LOGGED")
+        conn.commit()
+        seconds = round(time.perf_counter() - start, 3)
+        logging.info(
+            f"Loaded {inserted} records into warehouse.fact_sales "
+            f"(full refresh{', unlogged' if unlogged else ''}) in {seconds}s"
+        )
+        return {"mode": "full_refresh", "inserted": inserted, "deleted": 0,
+                "transactions": None, "partitions": None, "seconds": seconds}
+
+    cur.execute("SELECT MAX(created_at) FROM warehouse.fact_sales")
+    watermark = cur.fetchone()[0]
+
+    # Transactions written to production since the last fact load: new ones
+    # and late-arriving changes to loaded ones, found through the updated_at
+    # indexes. Production only inserts and upserts (updated_at is stamped on
+    # both), so reconciling deleted production rows is left to a full refresh.
+    cur.execute("""
+        CREATE TEMP TABLE affected_transactions ON COMMIT DROP AS
+        SELECT t.transaction_id
+        FROM production.transactions t
+        WHERE (%(retain_from)s::DATE IS NULL OR t.transaction_date >= %(retain_from)s)
+          AND t.transaction_id IN (
+            SELECT transaction_id FROM production.transactions
+            WHERE updated_at > %(watermark)s
+            UNION
+            SELECT transaction_id FROM production.transaction_items
+            WHERE updated_at > %(watermark)s
+          )
+    """, {"watermark": watermark, "retain_from": retain_from})
+    cur.execute("ALTER TABLE affected_transactions ADD PRIMARY KEY (transaction_id)")
+    cur.execute("ANALYZE affected_transactions")
+
+    # Facts of changed transactions are deleted and re-inserted from current
+    # production rows. Deleted facts the aggregates already include are kept
+    # as retractions. Both report the month partitions they touched.
+    cur.execute("""
+        WITH deleted AS (
+            DELETE FROM warehouse.fact_sales f
+            WHERE f.transaction_id IN (SELECT transaction_id FROM affected_transactions)
+            RETURNING f.*
+        ), retracted AS (
+            INSERT INTO warehouse.fact_sales_retracted
+            SELECT d.* FROM deleted d
+            WHERE d.sales_key <= (
+                SELECT COALESCE(MAX(last_sales_key), 0) FROM warehouse.aggregate_state
+                WHERE source_table = 'warehouse.fact_sales'
+            )
+        )
+        SELECT COUNT(*), ARRAY(SELECT DISTINCT 'fact_sales_' || date_key / 100 FROM deleted)
+        FROM deleted
+    """)
+    deleted, partitions = cur.fetchone()
+
+    cur.execute(f"""
+        WITH inserted AS (
+            INSERT INTO warehouse.fact_sales ({FACT_SALES_COLUMNS})
+            {FACT_SALES_SELECT}
+            JOIN affected_transactions a ON a.transaction_id = t.transaction_id
+            RETURNING date_key
+        )
+        SELECT COUNT(*), ARRAY(SELECT DISTINCT 'fact_sales_' || date_key / 100 FROM inserted)
+        FROM inserted
+    """)
+    inserted, inserted_partitions = cur.fetchone()
+    partitions = sorted(set(partitions) | set(inserted_partitions))
+
+    cur.execute("SELECT COUNT(*) FROM affected_transactions")
+    transactions = cur.fetchone()[0]
     conn.commit()
+    seconds = round(time.perf_counter() - start, 3)
 
-    logging.info(f"Loaded {len(rows)} records into {table_name}")
+    logging.info(
+        f"Incremental load of warehouse.fact_sales: {transactions} transactions, "
+        f"{deleted} facts replaced, {inserted} facts inserted in {seconds}s"
+    )
+    return {"mode": "incremental", "inserted": inserted, "deleted": deleted,
+            "transactions": transactions, "partitions": partitions, "seconds": seconds}
+
+# -------------------------------
+# SCD TYPE 2 DIMENSIONS
+# -------------------------------
+
+CUSTOMER_DIMENSION = {
+    "source_sql": """
+        SELECT
+            customer_id,
+            first_name,
+            last_name,
+            email,
+            city,
+            state,
+            country,
+            age_group,
+            'Standard' AS customer_segment,
+            registration_date
+        FROM production.customers
+    """,
+    "table_name": "warehouse.dim_customers",
+    "business_key": "customer_id",
+    "tracked_columns": [
+        "first_name",
+        "last_name",
+        "email",
+        "city",
+        "state",
+        "country",
+        "age_group",
+        "customer_segment",
+        "registration_date"
+    ]
+}
+
+PRODUCT_DIMENSION = {
+    "source_sql": """
+        SELECT
+            product_id,
+            product_name,
+            category,
+            sub_category,
+            brand,
+            CASE
+                WHEN price < 500 THEN 'Low'
+                WHEN price < 2000 THEN 'Medium'
+                ELSE 'High'
+            END AS price_category,
+            CASE
+                WHEN price < 500 THEN '0-500'
+                WHEN price < 2000 THEN '500-2000'
+                ELSE '2000+'
+            END AS price_range
+        FROM production.products
+    """,
+    "table_name": "warehouse.dim_products",
+    "business_key": "product_id",
+    "tracked_columns": [
+        "product_name",
+        "category",
+        "sub_category",
+        "brand",
+        "price_category",
+        "price_range"
+    ]
+}
 
 # -------------------------------
 # MAIN WAREHOUSE LOAD
 # -------------------------------
 
-def run_load_warehouse():
-    logging.info("Starting Warehouse Load")
+def run_load_warehouse(full_refresh=False, unlogged=False):
+    logging.info(f"Starting Warehouse Load ({'full refresh' if full_refresh else 'incremental'})")
+    start_time = datetime.now()
+    config = load_config()
     conn = get_connection()
+    apply_schema(conn)
+    steps = {}
 
     # -------------------------------------------------
     # DIM_CUSTOMERS (SCD TYPE 2)
     # -------------------------------------------------
-    load_table(
-        select_sql="""
-            SELECT
-                customer_id,
-                first_name,
-                last_name,
-                email,
-                city,
-                state,
-                country,
-                age_group,
-                'Standard' AS customer_segment,
-                registration_date,
-                CURRENT_DATE AS effective_date,
-                NULL AS end_date,
-                TRUE AS is_current
-            FROM production.customers
-        """,
-        insert_sql="""
-            INSERT INTO warehouse.dim_customers (
-                customer_id,
-                first_name,
-                last_name,
-                email,
-                city,
-                state,
-                country,
-                age_group,
-                customer_segment,
-                registration_date,
-                effective_date,
-                end_date,
-                is_current
-            ) VALUES %s
-        """,
-        truncate=True,
-        conn=conn,
-        table_name="warehouse.dim_customers"
-    )
+    steps["warehouse.dim_customers"] = merge_scd2(**CUSTOMER_DIMENSION, conn=conn)
 
     # -------------------------------------------------
     # DIM_PRODUCTS (SCD TYPE 2)
     # -------------------------------------------------
-    load_table(
-        select_sql="""
-            SELECT
-                product_id,
-                product_name,
-                category,
-                sub_category,
-                brand,
-                CASE
-                    WHEN price < 500 THEN 'Low'
-                    WHEN price < 2000 THEN 'Medium'
-                    ELSE 'High'
-                END AS price_category,
-                CASE
-                    WHEN price < 500 THEN '0-500'
-                    WHEN price < 2000 THEN '500-2000'
-                    ELSE '2000+'
-                END AS price_range,
-                CURRENT_DATE,
-                NULL,
-                TRUE
-            FROM production.products
-        """,
-        insert_sql="""
-            INSERT INTO warehouse.dim_products (
-                product_id,
-                product_name,
-                category,
-                sub_category,
-                brand,
-                price_category,
-                price_range,
-                effective_date,
-                end_date,
-                is_current
-            ) VALUES %s
-        """,
-        truncate=True,
-        conn=conn,
-        table_name="warehouse.dim_products"
-    )
+    steps["warehouse.dim_products"] = merge_scd2(**PRODUCT_DIMENSION, conn=conn)
 
     # -------------------------------------------------
     # DIM_DATE
     # -------------------------------------------------
-    load_table(
-        select_sql="""
-            SELECT DISTINCT
-                TO_CHAR(transaction_date, 'YYYYMMDD')::INT AS date_key,
-                transaction_date,
-                EXTRACT(YEAR FROM transaction_date),
-                EXTRACT(QUARTER FROM transaction_date),
-                EXTRACT(MONTH FROM transaction_date),
-                EXTRACT(DAY FROM transaction_date),
-                TO_CHAR(transaction_date, 'Month'),
-                TO_CHAR(transaction_date, 'Day'),
-                EXTRACT(WEEK FROM transaction_date),
-                CASE WHEN EXTRACT(ISODOW FROM transaction_date) IN (6,7) THEN TRUE ELSE FALSE END
-            FROM production.transactions
-        """,
-        insert_sql="""
-            INSERT INTO warehouse.dim_date (
-                date_key,
-                full_date,
-                year,
-                quarter,
-                month,
-                day,
-                month_name,
-                day_name,
-                week_of_year,
-                is_weekend
-            ) VALUES %s
-        """,
-        truncate=True,
-        conn=conn,
-        table_name="warehouse.dim_date"
+    steps["warehouse.dim_date"] = ensure_calendar(
+        conn, config["calendar_start"], config["calendar_end"]
     )
 
     # -------------------------------------------------
     # DIM_PAYMENT_METHOD
     # -------------------------------------------------
-    load_table(
+    steps["warehouse.dim_payment_method"] = load_table(
         select_sql="""
             SELECT DISTINCT
                 payment_method,
@@ -194,61 +730,76 @@ def run_load_warehouse():
             INSERT INTO warehouse.dim_payment_method (
                 payment_method_name,
                 payment_type
-            ) VALUES %s
+            )
         """,
-        truncate=True,
+        truncate=False,
         conn=conn,
-        table_name="warehouse.dim_payment_method"
+        table_name="warehouse.dim_payment_method",
+        on_conflict="ON CONFLICT (payment_method_name) DO NOTHING"
     )
 
     # -------------------------------------------------
     # FACT_SALES
     # -------------------------------------------------
-    load_table(
-        select_sql="""
-            SELECT
-                d.date_key,
-                dc.customer_key,
-                dp.product_key,
-                pm.payment_method_key,
-                t.transaction_id,
-                ti.quantity,
-                ti.unit_price,
-                (ti.unit_price * ti.quantity - ti.line_total) AS discount_amount,
-                ti.line_total,
-                ti.line_total - (ti.quantity * p.cost) AS profit
-            FROM production.transaction_items ti
-            JOIN production.transactions t ON ti.transaction_id = t.transaction_id
-            JOIN production.products p ON ti.product_id = p.product_id
-            JOIN warehouse.dim_customers dc ON dc.customer_id = t.customer_id AND dc.is_current = TRUE
-            JOIN warehouse.dim_products dp ON dp.product_id = p.product_id AND dp.is_current = TRUE
-            JOIN warehouse.dim_payment_method pm ON pm.payment_method_name = t.payment_method
-            JOIN warehouse.dim_date d ON d.full_date = t.transaction_date
-        """,
-        insert_sql="""
-            INSERT INTO warehouse.fact_sales (
-                date_key,
-                customer_key,
-                product_key,
-                payment_method_key,
-                transaction_id,
-                quantity,
-                unit_price,
-                discount_amount,
-                line_total,
-                profit
-            ) VALUES %s
-        """,
-        truncate=True,
-        conn=conn,
-        table_name="warehouse.fact_sales"
+    retain_from = retention_start(conn.cursor(), config["fact_retention_months"])
+
+    cur = conn.cursor()
+    cur.execute("SELECT NOT EXISTS (SELECT 1 FROM warehouse.fact_sales)")
+    if cur.fetchone()[0] and not full_refresh:
+        # Nothing to merge into: take the bulk path (no per-row FK checks)
+        logging.info("warehouse.fact_sales is empty, loading it as a full refresh")
+        full_refresh = True
+    dropped = drop_expired_fact_partitions(conn, retain_from) if retain_from else []
+    foreign_keys = drop_fact_indexes(conn) if full_refresh else None
+    steps["warehouse.fact_sales"] = load_fact_sales(
+        conn, full_refresh=full_refresh, unlogged=unlogged, retain_from=retain_from
+    )
+    steps["warehouse.fact_sales indexes"] = build_fact_indexes(
+        conn, foreign_keys, steps["warehouse.fact_sales"]["partitions"]
     )
 
+    run_id = record_load_run(conn.cursor(), {
+        "warehouse.dim_customers": steps["warehouse.dim_customers"]["new"]
+            + steps["warehouse.dim_customers"]["changed"],
+        "warehouse.dim_products": steps["warehouse.dim_products"]["new"]
+            + steps["warehouse.dim_products"]["changed"],
+        "warehouse.dim_date": steps["warehouse.dim_date"]["rows"],
+        "warehouse.dim_payment_method": steps["warehouse.dim_payment_method"]["rows"],
+        "warehouse.fact_sales": steps["warehouse.fact_sales"]["inserted"]
+            + steps["warehouse.fact_sales"]["deleted"] + len(dropped)
+            + (1 if full_refresh else 0),
+    })
+    conn.commit()
     conn.close()
+
+    summary = {
+        "load_timestamp": start_time.isoformat(),
+        "run_id": run_id,
+        "mode": "full_refresh" if full_refresh else "incremental",
+        "unlogged": unlogged,
+        "steps": steps,
+        "total_execution_time_seconds": round((datetime.now() - start_time).total_seconds(), 2)
+    }
+    os.makedirs("data/processed", exist_ok=True)
+    with open("data/processed/warehouse_load_summary.json", "w") as f:
+        json.dump(summary, f, indent=2)
+
+    logging.info(
+        "Load timings (s): "
+        + ", ".join(f"{table}={result['seconds']}" for table, result in steps.items())
+    )
     logging.info("Warehouse Load Completed Successfully")
 
 # -------------------------------
 # ENTRY POINT
 # -------------------------------
 if __name__ == "__main__":
-    run_load_warehouse()
+    parser = argparse.ArgumentParser(description="Load the warehouse star schema")
+    parser.add_argument("--full-refresh", action="store_true",
+                        help="Rebuild fact_sales from all of production instead of loading incrementally")
+    parser.add_argument("--unlogged", action="store_true",
+                        help="With --full-refresh, fill fact_sales partitions as UNLOGGED tables")
+    args = parser.parse_args()
+    if args.unlogged and not args.full_refresh:
+        parser.error("--unlogged requires --full-refresh")
+    run_load_warehouse(full_refresh=args.full_refresh, unlogged=args.unlogged)
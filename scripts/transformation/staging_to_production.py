@@ -1,11 +1,18 @@
 import os
-import re
 import json
 import logging
+import queue
+import resource
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import psycopg2
+import yaml
 from psycopg2.extras import execute_values
 
 # -------------------------------
@@ -17,47 +24,138 @@ logging.basicConfig(
 )
 
 # -------------------------------
-# DATA CLEANSING FUNCTIONS
+# CONFIG
 # -------------------------------
 
-def cleanse_customer_data(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
+def load_config() -> dict:
+    config_path = Path("config/config.yaml")
+    config = {}
+
+    if config_path.exists():
+        with open(config_path, "r") as f:
+            config = yaml.safe_load(f) or {}
+
+    return {
+        "engine": "pandas",
+        "string_dtype": "object",
+        "streaming": False,
+        "prefetch_batches": 2,
+        "batch_size": config.get("pipeline", {}).get("batch_size", 1000),
+        **config.get("transformation", {}),
+    }
 
-    for col in df.select_dtypes(include=["object", "string"]).columns:
-        df[col] = df[col].apply(lambda x: x.strip() if isinstance(x, str) else x)
 
-    df["email"] = df["email"].apply(lambda x: x.lower() if isinstance(x, str) else x)
-    df["phone"] = df["phone"].apply(
-        lambda x: re.sub(r"\D", "", x) if isinstance(x, str) else x
+def get_connection():
+    return psycopg2.connect(
+        host=os.getenv("DB_HOST", "localhost"),
+        port=os.getenv("DB_PORT", "5432"),
+        dbname=os.getenv("DB_NAME", "ecommerce_db"),
+        user=os.getenv("DB_USER", "postgres"),
+        password=os.getenv("DB_PASSWORD", "postgres"),
     )
 
-    df["first_name"] = df["first_name"].apply(lambda x: x.title() if isinstance(x, str) else x)
-    df["last_name"] = df["last_name"].apply(lambda x: x.title() if isinstance(x, str) else x)
 
+# -------------------------------
+# DATA CLEANSING FUNCTIONS
+# -------------------------------
+
+def _has_nul(series: pd.Series) -> bool:
+    # pandas' object string hashtable stops at NUL, so factorize would merge
+    # "a\x00b" with "a"; Arrow-backed strings are unaffected
+    if series.dtype != object:
+        return False
+    values = series.to_numpy()
+    return "\x00" in "".join(values[series.notna().to_numpy()])
+
+
+def _map_strings(series: pd.Series, transform) -> pd.Series:
+    """
+    Applies a vectorized `.str` transform to the string values of a
+    column and leaves every other value (None, NaN, dates) untouched.
+    """
+    inferred = pd.api.types.infer_dtype(series, skipna=True)
+    if inferred not in ("string", "mixed", "mixed-integer"):
+        return series
+
+    if inferred != "string":
+        is_str = np.fromiter((isinstance(x, str) for x in series), dtype=bool, count=len(series))
+        series = series.copy()
+        series[is_str] = _map_strings(series[is_str], transform)
+        return series
+
+    # Low-cardinality columns (names, cities, ...) transform each distinct value once
+    sample = series.iloc[:1000]
+    if sample.nunique() * 2 > len(sample) or _has_nul(series):
+        return transform(series.str)
+
+    codes, uniques = pd.factorize(series)
+    transformed = transform(pd.Series(uniques).str).take(codes).set_axis(series.index)
+
+    missing = codes == -1
+    return transformed.where(~missing, series) if missing.any() else transformed
+
+
+def _string_columns(df: pd.DataFrame, include, string_dtype: str) -> list:
+    columns = list(df.select_dtypes(include=include).columns)
+
+    # Arrow strings run the kernels natively; they match Python's str
+    # methods for ASCII text, which is what the generator produces
+    if string_dtype == "pyarrow":
+        for col in columns:
+            if pd.api.types.infer_dtype(df[col], skipna=True) == "string":
+                df[col] = df[col].astype("string[pyarrow]")
+
+    return columns
+
+
+def _restore_object_strings(df: pd.DataFrame, string_dtype: str) -> pd.DataFrame:
+    # Hand plain Python strings (and None) on to psycopg2
+    if string_dtype != "pyarrow":
+        return df
+
+    for col in df.select_dtypes(include="string").columns:
+        df[col] = df[col].astype(object).where(df[col].notna(), None)
     return df
 
 
-def cleanse_product_data(df: pd.DataFrame) -> pd.DataFrame:
+def cleanse_customer_data(df: pd.DataFrame, string_dtype: str = "object") -> pd.DataFrame:
+    df = df.copy()
+
+    for col in _string_columns(df, ["object", "string"], string_dtype):
+        df[col] = _map_strings(df[col], lambda s: s.strip())
+
+    df["email"] = _map_strings(df["email"], lambda s: s.lower())
+    df["phone"] = _map_strings(df["phone"], lambda s: s.replace(r"\D", "", regex=True))
+
+    df["first_name"] = _map_strings(df["first_name"], lambda s: s.title())
+    df["last_name"] = _map_strings(df["last_name"], lambda s: s.title())
+
+    return _restore_object_strings(df, string_dtype)
+
+
+def cleanse_product_data(df: pd.DataFrame, string_dtype: str = "object") -> pd.DataFrame:
     df = df.copy()
 
-    for col in df.select_dtypes(include="object").columns:
-        df[col] = df[col].str.strip()
+    for col in _string_columns(df, "object", string_dtype):
+        if pd.api.types.infer_dtype(df[col], skipna=True) == "string":
+            df[col] = _map_strings(df[col], lambda s: s.strip())
+        else:
+            # .str turns non-string values into NaN; kept for compatibility
+            df[col] = df[col].str.strip()
 
     df["price"] = df["price"].round(2)
     df["cost"] = df["cost"].round(2)
 
     df["profit_margin"] = ((df["price"] - df["cost"]) / df["price"] * 100).round(2)
 
-    def price_category(price):
-        if price < 50:
-            return "Budget"
-        elif price < 200:
-            return "Mid-range"
-        return "Premium"
+    # NaN prices fall through both conditions to "Premium", as before
+    df["price_category"] = np.select(
+        [df["price"] < 50, df["price"] < 200],
+        ["Budget", "Mid-range"],
+        default="Premium"
+    ).astype(object)
 
-    df["price_category"] = df["price"].apply(price_category)
-
-    return df
+    return _restore_object_strings(df, string_dtype)
 
 
 def cleanse_transaction_data(df: pd.DataFrame) -> pd.DataFrame:
@@ -84,6 +182,34 @@ def cleanse_transaction_items(df: pd.DataFrame) -> pd.DataFrame:
 # LOAD TO PRODUCTION
 # -------------------------------
 
+# Production tables are upserted on their key instead of truncated or
+# appended to: TRUNCATE ... CASCADE re-stamps every row, and insert-only
+# loads drop corrections to existing rows, so either way the warehouse could
+# not tell which rows really changed
+UPSERT_KEYS = {
+    "production.customers": "customer_id",
+    "production.products": "product_id",
+    "production.transactions": "transaction_id",
+    "production.transaction_items": "item_id",
+}
+
+
+def _upsert(key: str, columns: list) -> str:
+    """
+    ON CONFLICT clause for `INSERT INTO <table> AS target`: existing rows are
+    only updated, and their updated_at re-stamped, when a value changed.
+    Rows missing from staging are kept, as other rows reference them.
+    """
+    changed = [c for c in columns if c != key]
+    return f"""
+        ON CONFLICT ({key}) DO UPDATE SET
+            {", ".join(f"{c} = EXCLUDED.{c}" for c in changed)},
+            updated_at = CURRENT_TIMESTAMP
+        WHERE ({", ".join(f"target.{c}" for c in changed)})
+            IS DISTINCT FROM ({", ".join(f"EXCLUDED.{c}" for c in changed)})
+    """
+
+
 def load_to_production(df: pd.DataFrame, table_name: str, conn, strategy: str) -> dict:
     if df.empty:
         return {"inserted": 0, "status": "skipped"}
@@ -92,6 +218,29 @@ def load_to_production(df: pd.DataFrame, table_name: str, conn, strategy: str) -
     cols = list(df.columns)
     values = [tuple(row) for row in df.to_numpy()]
 
+    if strategy in ("incremental", "upsert"):
+        # Existing keys are skipped (or, for upserts, compared) on the server,
+        # so the cost follows the batch size rather than the production history
+        incoming = f"incoming_{table_name.split('.')[-1]}"
+        cur.execute(
+            f"CREATE TEMP TABLE {incoming} (LIKE {table_name} INCLUDING DEFAULTS) ON COMMIT DROP"
+        )
+        execute_values(cur, f"INSERT INTO {incoming} ({','.join(cols)}) VALUES %s", values)
+        on_conflict = (
+            _upsert(UPSERT_KEYS[table_name], cols) if strategy == "upsert"
+            else "ON CONFLICT DO NOTHING"
+        )
+        cur.execute(f"""
+            INSERT INTO {table_name} AS target ({','.join(cols)})
+            SELECT {','.join(cols)} FROM {incoming}
+            {on_conflict}
+        """)
+        # For upserts, "skipped" rows are existing ones without changes
+        inserted = cur.rowcount
+        conn.commit()
+
+        return {"inserted": inserted, "skipped_existing": len(df) - inserted, "status": "success"}
+
     if strategy == "truncate":
         cur.execute(f"TRUNCATE TABLE {table_name} CASCADE")
 
@@ -106,23 +255,367 @@ def load_to_production(df: pd.DataFrame, table_name: str, conn, strategy: str) -
     return {"inserted": len(df), "status": "success"}
 
 
+# -------------------------------
+# PANDAS ENGINE (client-side cleansing)
+# -------------------------------
+
+def _read_staging(table_name: str, conn) -> pd.DataFrame:
+    df = pd.read_sql(f"SELECT * FROM {table_name}", conn)
+    return df.drop(columns=["loaded_at"], errors="ignore")
+
+
+class PeakRssSampler:
+    """
+    Samples the process RSS on a background thread while active;
+    peak_mb is the high-water mark seen in that window.
+    """
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.peak_bytes = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @staticmethod
+    def current_rss_bytes() -> int:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize()
+
+    def _run(self):
+        while True:
+            self.peak_bytes = max(self.peak_bytes, self.current_rss_bytes())
+            if self._stop.wait(self.interval):
+                return
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    @property
+    def peak_mb(self) -> float:
+        return round(self.peak_bytes / 1024 / 1024, 1)
+
+
+# -------------------------------
+# STREAMING (server-side cursor, bounded queues)
+# -------------------------------
+
+_END = object()
+
+
+def _put(q: queue.Queue, item, stop: threading.Event) -> bool:
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def _get(q: queue.Queue, stop: threading.Event):
+    while not stop.is_set():
+        try:
+            return q.get(timeout=0.1)
+        except queue.Empty:
+            pass
+    return _END
+
+
+def read_staging_chunks(table_name: str, conn, batch_size: int):
+    """
+    Yields `batch_size`-row DataFrames from a named (server-side) cursor,
+    so only one chunk of the table is ever held on the client.
+    """
+    with conn.cursor(name=f"read_{table_name.split('.')[-1]}") as cur:
+        cur.itersize = batch_size
+        cur.execute(f"SELECT * FROM {table_name}")
+
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                break
+
+            columns = [d[0] for d in cur.description]
+            df = pd.DataFrame.from_records(rows, columns=columns, coerce_float=True)
+            yield df.drop(columns=["loaded_at"], errors="ignore")
+
+
+def stream_to_production(source: str, target: str, cleanse, strategy: str, conn,
+                         batch_size: int, prefetch: int) -> dict:
+    """
+    Reads `source` in chunks on a reader thread, cleanses each chunk here
+    and writes it on a writer thread. Bounded queues between the stages
+    let all three overlap while holding at most `prefetch` chunks each.
+    """
+    read_queue, write_queue = queue.Queue(maxsize=prefetch), queue.Queue(maxsize=prefetch)
+    stop = threading.Event()
+    reader_conn = get_connection()
+
+    def read():
+        try:
+            for chunk in read_staging_chunks(source, reader_conn, batch_size):
+                if not _put(read_queue, chunk, stop):
+                    return
+            _put(read_queue, _END, stop)
+        except Exception:
+            stop.set()
+            raise
+
+    def write():
+        totals = {"inserted": 0, "skipped_existing": 0, "chunks": 0, "status": "success"}
+        chunk_strategy = strategy
+
+        try:
+            while (chunk := _get(write_queue, stop)) is not _END:
+                result = load_to_production(chunk, target, conn, chunk_strategy)
+                totals["inserted"] += result["inserted"]
+                totals["skipped_existing"] += result.get("skipped_existing", 0)
+                totals["chunks"] += 1
+
+                # Only the first non-empty chunk of a full reload truncates
+                if chunk_strategy == "truncate" and result["status"] != "skipped":
+                    chunk_strategy = "append"
+        except Exception:
+            stop.set()
+            raise
+
+        return totals
+
+    try:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            reading = executor.submit(read)
+            writing = executor.submit(write)
+
+            try:
+                while (chunk := _get(read_queue, stop)) is not _END:
+                    if not _put(write_queue, cleanse(chunk), stop):
+                        break
+                _put(write_queue, _END, stop)
+            except Exception:
+                stop.set()
+                raise
+
+            reading.result()
+            return writing.result()
+    finally:
+        reader_conn.close()
+
+
+def run_pandas_engine(conn, config: dict) -> tuple:
+    records, timings = {}, {}
+    string_dtype = config["string_dtype"]
+
+    steps = [
+        ("customers", lambda df: cleanse_customer_data(df, string_dtype), "upsert"),
+        ("products", lambda df: cleanse_product_data(df, string_dtype), "upsert"),
+        ("transactions", cleanse_transaction_data, "upsert"),
+        ("transaction_items", cleanse_transaction_items, "upsert"),
+    ]
+
+    for table, cleanse, strategy in steps:
+        source, target = f"staging.{table}", f"production.{table}"
+        started = time.perf_counter()
+
+        with PeakRssSampler() as rss:
+            if config["streaming"]:
+                result = stream_to_production(source, target, cleanse, strategy, conn,
+                                              config["batch_size"], config["prefetch_batches"])
+            else:
+                result = load_to_production(cleanse(_read_staging(source, conn)),
+                                            target, conn, strategy)
+
+        result["peak_rss_mb"] = rss.peak_mb
+        records[target] = result
+        timings[target] = time.perf_counter() - started
+
+    return records, timings
+
+
+# -------------------------------
+# SQL ENGINE (set-based, runs inside PostgreSQL)
+# -------------------------------
+
+def _trim(column: str) -> str:
+    # Python's str.strip() trims tabs and newlines as well as spaces
+    return f"BTRIM({column}, E' \\t\\n\\r\\f' || CHR(11))"
+
+
+def _title(expression: str) -> str:
+    """
+    Python's str.title() in SQL. INITCAP treats digits as part of a word
+    ("3rd" vs "3Rd"); here every run of letters starts a word, as it does in
+    Python. Non-ASCII letters only match when the database ctype is a UTF-8
+    locale: under C / SQL_ASCII PostgreSQL neither classifies nor cases them.
+    """
+    return f"""(
+                SELECT STRING_AGG(UPPER(LEFT(w.m[1], 1)) || LOWER(SUBSTR(w.m[1], 2)) || w.m[2], '' ORDER BY w.n)
+                FROM REGEXP_MATCHES({expression}, '([[:alpha:]]*)([^[:alpha:]]*)', 'g') WITH ORDINALITY AS w(m, n)
+            )"""
+
+
+CUSTOMER_COLUMNS = [
+    "customer_id", "first_name", "last_name", "email", "phone",
+    "registration_date", "city", "state", "country", "age_group",
+]
+PRODUCT_COLUMNS = [
+    "product_id", "product_name", "category", "sub_category", "price", "cost",
+    "profit_margin", "price_category", "brand", "stock_quantity", "supplier_id",
+]
+TRANSACTION_COLUMNS = [
+    "transaction_id", "customer_id", "transaction_date", "transaction_time",
+    "payment_method", "shipping_address", "total_amount",
+]
+ITEM_COLUMNS = [
+    "item_id", "transaction_id", "product_id", "quantity",
+    "unit_price", "discount_percentage", "line_total",
+]
+
+SQL_TRANSFORMS = [
+    ("production.customers", "upsert", f"""
+        INSERT INTO production.customers AS target ({", ".join(CUSTOMER_COLUMNS)})
+        SELECT
+            {_trim("customer_id")},
+            {_title(_trim("first_name"))},
+            {_title(_trim("last_name"))},
+            LOWER({_trim("email")}),
+            REGEXP_REPLACE(phone, '\\D', '', 'g'),
+            registration_date,
+            {_trim("city")},
+            {_trim("state")},
+            {_trim("country")},
+            {_trim("age_group")}
+        FROM staging.customers
+        {_upsert("customer_id", CUSTOMER_COLUMNS)}
+    """),
+    ("production.products", "upsert", f"""
+        INSERT INTO production.products AS target ({", ".join(PRODUCT_COLUMNS)})
+        SELECT
+            {_trim("p.product_id")},
+            {_trim("p.product_name")},
+            {_trim("p.category")},
+            {_trim("p.sub_category")},
+            r.price,
+            r.cost,
+            ROUND((r.price - r.cost) / NULLIF(r.price, 0) * 100, 2),
+            CASE
+                WHEN r.price < 50 THEN 'Budget'
+                WHEN r.price < 200 THEN 'Mid-range'
+                ELSE 'Premium'
+            END,
+            {_trim("p.brand")},
+            p.stock_quantity,
+            {_trim("p.supplier_id")}
+        FROM staging.products p
+        CROSS JOIN LATERAL (
+            SELECT ROUND(p.price, 2) AS price, ROUND(p.cost, 2) AS cost
+        ) r
+        {_upsert("product_id", PRODUCT_COLUMNS)}
+    """),
+    ("production.transactions", "upsert", f"""
+        INSERT INTO production.transactions AS target ({", ".join(TRANSACTION_COLUMNS)})
+        SELECT
+            t.transaction_id, t.customer_id, t.transaction_date, t.transaction_time,
+            t.payment_method, t.shipping_address, ROUND(t.total_amount, 2)
+        FROM staging.transactions t
+        WHERE ROUND(t.total_amount, 2) > 0
+        {_upsert("transaction_id", TRANSACTION_COLUMNS)}
+    """),
+    ("production.transaction_items", "upsert", f"""
+        INSERT INTO production.transaction_items AS target ({", ".join(ITEM_COLUMNS)})
+        SELECT
+            i.item_id, i.transaction_id, i.product_id, i.quantity,
+            i.unit_price, i.discount_percentage,
+            -- Same float64 arithmetic and half-to-even rounding as the pandas
+            -- engine (read_sql coerces DECIMAL to float), so ties agree
+            ROUND(
+                i.quantity::FLOAT8 * i.unit_price::FLOAT8
+                * (1 - i.discount_percentage::FLOAT8 / 100) * 100
+            ) / 100
+        FROM staging.transaction_items i
+        WHERE i.quantity > 0
+        {_upsert("item_id", ITEM_COLUMNS)}
+    """),
+]
+
+
+def run_sql_engine(conn) -> tuple:
+    """
+    Runs the same cleansing as the pandas engine as INSERT ... SELECT
+    statements, so rows never leave the server. All four tables load in
+    one transaction; rerunning over unchanged staging writes no rows.
+    """
+    records, timings = {}, {}
+
+    try:
+        with conn.cursor() as cur:
+            for table_name, _, insert_sql in SQL_TRANSFORMS:
+                started = time.perf_counter()
+                cur.execute(insert_sql)
+
+                records[table_name] = {
+                    "inserted": cur.rowcount,
+                    "status": "success" if cur.rowcount else "skipped"
+                }
+                timings[table_name] = time.perf_counter() - started
+
+        conn.commit()
+
+    except Exception:
+        conn.rollback()
+        raise
+
+    return records, timings
+
+
+def record_engine_timings(engine: str, records: dict, timings: dict, total_seconds: float,
+                          summary_path: str = "data/processed/transformation_summary.json") -> dict:
+    """
+    Merges this run's timings into those kept from earlier runs, so the
+    summary always holds the latest figures for both engines.
+    """
+    engine_timings = {}
+    if os.path.exists(summary_path):
+        with open(summary_path) as f:
+            engine_timings = json.load(f).get("engine_timings", {})
+
+    engine_timings[engine] = {
+        "measured_at": datetime.utcnow().isoformat(),
+        "total_seconds": round(total_seconds, 3),
+        "tables": {
+            table_name: {
+                "rows_affected": records[table_name]["inserted"],
+                "seconds": round(seconds, 3)
+            }
+            for table_name, seconds in timings.items()
+        }
+    }
+
+    if "pandas" in engine_timings and "sql" in engine_timings:
+        engine_timings["sql_speedup"] = round(
+            engine_timings["pandas"]["total_seconds"] / engine_timings["sql"]["total_seconds"], 2
+        )
+
+    return engine_timings
+
+
 # -------------------------------
 # MAIN ETL PROCESS
 # -------------------------------
 
 def run_staging_to_production_etl():
     logging.info("Starting Staging → Production ETL")
+    config = load_config()
 
-    conn = psycopg2.connect(
-        host=os.getenv("DB_HOST", "localhost"),
-        port=os.getenv("DB_PORT", "5432"),
-        dbname=os.getenv("DB_NAME", "ecommerce_db"),
-        user=os.getenv("DB_USER", "postgres"),
-        password=os.getenv("DB_PASSWORD", "postgres"),
-    )
+    conn = get_connection()
 
     summary = {
         "transformation_timestamp": datetime.utcnow().isoformat(),
+        "engine": config["engine"],
         "records_processed": {},
         "transformations_applied": [
             "text_normalization",
@@ -135,49 +628,17 @@ def run_staging_to_production_etl():
         ],
     }
 
-    customers = pd.read_sql("SELECT * FROM staging.customers", conn)
-    products = pd.read_sql("SELECT * FROM staging.products", conn)
-    transactions = pd.read_sql("SELECT * FROM staging.transactions", conn)
-    items = pd.read_sql("SELECT * FROM staging.transaction_items", conn)
-
-    for df in [customers, products, transactions, items]:
-        if "loaded_at" in df.columns:
-            df.drop(columns=["loaded_at"], inplace=True)
-
-    customers_clean = cleanse_customer_data(customers)
-    products_clean = cleanse_product_data(products)
-    transactions_clean = cleanse_transaction_data(transactions)
-    items_clean = cleanse_transaction_items(items)
-
-    summary["records_processed"]["production.customers"] = load_to_production(
-        customers_clean, "production.customers", conn, "truncate"
-    )
-
-    summary["records_processed"]["production.products"] = load_to_production(
-        products_clean, "production.products", conn, "truncate"
-    )
-
-    cur = conn.cursor()
-    cur.execute("SELECT transaction_id FROM production.transactions")
-    existing_txns = {r[0] for r in cur.fetchall()}
-
-    new_txns = transactions_clean[
-        ~transactions_clean["transaction_id"].isin(existing_txns)
-    ]
-
-    summary["records_processed"]["production.transactions"] = load_to_production(
-        new_txns, "production.transactions", conn, "incremental"
-    )
-
-    cur.execute("SELECT item_id FROM production.transaction_items")
-    existing_items = {r[0] for r in cur.fetchall()}
-
-    new_items = items_clean[
-        ~items_clean["item_id"].isin(existing_items)
-    ]
-
-    summary["records_processed"]["production.transaction_items"] = load_to_production(
-        new_items, "production.transaction_items", conn, "incremental"
+    started = time.perf_counter()
+    if config["engine"] == "sql":
+        records, timings = run_sql_engine(conn)
+    elif config["engine"] == "pandas":
+        records, timings = run_pandas_engine(conn, config)
+    else:
+        raise ValueError(f"Unknown transformation engine: {config['engine']}")
+
+    summary["records_processed"] = records
+    summary["engine_timings"] = record_engine_timings(
+        config["engine"], records, timings, time.perf_counter() - started
     )
 
     os.makedirs("data/processed", exist_ok=True)
@@ -105,3 +105,11 @@ CREATE INDEX IF NOT EXISTS idx_items_transaction
 
 CREATE INDEX IF NOT EXISTS idx_items_product
     ON production.transaction_items(product_id);
+
+-- Change tracking: the warehouse's incremental fact load selects rows
+-- written since its last load by updated_at
+CREATE INDEX IF NOT EXISTS idx_transactions_updated_at
+    ON production.transactions(updated_at);
+
+CREATE INDEX IF NOT EXISTS idx_items_updated_at
+    ON production.transaction_items(updated_at);
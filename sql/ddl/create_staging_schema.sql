@@ -74,3 +74,17 @@ CREATE TABLE IF NOT EXISTS staging.transaction_items (
     line_total           DECIMAL(12,2),
     loaded_at            TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
+
+-- ---------------------------------------------------------
+-- 6. Staging: Ingestion State
+-- Per-source-file high-water marks for incremental ingestion
+-- ---------------------------------------------------------
+CREATE TABLE IF NOT EXISTS staging.ingestion_state (
+    source_path        VARCHAR(500) PRIMARY KEY,
+    table_name         VARCHAR(100) NOT NULL,
+    file_size          BIGINT NOT NULL,
+    file_mtime         DOUBLE PRECISION NOT NULL,
+    file_hash          VARCHAR(64),
+    rows_loaded        BIGINT,
+    ingested_at        TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
@@ -20,12 +20,16 @@ CREATE TABLE IF NOT EXISTS warehouse.dim_customers (
     registration_date DATE,
     effective_date DATE NOT NULL,
     end_date DATE,
-    is_current BOOLEAN NOT NULL
+    is_current BOOLEAN NOT NULL,
+    row_hash CHAR(32)
 );
 
-CREATE INDEX idx_dim_customers_customer_id
+CREATE INDEX IF NOT EXISTS idx_dim_customers_customer_id
 ON warehouse.dim_customers(customer_id);
 
+CREATE UNIQUE INDEX IF NOT EXISTS idx_dim_customers_current
+ON warehouse.dim_customers(customer_id) WHERE is_current;
+
 -- =====================================================
 -- DIMENSION: PRODUCTS (SCD TYPE 2)
 -- =====================================================
@@ -40,12 +44,16 @@ CREATE TABLE IF NOT EXISTS warehouse.dim_products (
     price_range VARCHAR(50),
     effective_date DATE NOT NULL,
     end_date DATE,
-    is_current BOOLEAN NOT NULL
+    is_current BOOLEAN NOT NULL,
+    row_hash CHAR(32)
 );
 
-CREATE INDEX idx_dim_products_product_id
+CREATE INDEX IF NOT EXISTS idx_dim_products_product_id
 ON warehouse.dim_products(product_id);
 
+CREATE UNIQUE INDEX IF NOT EXISTS idx_dim_products_current
+ON warehouse.dim_products(product_id) WHERE is_current;
+
 -- =====================================================
 -- DIMENSION: DATE
 -- =====================================================
@@ -74,8 +82,10 @@ CREATE TABLE IF NOT EXISTS warehouse.dim_payment_method (
 -- =====================================================
 -- FACT TABLE: SALES
 -- =====================================================
+-- Range partitioned by month of date_key (fact_sales_YYYYMM);
+-- partitions are created by load_warehouse.py as months appear
 CREATE TABLE IF NOT EXISTS warehouse.fact_sales (
-    sales_key BIGSERIAL PRIMARY KEY,
+    sales_key BIGSERIAL,
     date_key INTEGER NOT NULL,
     customer_key INTEGER NOT NULL,
     product_key INTEGER NOT NULL,
@@ -88,10 +98,24 @@ CREATE TABLE IF NOT EXISTS warehouse.fact_sales (
     profit DECIMAL(10,2),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
 
+    PRIMARY KEY (sales_key, date_key),
     FOREIGN KEY (date_key) REFERENCES warehouse.dim_date(date_key),
     FOREIGN KEY (customer_key) REFERENCES warehouse.dim_customers(customer_key),
     FOREIGN KEY (product_key) REFERENCES warehouse.dim_products(product_key),
     FOREIGN KEY (payment_method_key) REFERENCES warehouse.dim_payment_method(payment_method_key)
+) PARTITION BY RANGE (date_key);
+
+-- Secondary indexes (transaction_id, join key covering and BRIN indexes for
+-- the analytical queries) are managed by load_warehouse.py
+-- (FACT_SALES_INDEXES) and dropped/rebuilt around full refreshes
+
+-- =====================================================
+-- FACT SALES RETRACTIONS
+-- Already-aggregated facts deleted by an incremental load;
+-- subtracted from the aggregates on their next refresh
+-- =====================================================
+CREATE TABLE IF NOT EXISTS warehouse.fact_sales_retracted (
+    LIKE warehouse.fact_sales
 );
 
 -- =====================================================
@@ -113,7 +137,9 @@ CREATE TABLE IF NOT EXISTS warehouse.agg_product_performance (
     total_quantity_sold INTEGER,
     total_revenue DECIMAL(12,2),
     total_profit DECIMAL(12,2),
-    avg_discount_percentage DECIMAL(5,2)
+    avg_discount_percentage DECIMAL(5,2),
+    line_count BIGINT,
+    discount_percentage_sum DECIMAL(16,4)
 );
 
 -- =====================================================
@@ -126,3 +152,31 @@ CREATE TABLE IF NOT EXISTS warehouse.agg_customer_metrics (
     avg_order_value DECIMAL(12,2),
     last_purchase_date DATE
 );
+
+-- =====================================================
+-- LOAD RUNS
+-- One row per table a load run changed; the latest run_id
+-- of a table is its data version (result cache keys)
+-- =====================================================
+CREATE SEQUENCE IF NOT EXISTS warehouse.load_run_id_seq;
+
+CREATE TABLE IF NOT EXISTS warehouse.load_runs (
+    run_id BIGINT NOT NULL,
+    table_name VARCHAR(100) NOT NULL,
+    rows_changed BIGINT NOT NULL,
+    loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (run_id, table_name)
+);
+
+CREATE INDEX IF NOT EXISTS idx_load_runs_table_name
+ON warehouse.load_runs(table_name, run_id);
+
+-- =====================================================
+-- AGGREGATE REFRESH STATE
+-- Highest fact_sales.sales_key folded into the aggregates
+-- =====================================================
+CREATE TABLE IF NOT EXISTS warehouse.aggregate_state (
+    source_table VARCHAR(100) PRIMARY KEY,
+    last_sales_key BIGINT NOT NULL,
+    refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,75 @@
+-- =====================================================
+-- MIGRATE WAREHOUSE SCHEMA
+-- Brings a warehouse created by an earlier
+-- create_warehouse_schema.sql up to date. Idempotent:
+-- load_warehouse.py runs it, then the create script,
+-- before every load. A no-op on a fresh database.
+-- =====================================================
+
+-- =====================================================
+-- SCD TYPE 2 ROW HASHES
+-- Existing current rows get their hash on the next merge
+-- =====================================================
+ALTER TABLE IF EXISTS warehouse.dim_customers
+    ADD COLUMN IF NOT EXISTS row_hash CHAR(32);
+
+ALTER TABLE IF EXISTS warehouse.dim_products
+    ADD COLUMN IF NOT EXISTS row_hash CHAR(32);
+
+-- One current version per business key, so the partial unique
+-- indexes of the create script can be built; the newest wins
+DO $$
+BEGIN
+    IF to_regclass('warehouse.dim_customers') IS NOT NULL THEN
+        UPDATE warehouse.dim_customers d
+        SET is_current = FALSE, end_date = CURRENT_DATE
+        WHERE d.is_current
+          AND EXISTS (
+              SELECT 1 FROM warehouse.dim_customers n
+              WHERE n.customer_id = d.customer_id
+                AND n.is_current
+                AND n.customer_key > d.customer_key
+          );
+    END IF;
+
+    IF to_regclass('warehouse.dim_products') IS NOT NULL THEN
+        UPDATE warehouse.dim_products d
+        SET is_current = FALSE, end_date = CURRENT_DATE
+        WHERE d.is_current
+          AND EXISTS (
+              SELECT 1 FROM warehouse.dim_products n
+              WHERE n.product_id = d.product_id
+                AND n.is_current
+                AND n.product_key > d.product_key
+          );
+    END IF;
+END $$;
+
+-- =====================================================
+-- PARTITIONED FACT TABLE
+-- A plain (unpartitioned) fact_sales cannot gain partitions.
+-- Facts are derived data: drop it, let the create script build
+-- the partitioned table, and the next load (empty fact table)
+-- runs a full refresh from production. Aggregates are rebuilt.
+-- =====================================================
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_class
+        WHERE oid = to_regclass('warehouse.fact_sales') AND relkind = 'r'
+    ) THEN
+        DROP TABLE warehouse.fact_sales CASCADE;
+        DROP TABLE IF EXISTS warehouse.fact_sales_retracted;
+
+        IF to_regclass('warehouse.aggregate_state') IS NOT NULL THEN
+            DELETE FROM warehouse.aggregate_state;
+        END IF;
+    END IF;
+END $$;
+
+-- =====================================================
+-- AGGREGATE COLUMNS FOR INCREMENTAL REFRESH
+-- =====================================================
+ALTER TABLE IF EXISTS warehouse.agg_product_performance
+    ADD COLUMN IF NOT EXISTS line_count BIGINT,
+    ADD COLUMN IF NOT EXISTS discount_percentage_sum DECIMAL(16,4);
@@ -32,13 +32,6 @@ ORDER BY d.year, d.month;
 -- =====================================================
 -- Query 3: Customer Segmentation by Spend
 -- =====================================================
-WITH customer_totals AS (
-    SELECT
-        customer_key,
-        SUM(line_total) AS total_spent
-    FROM warehouse.fact_sales
-    GROUP BY customer_key
-)
 SELECT
     CASE
         WHEN total_spent < 1000 THEN '$0-$1,000'
@@ -49,7 +42,7 @@ SELECT
     COUNT(*) AS customer_count,
     SUM(total_spent) AS total_revenue,
     AVG(total_spent) AS avg_transaction_value
-FROM customer_totals
+FROM warehouse.agg_customer_metrics
 GROUP BY spending_segment
 ORDER BY customer_count DESC;
 
@@ -58,13 +51,13 @@ ORDER BY customer_count DESC;
 -- =====================================================
 SELECT
     p.category,
-    SUM(f.line_total) AS total_revenue,
-    SUM(f.profit) AS total_profit,
-    (SUM(f.profit) / NULLIF(SUM(f.line_total), 0)) * 100 AS profit_margin_pct,
-    SUM(f.quantity) AS units_sold
-FROM warehouse.fact_sales f
+    SUM(a.total_revenue) AS total_revenue,
+    SUM(a.total_profit) AS total_profit,
+    (SUM(a.total_profit) / NULLIF(SUM(a.total_revenue), 0)) * 100 AS profit_margin_pct,
+    SUM(a.total_quantity_sold) AS units_sold
+FROM warehouse.agg_product_performance a
 JOIN warehouse.dim_products p
-    ON f.product_key = p.product_key
+    ON a.product_key = p.product_key
 GROUP BY p.category
 ORDER BY total_revenue DESC;
 
@@ -89,12 +82,12 @@ GROUP BY pm.payment_method_name;
 -- =====================================================
 SELECT
     c.state,
-    SUM(f.line_total) AS total_revenue,
-    COUNT(DISTINCT f.customer_key) AS total_customers,
-    SUM(f.line_total) / COUNT(DISTINCT f.customer_key) AS avg_revenue_per_customer
-FROM warehouse.fact_sales f
+    SUM(a.total_spent) AS total_revenue,
+    COUNT(*) AS total_customers,
+    SUM(a.total_spent) / COUNT(*) AS avg_revenue_per_customer
+FROM warehouse.agg_customer_metrics a
 JOIN warehouse.dim_customers c
-    ON f.customer_key = c.customer_key
+    ON a.customer_key = c.customer_key
 GROUP BY c.state
 ORDER BY total_revenue DESC;
 
@@ -103,7 +96,7 @@ ORDER BY total_revenue DESC;
 -- =====================================================
 SELECT
     c.customer_id,
-    c.full_name,
+    c.first_name || ' ' || c.last_name AS full_name,
     SUM(f.line_total) AS total_spent,
     COUNT(DISTINCT f.transaction_id) AS transaction_count,
     CURRENT_DATE - c.registration_date AS days_since_registration,
@@ -111,7 +104,7 @@ SELECT
 FROM warehouse.fact_sales f
 JOIN warehouse.dim_customers c
     ON f.customer_key = c.customer_key
-GROUP BY c.customer_id, c.full_name, c.registration_date
+GROUP BY c.customer_id, c.first_name, c.last_name, c.registration_date
 ORDER BY total_spent DESC;
 
 -- =====================================================
@@ -120,13 +113,13 @@ ORDER BY total_spent DESC;
 SELECT
     p.product_name,
     p.category,
-    SUM(f.profit) AS total_profit,
-    (SUM(f.profit) / NULLIF(SUM(f.line_total), 0)) * 100 AS profit_margin,
-    SUM(f.line_total) AS revenue,
-    SUM(f.quantity) AS units_sold
-FROM warehouse.fact_sales f
+    SUM(a.total_profit) AS total_profit,
+    (SUM(a.total_profit) / NULLIF(SUM(a.total_revenue), 0)) * 100 AS profit_margin,
+    SUM(a.total_revenue) AS revenue,
+    SUM(a.total_quantity_sold) AS units_sold
+FROM warehouse.agg_product_performance a
 JOIN warehouse.dim_products p
-    ON f.product_key = p.product_key
+    ON a.product_key = p.product_key
 GROUP BY p.product_name, p.category
 ORDER BY total_profit DESC;
 
@@ -134,22 +127,14 @@ ORDER BY total_profit DESC;
 -- Query 9: Day of Week Sales Pattern
 -- =====================================================
 SELECT
-    day_name,
-    AVG(daily_revenue) AS avg_daily_revenue,
-    AVG(daily_transactions) AS avg_daily_transactions,
-    SUM(daily_revenue) AS total_revenue
-FROM (
-    SELECT
-        d.day_name AS day_name,
-        d.date_key,
-        SUM(f.line_total) AS daily_revenue,
-        COUNT(DISTINCT f.transaction_id) AS daily_transactions
-    FROM warehouse.fact_sales f
-    JOIN warehouse.dim_date d
-        ON f.date_key = d.date_key
-    GROUP BY d.day_name, d.date_key
-) t
-GROUP BY day_name
+    d.day_name,
+    AVG(a.total_revenue) AS avg_daily_revenue,
+    AVG(a.total_transactions) AS avg_daily_transactions,
+    SUM(a.total_revenue) AS total_revenue
+FROM warehouse.agg_daily_sales a
+JOIN warehouse.dim_date d
+    ON a.date_key = d.date_key
+GROUP BY d.day_name
 ORDER BY total_revenue DESC;
 
 
@@ -0,0 +1,96 @@
+-- =====================================================
+-- Original fact_sales scans of the analytical queries
+-- that now read the warehouse.agg_* tables, kept for
+-- benchmarking (build_aggregates.py --benchmark)
+-- =====================================================
+
+-- =====================================================
+-- Query 3: Customer Segmentation by Spend
+-- =====================================================
+WITH customer_totals AS (
+    SELECT
+        customer_key,
+        SUM(line_total) AS total_spent
+    FROM warehouse.fact_sales
+    GROUP BY customer_key
+)
+SELECT
+    CASE
+        WHEN total_spent < 1000 THEN '$0-$1,000'
+        WHEN total_spent < 5000 THEN '$1,000-$5,000'
+        WHEN total_spent < 10000 THEN '$5,000-$10,000'
+        ELSE '$10,000+'
+    END AS spending_segment,
+    COUNT(*) AS customer_count,
+    SUM(total_spent) AS total_revenue,
+    AVG(total_spent) AS avg_transaction_value
+FROM customer_totals
+GROUP BY spending_segment
+ORDER BY customer_count DESC;
+
+-- =====================================================
+-- Query 4: Category Performance
+-- =====================================================
+SELECT
+    p.category,
+    SUM(f.line_total) AS total_revenue,
+    SUM(f.profit) AS total_profit,
+    (SUM(f.profit) / NULLIF(SUM(f.line_total), 0)) * 100 AS profit_margin_pct,
+    SUM(f.quantity) AS units_sold
+FROM warehouse.fact_sales f
+JOIN warehouse.dim_products p
+    ON f.product_key = p.product_key
+GROUP BY p.category
+ORDER BY total_revenue DESC;
+
+-- =====================================================
+-- Query 6: Geographic Revenue by State
+-- =====================================================
+SELECT
+    c.state,
+    SUM(f.line_total) AS total_revenue,
+    COUNT(DISTINCT f.customer_key) AS total_customers,
+    SUM(f.line_total) / COUNT(DISTINCT f.customer_key) AS avg_revenue_per_customer
+FROM warehouse.fact_sales f
+JOIN warehouse.dim_customers c
+    ON f.customer_key = c.customer_key
+GROUP BY c.state
+ORDER BY total_revenue DESC;
+
+-- =====================================================
+-- Query 8: Product Profitability
+-- =====================================================
+SELECT
+    p.product_name,
+    p.category,
+    SUM(f.profit) AS total_profit,
+    (SUM(f.profit) / NULLIF(SUM(f.line_total), 0)) * 100 AS profit_margin,
+    SUM(f.line_total) AS revenue,
+    SUM(f.quantity) AS units_sold
+FROM warehouse.fact_sales f
+JOIN warehouse.dim_products p
+    ON f.product_key = p.product_key
+GROUP BY p.product_name, p.category
+ORDER BY total_profit DESC;
+
+-- =====================================================
+-- Query 9: Day of Week Sales Pattern
+-- =====================================================
+SELECT
+    day_name,
+    AVG(daily_revenue) AS avg_daily_revenue,
+    AVG(daily_transactions) AS avg_daily_transactions,
+    SUM(daily_revenue) AS total_revenue
+FROM (
+    SELECT
+        d.day_name AS day_name,
+        d.date_key,
+        SUM(f.line_total) AS daily_revenue,
+        COUNT(DISTINCT f.transaction_id) AS daily_transactions
+    FROM warehouse.fact_sales f
+    JOIN warehouse.dim_date d
+        ON f.date_key = d.date_key
+    GROUP BY d.day_name, d.date_key
+) t
+GROUP BY day_name
+ORDER BY total_revenue DESC;
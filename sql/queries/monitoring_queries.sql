@@ -30,7 +30,7 @@ SELECT
 FROM warehouse.fact_sales f
 JOIN warehouse.dim_date d
     ON f.date_key = d.date_key
-WHERE d.full_date >= CURRENT_DATE - INTERVAL '30 days'
+WHERE f.date_key >= TO_CHAR(CURRENT_DATE - INTERVAL '30 days', 'YYYYMMDD')::INT
 GROUP BY d.full_date
 ORDER BY d.full_date;
 
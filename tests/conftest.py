@@ -2,17 +2,45 @@ import psycopg2
 import pytest
 import os
 
+def _connect(**kwargs):
+    return psycopg2.connect(
+        host=os.getenv("DB_HOST", "localhost"),
+        database=os.getenv("DB_NAME", "ecommerce_db"),
+        user=os.getenv("DB_USER", "postgres"),
+        password=os.getenv("DB_PASSWORD", "postgres"),
+        port=int(os.getenv("DB_PORT", 5432)),
+        **kwargs
+    )
+
+
+class UncommittedConnection(psycopg2.extensions.connection):
+    """
+    commit() leaves the transaction open, only dropping temp tables as
+    ON COMMIT DROP would, so a test's writes can be rolled back at the end.
+    """
+
+    def commit(self):
+        with self.cursor() as cur:
+            cur.execute("DISCARD TEMP")
+
+
 @pytest.fixture(scope="session")
 def db_conn():
     try:
-        conn = psycopg2.connect(
-            host=os.getenv("DB_HOST", "localhost"),
-            database=os.getenv("DB_NAME", "ecommerce_db"),
-            user=os.getenv("DB_USER", "postgres"),
-            password=os.getenv("DB_PASSWORD", "postgres"),
-            port=int(os.getenv("DB_PORT", 5432))
-        )
+        conn = _connect()
         yield conn
         conn.close()
     except psycopg2.OperationalError as e:
         pytest.skip(f"Database not available for tests: {e}")
+
+
+@pytest.fixture
+def rollback_conn():
+    """A connection whose writes, committed or not, are rolled back after the test."""
+    try:
+        conn = _connect(connection_factory=UncommittedConnection)
+    except psycopg2.OperationalError as e:
+        pytest.skip(f"Database not available for tests: {e}")
+    yield conn
+    conn.rollback()
+    conn.close()
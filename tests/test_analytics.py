@@ -0,0 +1,85 @@
+import os
+import sys
+import time
+from datetime import date
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, BASE_DIR)
+
+from scripts.query_registry import Query  # noqa: E402
+from scripts.transformation import generate_analytics as analytics  # noqa: E402
+
+
+def use_tmp_dirs(monkeypatch, tmp_path):
+    monkeypatch.setattr(analytics, "OUTPUT_DIR", tmp_path)
+    monkeypatch.setattr(analytics, "CACHE_DIR", tmp_path / "cache")
+
+
+def test_export_keeps_trailing_comments_out_of_the_query(db_conn, tmp_path, monkeypatch):
+    monkeypatch.setattr(analytics, "OUTPUT_DIR", tmp_path)
+    sql = "SELECT 1 AS a, 'x' AS b -- trailing; comment"
+
+    assert analytics.export_query(db_conn, "q", sql, "csv")[:2] == (1, 2)
+    assert (tmp_path / "q.csv").read_text() == "a,b\n1,x\n"
+
+    empty = "SELECT 1 AS a WHERE FALSE -- no rows"
+    assert analytics.export_query(db_conn, "empty", empty, "csv")[:2] == (0, 1)
+    assert (tmp_path / "empty.csv").read_text() == "a\n"
+    db_conn.rollback()
+
+def test_unchanged_rerun_is_served_from_the_cache(db_conn, tmp_path, monkeypatch):
+    use_tmp_dirs(monkeypatch, tmp_path)
+    query = Query("query1", 1, "dates", None, "SELECT COUNT(*) AS days FROM warehouse.dim_date")
+    index = {}
+
+    first, _ = analytics.run_queries([query], 1, index)
+    second, _ = analytics.run_queries([query], 1, index)
+
+    assert first["query1"]["cache"] == "miss"
+    assert second["query1"]["cache"] == "hit"
+    assert second["query1"]["rows"] == first["query1"]["rows"] == 1
+    assert len(index) == 1
+
+def test_load_run_of_a_read_table_invalidates_the_key(rollback_conn):
+    sql = "SELECT SUM(line_total) FROM warehouse.fact_sales"
+    cursor = rollback_conn.cursor()
+    key = analytics.cache_key(sql, analytics.data_versions(cursor))
+
+    def bump(table_name):
+        cursor.execute("""
+            INSERT INTO warehouse.load_runs (run_id, table_name, rows_changed)
+            VALUES (nextval('warehouse.load_run_id_seq'), %s, 1)
+        """, (table_name,))
+        return analytics.cache_key(sql, analytics.data_versions(cursor))
+
+    assert bump("warehouse.dim_products") == key
+    assert bump("warehouse.fact_sales") != key
+
+def test_current_date_queries_are_keyed_by_date(monkeypatch):
+    dated = "SELECT CURRENT_DATE - registration_date FROM warehouse.dim_customers"
+    undated = "SELECT COUNT(*) FROM warehouse.dim_customers"
+    keys = {sql: analytics.cache_key(sql, {}) for sql in (dated, undated)}
+
+    class Tomorrow(date):
+        @classmethod
+        def today(cls):
+            return date.fromordinal(date.today().toordinal() + 1)
+
+    monkeypatch.setattr(analytics, "date", Tomorrow)
+    assert analytics.cache_key(dated, {}) != keys[dated]
+    assert analytics.cache_key(undated, {}) == keys[undated]
+
+def test_eviction_drops_expired_entries_then_least_recently_used(tmp_path, monkeypatch):
+    use_tmp_dirs(monkeypatch, tmp_path)
+    analytics.CACHE_DIR.mkdir()
+    now = time.time()
+    index = {}
+    # (hours old, hours since last used) of 1 MB entries
+    for key, (age, idle) in {"expired": (30, 0), "old": (5, 3), "recent": (5, 1), "new": (1, 0)}.items():
+        (analytics.CACHE_DIR / f"{key}.csv").write_bytes(b"x" * 1024 * 1024)
+        index[key] = {"query_name": key, "suffix": ".csv", "size_bytes": 1024 * 1024,
+                      "created_at": now - age * 3600, "last_used": now - idle * 3600}
+
+    assert analytics.evict_cache(index, max_age_hours=24, max_mb=2) == 2
+    assert sorted(index) == ["new", "recent"]
+    assert sorted(f.stem for f in analytics.CACHE_DIR.iterdir()) == ["new", "recent"]
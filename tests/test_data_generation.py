@@ -24,3 +24,80 @@ def test_required_columns_exist():
 def test_no_null_ids():
     df = pd.read_csv(os.path.join(RAW_DIR, "customers.csv"))
     assert df["customer_id"].isnull().sum() == 0
+
+def _generate(engine, seed):
+    import sys
+    sys.path.insert(0, BASE_DIR)
+    from scripts.data_generation.generate_data import generate_dataset
+
+    config = {"customers": 40, "products": 12, "transactions": 60, "faker_pool_size": 50}
+    return generate_dataset(config, engine, seed)
+
+def test_vectorized_engine_matches_faker_columns():
+    faker_frames = _generate("faker", 1)
+    vectorized_frames = _generate("vectorized", 1)
+    for faker_df, vectorized_df in zip(faker_frames, vectorized_frames):
+        assert list(faker_df.columns) == list(vectorized_df.columns)
+
+def test_vectorized_engine_is_seeded_and_consistent():
+    customers, products, transactions, items = _generate("vectorized", 7)
+    again = _generate("vectorized", 7)
+    pd.testing.assert_frame_equal(items, again[3])
+
+    assert customers["email"].is_unique
+    assert not items.duplicated(["transaction_id", "product_id"]).any()
+    totals = items.groupby("transaction_id")["line_total"].sum().round(2)
+    assert (totals - transactions.set_index("transaction_id")["total_amount"]).abs().max() < 0.01
+
+def test_sharded_generation_keeps_ids_and_emails_unique(tmp_path):
+    import sys
+    sys.path.insert(0, BASE_DIR)
+    from scripts.data_generation.generate_data import generate_sharded
+
+    config = {"customers": 30, "products": 10, "transactions": 50, "faker_pool_size": 50}
+    result = generate_sharded(config, tmp_path, chunk_size=20, workers=2, seed=3)
+
+    def read(table):
+        return pd.concat(pd.read_csv(f) for f in sorted((tmp_path / table).rglob("*.csv")))
+
+    customers, items = read("customers"), read("transaction_items")
+    assert customers["email"].is_unique and customers["customer_id"].is_unique
+    assert items["item_id"].is_unique
+    assert len(items) == result["record_counts"]["transaction_items"]
+
+def test_parquet_output_matches_csv_and_keeps_dates_typed(tmp_path):
+    import sys
+    sys.path.insert(0, BASE_DIR)
+    from scripts.data_generation.generate_data import generate_sharded
+
+    config = {"customers": 30, "products": 10, "transactions": 50, "faker_pool_size": 50}
+    for output_format in ("csv", "parquet"):
+        generate_sharded(dict(config, output_format=output_format), tmp_path / output_format,
+                         chunk_size=20, workers=2, seed=3)
+
+    csv_files = sorted((tmp_path / "csv" / "transactions").rglob("*.csv"))
+    parquet_files = sorted((tmp_path / "parquet" / "transactions").rglob("*.parquet"))
+    csv_df = pd.concat(pd.read_csv(f) for f in csv_files)
+    parquet_df = pd.concat(pd.read_parquet(f) for f in parquet_files)
+
+    assert len(parquet_files) == len(csv_files)
+    assert parquet_df["transaction_id"].tolist() == csv_df["transaction_id"].tolist()
+    assert parquet_df["transaction_date"].astype(str).tolist() == csv_df["transaction_date"].tolist()
+
+def test_sharded_generation_is_reproducible_for_a_seed(tmp_path):
+    import sys
+    sys.path.insert(0, BASE_DIR)
+    from scripts.data_generation.generate_data import generate_sharded
+
+    config = {"customers": 30, "products": 10, "transactions": 50, "faker_pool_size": 50}
+    for run in ("first", "second"):
+        generate_sharded(config, tmp_path / run, chunk_size=20, workers=2, seed=11)
+
+    for table in ("customers", "products", "transactions", "transaction_items"):
+        first, second = (
+            [pd.read_csv(f) for f in sorted((tmp_path / run / table).rglob("*.csv"))]
+            for run in ("first", "second")
+        )
+        assert len(first) == len(second) > 0
+        for first_df, second_df in zip(first, second):
+            pd.testing.assert_frame_equal(first_df, second_df)
@@ -1,3 +1,11 @@
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, BASE_DIR)
+
+from scripts.ingestion import ingest_to_staging as ingestion  # noqa: E402
+
 def test_staging_tables_exist(db_conn):
     cursor = db_conn.cursor()
     cursor.execute("""
@@ -17,3 +25,84 @@ def test_loaded_at_exists(db_conn):
         SELECT COUNT(*) FROM staging.customers WHERE loaded_at IS NULL
     """)
     assert cursor.fetchone()[0] == 0
+
+def test_csv_byte_ranges_cover_every_row_once(tmp_path):
+    path = tmp_path / "items.csv"
+    rows = [f"ITEM{i:05d},TXN{i % 7},{i}" for i in range(1000)]
+    path.write_text("item_id,transaction_id,quantity\n" + "\n".join(rows) + "\n")
+
+    ranges = ingestion.split_csv_ranges(path, 4)
+    assert len(ranges) == 4
+    chunks = []
+    with open(path, "rb") as f:
+        for start, end in ranges:
+            chunks.append(ingestion.ByteRangeReader(f, start, end).read())
+    assert all(chunk.endswith(b"\n") for chunk in chunks)
+    assert b"".join(chunks).decode().splitlines() == rows
+
+def test_load_stats_reader_counts_rows_and_key_checksum(tmp_path):
+    path = tmp_path / "customers.csv"
+    keys = [f"CUST{i:04d}" for i in range(1, 251)]
+    # No trailing newline: the last row must still be counted
+    path.write_text("customer_id,email\n" + "\n".join(f"{k},{k}@example.com" for k in keys))
+
+    with open(path, "rb") as f:
+        reader = ingestion.LoadStatsReader(f, has_header=True, checksum=True)
+        while reader.read(64):
+            pass
+    stats = reader.stats("customer_id")
+
+    assert stats["rows"] == len(keys)
+    assert stats["bytes"] == path.stat().st_size
+    assert stats["key_checksum"] == sum(ingestion.key_hash(k) for k in keys)
+
+def test_incremental_ingestion_loads_only_changed_rows(rollback_conn, tmp_path, monkeypatch):
+    monkeypatch.setattr(ingestion, "get_db_connection", lambda: rollback_conn)
+    monkeypatch.setattr(rollback_conn, "close", lambda: None)
+    with rollback_conn.cursor() as cur:
+        cur.execute("""
+            CREATE TABLE staging.incremental_test (
+                item_id VARCHAR(20) PRIMARY KEY,
+                quantity INTEGER,
+                loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+    path = tmp_path / "incremental_test.csv"
+    path.write_text("item_id,quantity\nA,1\nB,2\nC,3\n")
+    tables = [(str(path), "staging.incremental_test")]
+    config = {"method": "insert", "checksum": False}
+
+    def run():
+        return ingestion.run_incremental_ingestion(tables, config)["tables_loaded"][tables[0][1]]
+
+    def rows():
+        with rollback_conn.cursor() as cur:
+            cur.execute("SELECT item_id, quantity FROM staging.incremental_test ORDER BY item_id")
+            return cur.fetchall()
+
+    loads = []
+    load_source_file = ingestion.load_source_file
+    monkeypatch.setattr(
+        ingestion, "load_source_file",
+        lambda *args, **kwargs: loads.append(args[0]) or load_source_file(*args, **kwargs)
+    )
+
+    first = run()
+    assert (first["files_loaded"], first["rows_upserted"], len(loads)) == (1, 3, 1)
+
+    # Same size and mtime: skipped without reading the file
+    second = run()
+    assert (second["status"], second["files_skipped"], len(loads)) == ("unchanged", 1, 1)
+
+    # Touched but identical: the content hash rules it out before loading
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+    touched = run()
+    assert (touched["status"], touched["files_skipped"], len(loads)) == ("unchanged", 1, 1)
+
+    path.write_text("item_id,quantity\nA,1\nB,5\nC,3\n")
+    os.utime(path, (stat.st_atime, stat.st_mtime + 20))
+    changed = run()
+    assert (changed["files_loaded"], changed["rows_upserted"], len(loads)) == (1, 1, 2)
+    assert rows() == [("A", 1), ("B", 5), ("C", 3)]
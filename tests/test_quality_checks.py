@@ -1,7 +1,24 @@
 import os
+import sys
 import json
 
+import pandas as pd
+import pytest
+
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, BASE_DIR)
+
+from scripts.quality_checks.data_quality_checks import (  # noqa: E402
+    compile_rules,
+    file_violations,
+    load_rules,
+)
+from scripts.quality_checks.validate_data import (  # noqa: E402
+    TABLE_CHECKS,
+    compile_check_query,
+    compile_table_query,
+)
+
 QUALITY_REPORT = os.path.join(
     BASE_DIR,
     "data",
@@ -19,3 +36,77 @@ def test_quality_score_range():
     score = report.get("quality_score") or report.get("summary", {}).get("quality_score")
     assert score is not None, "quality_score not found in report"
     assert 0 <= score <= 100
+
+def test_checks_compile_to_one_query_per_table():
+    for table, spec in TABLE_CHECKS.items():
+        sql = compile_table_query(table, spec)
+        assert sql.count("FILTER (WHERE") == len(spec.get("filters", {})) + len(spec.get("unique", {}))
+        assert sql.count(f"FROM {table}") == 1
+
+def test_check_queries_keep_one_check_each():
+    for table, spec in TABLE_CHECKS.items():
+        assert "FILTER (WHERE" not in compile_check_query(table, spec)
+        for check in [*spec.get("filters", {}), *spec.get("unique", {})]:
+            sql = compile_check_query(table, spec, check)
+            assert sql.count("FILTER (WHERE") == 1
+            assert check in sql
+            assert all(join in sql for join in spec.get("joins", []))
+
+def test_declared_rules_vectorized_on_files():
+    df = pd.DataFrame({
+        "id": ["a", "b", "b", None],
+        "qty": [1, 0, 5, 120],
+        "price": [10.0, 5.0, 1.0, 2.0],
+        "cost": [4.0, 6.0, 0.5, 1.0],
+    })
+    rules = [
+        ({"name": "id_not_null", "type": "not_null", "column": "id"}, 1),
+        ({"name": "id_unique", "type": "unique", "column": "id"}, 1),
+        ({"name": "qty_range", "type": "range", "column": "qty", "min": 1, "max": 100}, 2),
+        ({"name": "id_exists", "type": "referential", "column": "id", "references": "t.id"}, 2),
+        ({"name": "margin", "type": "expression", "sql": "cost < price"}, 1),
+    ]
+    reference = pd.Series(["a"])
+    for rule, expected in rules:
+        assert file_violations(rule, df, reference) == expected
+
+    spec = compile_rules([rule for rule, _ in rules])
+    assert set(spec["filters"]) | set(spec["unique"]) == {rule["name"] for rule, _ in rules}
+    assert len(spec["joins"]) == 1
+
+def test_aggregate_rules_share_one_grouped_join():
+    orders = pd.DataFrame({"id": ["a", "b", "c"], "total": [3.0, 5.0, 1.0]})
+    items = pd.DataFrame({"order_id": ["a", "a", "b"], "amount": [1.0, 2.0, 4.0]})
+    common = {"type": "aggregate", "column": "id", "references": "s.items.order_id"}
+    rules = [
+        ({**common, "name": "has_items", "aggregates": {"n": ["amount", "count"]},
+          "sql": "n > 0"}, 1),
+        ({**common, "name": "total_matches", "aggregates": {"item_total": ["amount", "sum"]},
+          "sql": "COALESCE(total = item_total, TRUE)", "pandas": "~(abs(total - item_total) > 0)"}, 1),
+    ]
+    for rule, expected in rules:
+        reference = items.groupby("order_id").agg(
+            **{name: tuple(aggregate) for name, aggregate in rule["aggregates"].items()}
+        )
+        assert file_violations(rule, orders, reference) == expected
+
+    spec = compile_rules([rule for rule, _ in rules])
+    assert len(spec["joins"]) == 1
+    assert "COUNT(amount) AS n, SUM(amount) AS item_total" in spec["joins"][0]
+
+@pytest.mark.parametrize("rule, message", [
+    ("{name: r, type: range, column: qty}", "needs min or max"),
+    ("{name: r, type: not_null}", "needs column"),
+    ("{name: r, type: referential, column: id}", "needs references"),
+    ("{name: r, type: referential, column: id, references: id}", "schema.table.column"),
+    ("{name: r, type: expression}", "needs sql"),
+    ("{name: r, type: between, column: id}", "unknown rule type"),
+    ("{type: not_null, column: id}", "without a name"),
+    ("{name: r, type: aggregate, column: id, references: s.t.id, aggregates: {n: [id, avg]},"
+     " sql: n > 0}", "unknown aggregate function"),
+])
+def test_malformed_rules_rejected(tmp_path, rule, message):
+    path = tmp_path / "rules.yaml"
+    path.write_text(f"defaults: {{severity: error, threshold: 0}}\ntables:\n  t:\n    - {rule}\n")
+    with pytest.raises(ValueError, match=message):
+        load_rules(path)
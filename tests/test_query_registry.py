@@ -0,0 +1,85 @@
+import os
+import sys
+
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, BASE_DIR)
+
+from scripts.query_registry import (  # noqa: E402
+    PreparedQueries,
+    load_registry,
+    parse_queries,
+    split_statements,
+)
+
+SCRIPT = """
+-- header comment; not a statement
+-- Query 1: Semicolons In Literals
+SELECT 'a;b' AS s, "odd;name", E'it\\'s;' AS e,
+       x LIKE'a\\' AS l, name'b\\' AS n
+FROM t;
+
+/* block; /* nested; */ comment */
+-- Query 2: Dollar Quoted
+SELECT $$x;y$$, $tag$ ; $tag$;
+
+SELECT 3 -- trailing; comment
+;
+-- only a comment at the end; ignored
+"""
+
+
+def test_split_ignores_quoted_and_commented_semicolons():
+    statements = split_statements(SCRIPT)
+    assert len(statements) == 3
+    assert statements[0].endswith("FROM t")
+    assert "$tag$ ; $tag$" in statements[1]
+
+
+def test_headers_name_queries():
+    queries = parse_queries(SCRIPT)
+    assert [q.name for q in queries] == ["semicolons_in_literals", "dollar_quoted", "query3"]
+    assert [q.key for q in queries] == ["query1", "query2", "query3"]
+    assert queries[0].sql.startswith("SELECT")
+
+
+def test_repo_query_files_parse():
+    analytical = load_registry(os.path.join(BASE_DIR, "sql/queries/analytical_queries.sql"), None)
+    monitoring = load_registry(os.path.join(BASE_DIR, "sql/queries/monitoring_queries.sql"), None)
+    assert len(analytical) == 10
+    assert len(monitoring) == 5
+    assert analytical["top_10_products_by_revenue"].key == "query1"
+
+
+def test_repo_analytical_queries_plan(db_conn):
+    # Every column they reference exists (Query 7 once read dim_customers.full_name)
+    cursor = db_conn.cursor()
+    for name in ("analytical_queries.sql", "analytical_queries_fact_scan.sql"):
+        for query in load_registry(os.path.join(BASE_DIR, "sql/queries", name), None):
+            cursor.execute("EXPLAIN " + query.sql)
+    db_conn.rollback()
+
+
+def test_select_named_subset(tmp_path):
+    path = tmp_path / "queries.sql"
+    path.write_text(SCRIPT)
+    registry = load_registry(path, tmp_path / "cache.json")
+    subset = registry.select(["query3", "semicolons_in_literals"])
+    assert [q.key for q in subset] == ["query1", "query3"]
+    with pytest.raises(KeyError):
+        registry.select(["missing"])
+
+    assert (tmp_path / "cache.json").exists()
+    assert list(load_registry(path, tmp_path / "cache.json")) == list(registry)
+
+
+def test_prepared_statements_reused(db_conn):
+    query = parse_queries("-- Query 1: One\nSELECT 1 AS one;")[0]
+    prepared = PreparedQueries(db_conn)
+    cursor = db_conn.cursor()
+    for _ in range(2):
+        cursor.execute(prepared(query))
+        assert cursor.fetchone() == (1,)
+    assert len(prepared.prepared) == 1
+    db_conn.rollback()
@@ -1,3 +1,44 @@
+import os
+import string
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import pandas as pd
+import psycopg2
+import pytest
+from hypothesis import given, settings, strategies as st
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, BASE_DIR)
+
+from scripts.transformation.benchmark_cleansing import (  # noqa: E402
+    cleanse_customer_data_rowwise,
+    cleanse_product_data_rowwise,
+)
+from scripts.transformation.staging_to_production import (  # noqa: E402
+    CUSTOMER_COLUMNS,
+    _read_staging,
+    _title,
+    _trim,
+    cleanse_customer_data,
+    cleanse_product_data,
+    load_to_production,
+    stream_to_production,
+)
+
+CUSTOMER_TEXT_COLUMNS = [
+    "customer_id", "first_name", "last_name", "email", "phone",
+    "city", "state", "country", "age_group"
+]
+
+# Names where INITCAP and str.title() split words differently
+TRICKY_NAMES = [
+    "o'neil", " d'ARCY jr. ", "mcdonald-smith", "ANNE-MARIE", "3rd", "x2y", "ab_cd", "",
+]
+NON_ASCII_NAMES = ["élodie", "ÉMILE zoë", "øyvind o'brien", "3ème"]
+
+
 def test_production_tables_populated(db_conn):
     cursor = db_conn.cursor()
     cursor.execute("SELECT COUNT(*) FROM production.customers")
@@ -21,3 +62,114 @@ def test_email_lowercase(db_conn):
         WHERE email <> LOWER(email)
     """)
     assert cursor.fetchone()[0] == 0
+
+
+def test_streamed_reload_matches_one_shot_load(rollback_conn):
+    # A scratch copy, so truncating it waits on no other session's reads
+    target = "production.customers_reload_test"
+    cursor = rollback_conn.cursor()
+    cursor.execute(f"CREATE TABLE {target} (LIKE production.customers INCLUDING ALL)")
+    loaded = f"SELECT {', '.join(CUSTOMER_COLUMNS)} FROM {target} ORDER BY customer_id"
+
+    # Several chunks: only the first truncates, the rest append
+    result = stream_to_production("staging.customers", target, cleanse_customer_data,
+                                  "truncate", rollback_conn, batch_size=7, prefetch=2)
+    cursor.execute(loaded)
+    streamed = cursor.fetchall()
+    assert result["chunks"] > 1 and result["inserted"] == len(streamed)
+
+    df = cleanse_customer_data(_read_staging("staging.customers", rollback_conn))
+    load_to_production(df, target, rollback_conn, "truncate")
+    cursor.execute(loaded)
+    assert streamed == cursor.fetchall()
+
+def test_stream_writer_error_reaches_the_caller(rollback_conn):
+    # Appending rows that are already in production violates the primary key
+    executor = ThreadPoolExecutor(max_workers=1)
+    streaming = executor.submit(stream_to_production, "staging.customers",
+                                "production.customers", cleanse_customer_data, "append",
+                                rollback_conn, batch_size=7, prefetch=1)
+    try:
+        # A hung reader or writer thread would time out here instead
+        with pytest.raises(psycopg2.errors.UniqueViolation):
+            streaming.result(timeout=60)
+    finally:
+        executor.shutdown(wait=False)
+
+
+@st.composite
+def customer_frames(draw, text=st.text(), extra_values=st.integers() | st.none()):
+    # Values come from a small pool so columns repeat, like real names/cities
+    rows = draw(st.integers(min_value=1, max_value=20))
+    pool = draw(st.lists(text | extra_values, min_size=1, max_size=8))
+    values = st.sampled_from(pool) | text
+    data = {col: draw(st.lists(values, min_size=rows, max_size=rows))
+            for col in CUSTOMER_TEXT_COLUMNS}
+    data["registration_date"] = [date(2023, 1, 1)] * rows
+    return pd.DataFrame(data)
+
+
+@st.composite
+def product_frames(draw):
+    rows = draw(st.integers(min_value=1, max_value=20))
+    names = st.lists(st.sampled_from([" Widget", "Gadget ", "gizmo"]) | st.text(),
+                     min_size=rows, max_size=rows)
+    prices = st.lists(st.floats(min_value=-1000, max_value=1000) | st.just(float("nan")),
+                      min_size=rows, max_size=rows)
+    return pd.DataFrame({
+        "product_id": draw(names), "product_name": draw(names), "category": draw(names),
+        "price": draw(prices), "cost": draw(prices), "stock_quantity": [1] * rows
+    })
+
+
+@settings(max_examples=60, deadline=None)
+@given(customer_frames())
+def test_vectorized_customer_cleansing_matches_rowwise(df):
+    pd.testing.assert_frame_equal(cleanse_customer_data(df), cleanse_customer_data_rowwise(df))
+
+
+@settings(max_examples=40, deadline=None)
+@given(customer_frames(text=st.text(alphabet=string.printable), extra_values=st.none()))
+def test_arrow_customer_cleansing_matches_rowwise_for_ascii(df):
+    pd.testing.assert_frame_equal(
+        cleanse_customer_data(df, "pyarrow"), cleanse_customer_data_rowwise(df)
+    )
+
+
+@settings(max_examples=60, deadline=None)
+@given(product_frames())
+def test_vectorized_product_cleansing_matches_rowwise(df):
+    pd.testing.assert_frame_equal(cleanse_product_data(df), cleanse_product_data_rowwise(df))
+
+
+def _sql_engine_names(db_conn, names):
+    cursor = db_conn.cursor()
+    cursor.execute(
+        f"SELECT {_title(_trim('n'))} FROM UNNEST(%s::TEXT[]) WITH ORDINALITY u(n, i) ORDER BY i",
+        (names,)
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+
+def _pandas_engine_names(names):
+    df = pd.DataFrame({col: names for col in CUSTOMER_TEXT_COLUMNS})
+    df["registration_date"] = date(2023, 1, 1)
+    return cleanse_customer_data(df)["first_name"].tolist()
+
+
+def test_sql_name_casing_matches_pandas_engine(db_conn):
+    assert _sql_engine_names(db_conn, TRICKY_NAMES) == _pandas_engine_names(TRICKY_NAMES)
+
+
+def test_sql_name_casing_matches_pandas_engine_for_non_ascii(db_conn):
+    cursor = db_conn.cursor()
+    cursor.execute("""
+        SELECT pg_encoding_to_char(encoding), datctype
+        FROM pg_database WHERE datname = current_database()
+    """)
+    encoding, ctype = cursor.fetchone()
+    if encoding != "UTF8" or ctype in ("C", "POSIX"):
+        pytest.skip(f"{encoding} / {ctype} database cannot case non-ASCII letters")
+
+    db_conn.set_client_encoding("UTF8")
+    assert _sql_engine_names(db_conn, NON_ASCII_NAMES) == _pandas_engine_names(NON_ASCII_NAMES)
@@ -1,3 +1,16 @@
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, BASE_DIR)
+
+from scripts.transformation.load_warehouse import (  # noqa: E402
+    CUSTOMER_DIMENSION,
+    load_fact_sales,
+    merge_scd2,
+)
+from scripts.transformation.staging_to_production import run_sql_engine  # noqa: E402
+
 def test_dimension_tables_exist(db_conn):
     cursor = db_conn.cursor()
     cursor.execute("""
@@ -14,3 +27,124 @@ def test_fact_grain(db_conn):
         SELECT COUNT(*) FROM warehouse.fact_sales
     """)
     assert cursor.fetchone()[0] > 0
+
+def test_scd2_single_current_version(db_conn):
+    cursor = db_conn.cursor()
+    cursor.execute("""
+        SELECT COUNT(*) FROM (
+            SELECT customer_id FROM warehouse.dim_customers
+            WHERE is_current GROUP BY customer_id HAVING COUNT(*) > 1
+        ) dup
+    """)
+    assert cursor.fetchone()[0] == 0
+
+def test_aggregates_match_fact_sales(db_conn):
+    cursor = db_conn.cursor()
+    cursor.execute("""
+        SELECT
+            (SELECT SUM(line_total) FROM warehouse.fact_sales),
+            (SELECT SUM(total_revenue) FROM warehouse.agg_daily_sales),
+            (SELECT SUM(total_revenue) FROM warehouse.agg_product_performance),
+            (SELECT SUM(total_spent) FROM warehouse.agg_customer_metrics)
+    """)
+    fact_total, *aggregate_totals = cursor.fetchone()
+    assert all(total == fact_total for total in aggregate_totals)
+
+def test_fact_sales_partitioned_by_month(db_conn):
+    cursor = db_conn.cursor()
+    cursor.execute("""
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'warehouse.fact_sales'::regclass
+    """)
+    partitions = [r[0] for r in cursor.fetchall()]
+    assert partitions
+    assert all(p.startswith("fact_sales_") and len(p) == len("fact_sales_YYYYMM") for p in partitions)
+
+def test_unchanged_rerun_touches_no_facts(rollback_conn):
+    # Bring production and the facts up to date, then rerun both steps
+    run_sql_engine(rollback_conn)
+    load_fact_sales(rollback_conn)
+
+    records, _ = run_sql_engine(rollback_conn)
+    assert all(record["inserted"] == 0 for record in records.values())
+
+    result = load_fact_sales(rollback_conn)
+    assert (result["transactions"], result["inserted"], result["deleted"]) == (0, 0, 0)
+
+def test_edited_item_replaces_its_fact(rollback_conn):
+    cursor = rollback_conn.cursor()
+    # An item that is alone in its transaction, so its fact row is the transaction's
+    cursor.execute("""
+        SELECT i.item_id, i.transaction_id, f.quantity
+        FROM staging.transaction_items i
+        JOIN warehouse.fact_sales f ON f.transaction_id = i.transaction_id
+        WHERE i.transaction_id IN (
+            SELECT transaction_id FROM staging.transaction_items
+            GROUP BY transaction_id HAVING COUNT(*) = 1
+        )
+        ORDER BY i.item_id
+        LIMIT 1
+    """)
+    item_id, transaction_id, quantity = cursor.fetchone()
+    cursor.execute(
+        "UPDATE staging.transaction_items SET quantity = quantity + 1 WHERE item_id = %s",
+        (item_id,)
+    )
+
+    records, _ = run_sql_engine(rollback_conn)
+    assert records["production.transaction_items"]["inserted"] >= 1
+    result = load_fact_sales(rollback_conn)
+    assert result["transactions"] >= 1
+
+    cursor.execute(
+        "SELECT quantity FROM warehouse.fact_sales WHERE transaction_id = %s", (transaction_id,)
+    )
+    assert cursor.fetchall() == [(quantity + 1,)]
+
+def test_changed_customer_gets_a_new_version(rollback_conn):
+    cursor = rollback_conn.cursor()
+    merge_scd2(**CUSTOMER_DIMENSION, conn=rollback_conn)
+    cursor.execute("""
+        SELECT d.customer_id, d.customer_key, COUNT(*)
+        FROM warehouse.dim_customers d
+        JOIN warehouse.fact_sales f ON f.customer_key = d.customer_key
+        WHERE d.is_current
+        GROUP BY d.customer_id, d.customer_key
+        ORDER BY d.customer_id
+        LIMIT 1
+    """)
+    customer_id, old_key, facts = cursor.fetchone()
+    versions = "SELECT COUNT(*) FROM warehouse.dim_customers WHERE customer_id = %s"
+    cursor.execute(versions, (customer_id,))
+    before = cursor.fetchone()[0]
+    cursor.execute(
+        "UPDATE production.customers SET city = 'Moved ' || city WHERE customer_id = %s",
+        (customer_id,)
+    )
+
+    result = merge_scd2(**CUSTOMER_DIMENSION, conn=rollback_conn)
+    assert (result["new"], result["changed"]) == (0, 1)
+
+    cursor.execute("""
+        SELECT customer_key, city LIKE 'Moved %%', end_date = CURRENT_DATE, is_current
+        FROM warehouse.dim_customers
+        WHERE customer_id = %s AND (is_current OR customer_key = %s)
+        ORDER BY is_current
+    """, (customer_id, old_key))
+    (closed_key, *closed), (new_key, *current) = cursor.fetchall()
+    assert closed_key == old_key and closed == [False, True, False]
+    assert new_key != old_key and current == [True, None, True]
+
+    cursor.execute(
+        "SELECT customer_key, COUNT(*) FROM warehouse.fact_sales WHERE customer_key IN (%s, %s)"
+        " GROUP BY customer_key",
+        (old_key, new_key)
+    )
+    assert cursor.fetchall() == [(old_key, facts)]
+
+    rerun = merge_scd2(**CUSTOMER_DIMENSION, conn=rollback_conn)
+    assert (rerun["new"], rerun["changed"]) == (0, 0)
+    cursor.execute(versions, (customer_id,))
+    assert cursor.fetchone()[0] == before + 1